@@ -0,0 +1,388 @@
+import functools
+import itertools
+import string
+
+try:
+    from re import _compiler as sre_compile
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_compile
+    import sre_constants
+    import sre_parse
+
+import re
+
+# Classes de complexité au pire cas
+LINEAIRE = "linéaire"
+POLYNOMIALE = "polynomiale"
+EXPONENTIELLE = "exponentielle"
+
+# Répétitions d'une chaîne d'attaque selon la classe de complexité
+REPETITIONS_EXPONENTIELLE = 30
+REPETITIONS_POLYNOMIALE = 5000
+
+# Alphabet représentatif : ASCII, plus une lettre accentuée et une espace insécable pour les catégories Unicode
+ALPHABET = frozenset(chr(i) for i in range(128)) | {"é", "\xa0"}
+CHIFFRES = frozenset(string.digits)
+ESPACES = frozenset(" \t\n\r\f\v\xa0")
+MOTS = frozenset(string.ascii_letters + string.digits + "_é")
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: CHIFFRES,
+    sre_constants.CATEGORY_NOT_DIGIT: ALPHABET - CHIFFRES,
+    sre_constants.CATEGORY_SPACE: ESPACES,
+    sre_constants.CATEGORY_NOT_SPACE: ALPHABET - ESPACES,
+    sre_constants.CATEGORY_WORD: MOTS,
+    sre_constants.CATEGORY_NOT_WORD: ALPHABET - MOTS,
+}
+
+# Caractères essayés pour terminer une chaîne d'attaque par un échec
+CARACTERES_ECHEC = "!#\x00~;§"
+
+# Limites de la recherche d'alternatives ambiguës (une chaîne reconnue de deux façons sous une répétition) :
+# nombre d'alternatives examinées, longueur des exemples découpés, et nombre d'alternatives jusqu'auquel
+# les concaténations de deux exemples sont aussi essayées
+TAILLE_MAX_ALTERNATIVES = 100
+LONGUEUR_MAX_EXEMPLE = 40
+TAILLE_MAX_PAIRES = 20
+
+MAXREPEAT = sre_constants.MAXREPEAT
+REPETITIONS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+CARACTERE_UNIQUE = (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN)
+# Répétitions possessives et groupes atomiques (Python 3.11+) : pas de retour arrière
+POSSESSIVE_REPEAT = getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+SANS_RETOUR_ARRIERE = tuple(op for op in (POSSESSIVE_REPEAT, ATOMIC_GROUP) if op is not None)
+
+
+class RapportComplexite:
+    """Résultat de l'analyse : classe de complexité au pire cas, problèmes détectés et chaîne d'attaque."""
+
+    def __init__(self, complexite=LINEAIRE, degre=1, problemes=None, chaine_attaque=None):
+        self.complexite = complexite
+        self.degre = degre
+        self.problemes = problemes or []
+        self.chaine_attaque = chaine_attaque
+
+    @property
+    def dangereux(self):
+        return self.complexite == EXPONENTIELLE
+
+    def description(self):
+        """Décrit la complexité en français (ex. « polynomiale (O(n^2)) »)."""
+        if self.complexite == EXPONENTIELLE:
+            return "exponentielle (O(2^n))"
+        if self.complexite == POLYNOMIALE:
+            return f"polynomiale (O(n^{self.degre}))"
+        return "linéaire (O(n))"
+
+
+class _Analyseur:
+    """Parcours de l'arbre produit par le parseur de re, avec une abstraction des caractères acceptés."""
+
+    def __init__(self, flags, etat=None):
+        self.ignore_casse = bool(flags & re.IGNORECASE)
+        self.dotall = bool(flags & re.DOTALL)
+        # État du parseur (groupes, flags), pour compiler des morceaux de l'arbre
+        self.etat = etat
+        self.rapport = RapportComplexite()
+
+    # --- Ensembles de caractères -------------------------------------------------------------
+
+    def _casse(self, caracteres):
+        if not self.ignore_casse:
+            return frozenset(caracteres)
+        return frozenset(caracteres) | {c.swapcase() for c in caracteres}
+
+    def caracteres_classe(self, elements):
+        """Caractères acceptés par une classe [...]."""
+        caracteres = set()
+        negation = False
+        for op, av in elements:
+            if op == sre_constants.NEGATE:
+                negation = True
+            elif op == sre_constants.LITERAL:
+                caracteres.add(chr(av))
+            elif op == sre_constants.RANGE:
+                caracteres.update(_plage(*av))
+            elif op == sre_constants.CATEGORY:
+                caracteres.update(CATEGORIES.get(av, ALPHABET))
+        caracteres = self._casse(caracteres)
+        return ALPHABET - caracteres if negation else caracteres
+
+    def caracteres(self, sequence):
+        """Ensemble (approché) des caractères qu'une sous-expression peut consommer."""
+        resultat = set()
+        for op, av in sequence:
+            if op == sre_constants.LITERAL:
+                resultat |= self._casse({chr(av)})
+            elif op == sre_constants.NOT_LITERAL:
+                resultat |= ALPHABET - self._casse({chr(av)})
+            elif op == sre_constants.ANY:
+                resultat |= ALPHABET if self.dotall else ALPHABET - {"\n"}
+            elif op == sre_constants.IN:
+                resultat |= self.caracteres_classe(av)
+            for sous_sequence in _sous_sequences(op, av):
+                resultat |= self.caracteres(sous_sequence)
+        return resultat
+
+    def peut_consommer(self, sequence, autorises):
+        """Indique si la sous-expression peut correspondre à une chaîne formée uniquement de caractères autorisés."""
+        for op, av in sequence:
+            if op in CARACTERE_UNIQUE:
+                if not self.caracteres([(op, av)]) & autorises:
+                    return False
+            elif op in REPETITIONS or op == POSSESSIVE_REPEAT:
+                if av[0] > 0 and not self.peut_consommer(av[2], autorises):
+                    return False
+            elif op == sre_constants.BRANCH:
+                if not any(self.peut_consommer(alternative, autorises) for alternative in av[1]):
+                    return False
+            elif op in (sre_constants.SUBPATTERN, ATOMIC_GROUP):
+                if not all(self.peut_consommer(sous_sequence, autorises) for sous_sequence in _sous_sequences(op, av)):
+                    return False
+        return True
+
+    # --- Exemples minimaux ------------------------------------------------------------------
+
+    def exemple_minimal(self, sequence):
+        """Construit une chaîne courte reconnue par la sous-expression (sert de préfixe aux chaînes d'attaque)."""
+        morceaux = []
+        for op, av in sequence:
+            if op in CARACTERE_UNIQUE:
+                possibles = self.caracteres([(op, av)])
+                morceaux.append(min(possibles) if possibles else "")
+            elif op in REPETITIONS or op == POSSESSIVE_REPEAT:
+                morceaux.append(self.exemple_minimal(av[2]) * av[0])
+            elif op == sre_constants.BRANCH:
+                morceaux.append(self.exemple_minimal(av[1][0]))
+            elif op in (sre_constants.SUBPATTERN, ATOMIC_GROUP):
+                morceaux.append(self.exemple_minimal(_sous_sequences(op, av)[0]))
+        return "".join(morceaux)
+
+    # --- Détection ---------------------------------------------------------------------------
+
+    def _signaler(self, complexite, degre, probleme, chaine_attaque):
+        rapport = self.rapport
+        if probleme not in rapport.problemes:
+            rapport.problemes.append(probleme)
+        rang = {LINEAIRE: 0, POLYNOMIALE: 1, EXPONENTIELLE: 2}
+        if (rang[complexite], degre) > (rang[rapport.complexite], rapport.degre):
+            rapport.complexite = complexite
+            rapport.degre = degre
+            rapport.chaine_attaque = chaine_attaque
+
+    def _fin_echec(self, pompe):
+        for caractere in CARACTERES_ECHEC:
+            if caractere not in pompe:
+                return caractere
+        return "\n"
+
+    def _repetitions_internes(self, sequence):
+        """Répétitions non bornées (avec retour arrière) contenues dans une sous-expression, à toute profondeur."""
+        for op, av in sequence:
+            if op in REPETITIONS and av[1] == MAXREPEAT:
+                yield av
+            if op in SANS_RETOUR_ARRIERE:
+                continue
+            for sous_sequence in _sous_sequences(op, av):
+                yield from self._repetitions_internes(sous_sequence)
+
+    def _exemple_morceaux(self, morceaux):
+        """Assemble une chaîne à partir de morceaux (chaînes, ou tranches (sequence, debut, fin) à construire)."""
+        return "".join(
+            morceau if isinstance(morceau, str) else self.exemple_minimal(morceau[0][morceau[1]:morceau[2]])
+            for morceau in morceaux
+        )
+
+    def _verifier_imbrication(self, corps, prefixe):
+        """Quantificateur non borné dont le corps contient un autre quantificateur non borné sur les mêmes caractères."""
+        for interne in self._repetitions_internes(corps):
+            for caractere in sorted(self.caracteres(interne[2])):
+                if self.peut_consommer(corps, {caractere}):
+                    self._signaler(
+                        EXPONENTIELLE, 1,
+                        f"Quantificateurs imbriqués : une répétition non bornée en contient une autre "
+                        f"pouvant consommer les mêmes caractères (ex. {caractere!r}).",
+                        self._exemple_morceaux(prefixe) + caractere * REPETITIONS_EXPONENTIELLE
+                        + self._fin_echec(caractere)
+                    )
+                    return True
+        return False
+
+    def _compiler_morceau(self, sequence):
+        """Compile une sous-expression de l'arbre pour en tester les correspondances (None si impossible)."""
+        try:
+            return sre_compile.compile(sre_parse.SubPattern(self.etat, list(sequence)), 0).fullmatch
+        except Exception:
+            # Référence à un groupe extérieur au morceau, par exemple
+            return None
+
+    def _decoupages(self, texte, reconnaisseurs):
+        """Nombre de façons (au plus 2) de découper le texte en morceaux non vides reconnus chacun par une alternative."""
+        facons = [1] + [0] * len(texte)
+        for fin in range(1, len(texte) + 1):
+            for debut in range(fin):
+                if facons[debut]:
+                    morceau = texte[debut:fin]
+                    facons[fin] += facons[debut] * sum(1 for reconnaitre in reconnaisseurs if reconnaitre(morceau))
+            facons[fin] = min(facons[fin], 2)
+        return facons[-1]
+
+    def _exemple_ambigu(self, alternatives):
+        """Chaîne reconnue de deux façons par une suite d'alternatives, comme « ab » par (a|b|ab)* (None sinon).
+
+        Les exemples minimaux des alternatives (et, s'il y en a peu, leurs concaténations deux à deux) sont
+        découpés en morceaux reconnus par les alternatives : deux découpages possibles d'une chaîne en donnent
+        2^n pour sa répétition n fois.
+        """
+        if self.etat is None or len(alternatives) > TAILLE_MAX_ALTERNATIVES:
+            return None
+        reconnaisseurs = [self._compiler_morceau(alternative) for alternative in alternatives]
+        reconnaisseurs = [reconnaitre for reconnaitre in reconnaisseurs if reconnaitre is not None]
+        exemples = [self.exemple_minimal(alternative) for alternative in alternatives]
+        exemples = [exemple for exemple in exemples if 0 < len(exemple) <= LONGUEUR_MAX_EXEMPLE]
+        if len(alternatives) <= TAILLE_MAX_PAIRES:
+            exemples += [premier + second for premier in exemples for second in exemples]
+        for exemple in exemples:
+            if self._decoupages(exemple, reconnaisseurs) >= 2:
+                return exemple
+        return None
+
+    def _verifier_alternatives(self, corps, prefixe, avant=(), apres=()):
+        """Alternatives qui se recouvrent sous un quantificateur non borné, comme (ab|a.)* ou (a|b|ab)*.
+
+        avant et apres sont les parties du corps de la répétition qui entourent la sous-expression examinée ;
+        elles servent à construire le motif répété de la chaîne d'attaque. Le parseur de re factorise le début
+        commun des alternatives (a|ab devient a(?:|b)) : chaque alternative est donc examinée avec ce qui
+        l'entoure dans le corps de la répétition (a, puis ab).
+        """
+        for index, (op, av) in enumerate(corps):
+            if op == sre_constants.SUBPATTERN:
+                if self._verifier_alternatives(av[3], prefixe, avant + ((corps, 0, index),),
+                                               ((corps, index + 1, len(corps)),) + apres):
+                    return True
+            if op != sre_constants.BRANCH:
+                continue
+            entourage_avant = avant + ((corps, 0, index),)
+            entourage_apres = ((corps, index + 1, len(corps)),) + apres
+            alternatives = [
+                [element for sequence, debut, fin in entourage_avant for element in sequence[debut:fin]]
+                + list(alternative)
+                + [element for sequence, debut, fin in entourage_apres for element in sequence[debut:fin]]
+                for alternative in av[1]
+            ]
+            # Pour chaque caractère, nombre d'alternatives capables de reconnaître une suite de ce seul caractère
+            alternatives_par_caractere = {}
+            for alternative in alternatives:
+                for caractere in self.caracteres(alternative):
+                    if self.peut_consommer(alternative, {caractere}):
+                        alternatives_par_caractere[caractere] = alternatives_par_caractere.get(caractere, 0) + 1
+            communs = sorted(c for c, nombre in alternatives_par_caractere.items() if nombre >= 2)
+            if communs:
+                caractere = communs[0]
+                pompe = self._exemple_morceaux(entourage_avant + (caractere,) + entourage_apres)
+                self._signaler(
+                    EXPONENTIELLE, 1,
+                    f"Alternatives qui se recouvrent sous une répétition non bornée "
+                    f"(plusieurs acceptent {caractere!r}).",
+                    self._exemple_morceaux(prefixe) + pompe * REPETITIONS_EXPONENTIELLE + self._fin_echec(pompe)
+                )
+                return True
+            pompe = self._exemple_ambigu(alternatives)
+            if pompe is not None:
+                self._signaler(
+                    EXPONENTIELLE, 1,
+                    f"Alternatives ambiguës sous une répétition non bornée : {pompe!r} est reconnu de "
+                    f"plusieurs façons.",
+                    self._exemple_morceaux(prefixe) + pompe * REPETITIONS_EXPONENTIELLE + self._fin_echec(pompe)
+                )
+                return True
+        return False
+
+    def _verifier_sequence(self, sequence, prefixe, non_ancree):
+        """Répétitions non bornées consécutives sur les mêmes caractères (retour arrière polynomial)."""
+        for debut, (op, av) in enumerate(sequence):
+            if op not in REPETITIONS or av[1] != MAXREPEAT:
+                continue
+            for caractere in sorted(self.caracteres(av[2])):
+                degre = 1
+                for op_suivant, av_suivant in itertools.islice(sequence, debut + 1, None):
+                    if not self.peut_consommer([(op_suivant, av_suivant)], {caractere}):
+                        break
+                    if op_suivant in REPETITIONS and av_suivant[1] == MAXREPEAT:
+                        degre += 1
+                if non_ancree and debut == 0:
+                    # re.search essaie chaque position de départ
+                    degre += 1
+                if degre >= 2:
+                    self._signaler(
+                        POLYNOMIALE, degre,
+                        f"Répétitions non bornées successives sur les mêmes caractères (ex. {caractere!r}) : "
+                        f"temps de l'ordre de n^{degre} en cas d'échec.",
+                        self._exemple_morceaux(prefixe + [(sequence, 0, debut)])
+                        + caractere * REPETITIONS_POLYNOMIALE + self._fin_echec(caractere)
+                    )
+                    break
+
+    def parcourir(self, sequence, prefixe=None, non_ancree=False):
+        """Parcourt l'arbre en une passe et signale les constructions à retour arrière super-linéaire.
+
+        prefixe est la liste des morceaux qui mènent à la sous-expression ; la chaîne correspondante
+        n'est construite que si un problème est signalé.
+        """
+        prefixe = [] if prefixe is None else prefixe
+        self._verifier_sequence(sequence, prefixe, non_ancree)
+        for index, (op, av) in enumerate(sequence):
+            # Préfixe menant à l'élément courant
+            prefixe.append((sequence, 0, index))
+            if op in REPETITIONS and av[1] == MAXREPEAT:
+                if not self._verifier_imbrication(av[2], prefixe):
+                    self._verifier_alternatives(av[2], prefixe)
+            if op not in SANS_RETOUR_ARRIERE:
+                for sous_sequence in _sous_sequences(op, av):
+                    self.parcourir(sous_sequence, prefixe)
+            prefixe.pop()
+
+
+@functools.lru_cache(maxsize=1024)
+def _plage(debut, fin):
+    """Caractères de l'alphabet représentatif compris dans une plage [debut-fin]."""
+    return frozenset(c for c in ALPHABET if debut <= ord(c) <= fin)
+
+
+def _sous_sequences(op, av):
+    """Sous-expressions directes d'un nœud de l'arbre du parseur."""
+    if op in REPETITIONS or op == POSSESSIVE_REPEAT:
+        return [av[2]]
+    if op == ATOMIC_GROUP:
+        return [av]
+    if op == sre_constants.SUBPATTERN:
+        return [av[3]]
+    if op == sre_constants.BRANCH:
+        return av[1]
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_constants.GROUPREF_EXISTS:
+        return [sous for sous in av[1:] if sous is not None]
+    return []
+
+
+def analyser_arbre(arbre):
+    """Analyse un arbre déjà produit par sre_parse.parse (voir analyser)."""
+    # Flags effectifs, y compris ceux déclarés dans l'expression comme (?i)
+    etat = getattr(arbre, "state", None) or arbre.pattern
+    analyseur = _Analyseur(etat.flags, etat)
+    premier = arbre[0][0] if len(arbre) else None
+    non_ancree = premier != sre_constants.AT
+    analyseur.parcourir(arbre, non_ancree=non_ancree)
+    return analyseur.rapport
+
+
+@functools.lru_cache(maxsize=256)
+def analyser(motif, flags=0):
+    """Analyse statiquement une expression régulière et estime sa complexité au pire cas.
+
+    Lève re.error si l'expression est invalide.
+    """
+    return analyser_arbre(sre_parse.parse(motif, flags))
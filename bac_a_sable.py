@@ -0,0 +1,152 @@
+import itertools
+import multiprocessing
+import queue
+import time
+
+import moteur
+
+# Budgets par défaut (en secondes) : par ligne et par bloc de lignes
+DELAI_LIGNE = 1.0
+DELAI_BLOC = 30.0
+
+# Nombre de lignes envoyées au processus en une fois
+TAILLE_BLOC_PROTEGE = 1000
+
+# Délai maximal de démarrage d'un processus (en secondes)
+DELAI_DEMARRAGE = 30.0
+
+# Message envoyé par un processus une fois démarré
+PRET = "pret"
+
+
+def _boucle_processus(connexion):
+    """Boucle d'un processus de correspondance : reçoit des blocs de lignes et renvoie un résultat par ligne."""
+    # Signale la fin du démarrage, pour que le temps d'import ne soit pas décompté du délai de la première ligne
+    connexion.send(PRET)
+    while True:
+        message = connexion.recv()
+        if message is None:
+            break
+        motif, flags, nom_moteur, lignes = message
+        pattern = moteur.compiler(motif, flags, nom_moteur)
+        prefiltre = moteur.prefiltre_de(pattern)
+        for numero, line in lignes:
+            connexion.send(moteur.evaluer_ligne_prefiltree(pattern, numero, line, prefiltre))
+
+
+def resultat_delai_depasse(numero, line):
+    """Ligne de résultat pour une ligne dont l'évaluation a dépassé le délai."""
+    return {
+        "Ligne": numero,
+        "Texte": line,
+        "Correspond": moteur.DELAI_DEPASSE,
+        "Valeur trouvée": None,
+        "Groupes": None,
+        "Groupes nommés": None
+    }
+
+
+class ProcessusCorrespondance:
+    """Processus de correspondance qui peut être tué et remplacé si une expression ne rend pas la main."""
+
+    def __init__(self, contexte):
+        self._contexte = contexte
+        self.occupe = False
+        self._demarrer()
+
+    def _demarrer(self):
+        self.connexion, connexion_enfant = self._contexte.Pipe()
+        self.processus = self._contexte.Process(target=_boucle_processus, args=(connexion_enfant,), daemon=True)
+        self.processus.start()
+        connexion_enfant.close()
+        if not self.connexion.poll(DELAI_DEMARRAGE) or self.connexion.recv() != PRET:
+            self.processus.kill()
+            raise RuntimeError("Le processus de correspondance n'a pas démarré.")
+        self.occupe = False
+
+    def redemarrer(self):
+        """Tue le processus (éventuellement bloqué dans re) et en démarre un nouveau."""
+        self.processus.kill()
+        self.processus.join()
+        self.connexion.close()
+        self._demarrer()
+
+    def arreter(self):
+        try:
+            self.connexion.send(None)
+        except OSError:
+            pass
+        self.processus.join(timeout=1)
+        if self.processus.is_alive():
+            self.processus.kill()
+        self.connexion.close()
+
+
+class PoolBacASable:
+    """Pool de processus de correspondance démarrés à l'avance, avec délais maximaux par ligne et par bloc."""
+
+    def __init__(self, taille=2, delai_ligne=DELAI_LIGNE, delai_bloc=DELAI_BLOC, taille_bloc=TAILLE_BLOC_PROTEGE):
+        self.delai_ligne = delai_ligne
+        self.delai_bloc = delai_bloc
+        self.taille_bloc = taille_bloc
+        self.redemarrages = 0
+        # "spawn" évite de dupliquer par fork les threads du serveur Streamlit
+        contexte = multiprocessing.get_context("spawn")
+        self._libres = queue.Queue()
+        self._tous = []
+        for _ in range(taille):
+            processus = ProcessusCorrespondance(contexte)
+            self._tous.append(processus)
+            self._libres.put(processus)
+
+    def _evaluer_bloc(self, processus, pattern, bloc, delai_ligne, delai_bloc):
+        """Évalue un bloc de lignes non vides ; les lignes hors délai sont marquées et le processus recyclé."""
+        fin_bloc = time.monotonic() + delai_bloc
+        restantes = bloc
+        while restantes:
+            processus.occupe = True
+            processus.connexion.send((pattern.pattern, pattern.flags, moteur.moteur_de(pattern), restantes))
+            for index, (numero, line) in enumerate(restantes):
+                reste_bloc = fin_bloc - time.monotonic()
+                if processus.connexion.poll(max(0, min(delai_ligne, reste_bloc))):
+                    yield processus.connexion.recv()
+                    continue
+
+                # Délai dépassé : le processus est bloqué dans la recherche, on le remplace
+                processus.redemarrer()
+                self.redemarrages += 1
+                yield resultat_delai_depasse(numero, line), False
+                if reste_bloc <= delai_ligne:
+                    # Budget du bloc épuisé : les lignes suivantes ne sont pas évaluées
+                    for numero_suivant, line_suivante in restantes[index + 1:]:
+                        yield resultat_delai_depasse(numero_suivant, line_suivante), False
+                    restantes = []
+                else:
+                    restantes = restantes[index + 1:]
+                break
+            else:
+                restantes = []
+        processus.occupe = False
+
+    def evaluer(self, pattern, lignes, delai_ligne=None, delai_bloc=None):
+        """Évalue les lignes sans jamais bloquer plus que les délais fixés (générateur de paires (résultat, écartée)
+        dans l'ordre des lignes, comme moteur.evaluer)."""
+        delai_ligne = delai_ligne or self.delai_ligne
+        delai_bloc = delai_bloc or self.delai_bloc
+        non_vides = ((numero, line) for numero, line in enumerate(lignes, start=1) if line.strip())
+        processus = self._libres.get()
+        try:
+            while True:
+                bloc = list(itertools.islice(non_vides, self.taille_bloc))
+                if not bloc:
+                    break
+                yield from self._evaluer_bloc(processus, pattern, bloc, delai_ligne, delai_bloc)
+        finally:
+            # Évaluation abandonnée en cours de bloc : des résultats sont encore en attente dans le tube
+            if processus.occupe:
+                processus.redemarrer()
+            self._libres.put(processus)
+
+    def arreter(self):
+        for processus in self._tous:
+            processus.arreter()
@@ -0,0 +1,49 @@
+"""Mesure le gain du dédoublonnage des valeurs (une évaluation par valeur distincte) selon la cardinalité.
+
+Usage : python benchmarks/bench_dedoublonnage.py [nombre_de_lignes]
+"""
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+import tabulaire  # noqa: E402
+
+MOTIF = r"^(\d{9})([A-Z]{2})$"
+
+
+def lignes_codes(nombre, cardinalite):
+    """Codes INE tirés parmi `cardinalite` valeurs distinctes, dont une sur dix est invalide (en minuscules)."""
+    valeurs = [f"{i:09d}{'ab' if i % 10 == 0 else 'AB'}" for i in range(cardinalite)]
+    return [valeurs[i * 7919 % cardinalite] for i in range(nombre)]
+
+
+def mesurer(fonction, *arguments):
+    """Durée d'un appel, en secondes."""
+    debut = time.perf_counter()
+    fonction(*arguments)
+    return time.perf_counter() - debut
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pattern = re.compile(MOTIF)
+    print(f"{nombre} lignes")
+    print(f"{'Valeurs distinctes':>18} {'Flux (s)':>9} {'Dédoublonné (s)':>16} {'Tableau (s)':>12} {'Dédoublonné (s)':>16}")
+    for cardinalite in (10, 1_000, 100_000, nombre):
+        lignes = lignes_codes(nombre, cardinalite)
+        serie = pd.Series(lignes, dtype=tabulaire.dtype_texte())
+        flux = mesurer(moteur.tester_flux, pattern, lignes)
+        flux_dedoublonne = mesurer(moteur.tester_flux, pattern, lignes, moteur.TAILLE_ECHANTILLON, 1, None, None, None, True)
+        tableau = mesurer(tabulaire.evaluer_colonne, serie, pattern)
+        tableau_dedoublonne = mesurer(tabulaire.evaluer_colonne, serie, pattern, "search", True)
+        print(f"{cardinalite:>18} {flux:>9.2f} {flux_dedoublonne:>16.2f} {tableau:>12.2f} {tableau_dedoublonne:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare l'explication par arbre syntaxique (explication.py) à l'ancienne analyse par sous-chaînes.
+
+Usage : python benchmarks/bench_explication.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from documentation_heuristique import generer_documentation_heuristique  # noqa: E402
+from explication import generer_documentation  # noqa: E402
+
+
+def alternative_de_codes(nombre):
+    """Alternative générée à partir d'une liste de codes INE, comme celles produites pour les listes de référence."""
+    return "^(?:" + "|".join(f"{i:09d}[A-Z]{{2}}" for i in range(nombre)) + ")$"
+
+
+def liste_de_mots(nombre):
+    """Alternative de mots sans métacaractère (expliquée sans construire l'arbre)."""
+    return "^(?:" + "|".join(f"mot{i}" for i in range(nombre)) + ")$"
+
+
+def sequence_de_groupes(nombre):
+    """Longue suite de groupes, de classes et de quantificateurs."""
+    return "^" + "".join(f"(?P<g{i}>[A-Z]{{2}}\\d{{3,}})[-/]?" for i in range(nombre)) + "$"
+
+
+MOTIFS = {
+    "date JJ-MM-AAAA": r"^\d{2}-\d{2}-\d{4}$",
+    "email": r"^[\w.+-]+@[\w-]+\.[a-z]{2,}$",
+    "1 000 codes": alternative_de_codes(1000),
+    "10 000 codes": alternative_de_codes(10000),
+    "10 000 mots": liste_de_mots(10000),
+    "500 groupes": sequence_de_groupes(500),
+    "5 000 groupes": sequence_de_groupes(5000),
+}
+
+
+def mesurer(fonction, motif):
+    """Temps moyen d'un appel, en millisecondes."""
+    repetitions, duree = timeit.Timer(lambda: fonction(motif)).autorange()
+    return duree / repetitions * 1000
+
+
+def main():
+    # Sans la mémoïsation, pour mesurer le coût réel d'une analyse
+    explication = generer_documentation.__wrapped__
+    print(f"{'Expression':<20} {'Taille':>9} {'Heuristique (ms)':>17} {'Arbre (ms)':>11}")
+    for nom, motif in MOTIFS.items():
+        ancien = mesurer(generer_documentation_heuristique, motif)
+        nouveau = mesurer(explication, motif)
+        print(f"{nom:<20} {len(motif):>9} {ancien:>17.2f} {nouveau:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
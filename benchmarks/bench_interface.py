@@ -0,0 +1,79 @@
+"""Mesure le temps de démarrage à froid et le temps de chaque réexécution du script Streamlit (main.py).
+
+Chaque mesure à froid est faite dans un nouveau processus Python. Le script est exécuté avec
+streamlit.testing (sans navigateur) : le temps mesuré est celui du script, hors rendu dans le navigateur.
+
+Usage : python benchmarks/bench_interface.py [nombre_de_reexecutions]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules lourds dont on vérifie qu'ils ne sont pas chargés au premier affichage
+MODULES_LOURDS = ("pandas", "numpy", "requests", "urllib3", "asyncio", "multiprocessing", "sqlite3")
+
+# Exécuté dans un processus neuf : premier affichage, puis réexécutions après une frappe dans l'expression
+MESURE = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+avant = set(sys.modules)
+debut = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+premier = time.perf_counter() - debut
+charges = sorted(m for m in set(sys.modules) - avant if m.split(".")[0] in sys.argv[3].split(","))
+
+reexecutions = []
+for i in range(int(sys.argv[2])):
+    at.text_input[0].set_value("^\\d{2}-\\d{2}-\\d{%d}$" % (4 + i % 2))
+    debut = time.perf_counter()
+    at.run()
+    reexecutions.append(time.perf_counter() - debut)
+
+# Coût propre de streamlit.testing, mesuré sur un script minimal avec un champ de saisie
+vide = AppTest.from_string("import streamlit as st\nst.text_input('x')").run()
+surcout = []
+for i in range(int(sys.argv[2])):
+    vide.text_input[0].set_value(str(i))
+    debut = time.perf_counter()
+    vide.run()
+    surcout.append(time.perf_counter() - debut)
+
+print(json.dumps({"premier": premier, "reexecutions": reexecutions, "surcout": surcout,
+                  "modules": sorted({m.split(".")[0] for m in charges})}))
+"""
+
+
+def importer_a_froid(module):
+    """Temps d'import d'un module dans un processus neuf, en millisecondes."""
+    code = f"import time; debut = time.perf_counter(); import {module}; print(time.perf_counter() - debut)"
+    sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, capture_output=True, text=True, check=True)
+    return float(sortie.stdout) * 1000
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print("Import à froid (ms) :")
+    for module in ("streamlit",) + MODULES_LOURDS[:3] + ("moteur",):
+        print(f"  {module:<16} {importer_a_froid(module):>8.1f}")
+
+    sortie = subprocess.run(
+        [sys.executable, "-c", MESURE, os.path.join(RACINE, "main.py"), str(nombre), ",".join(MODULES_LOURDS)],
+        cwd=RACINE, capture_output=True, text=True, check=True
+    )
+    mesures = json.loads(sortie.stdout.strip().splitlines()[-1])
+    reexecutions = [duree * 1000 for duree in mesures["reexecutions"]]
+    surcout = statistics.median(duree * 1000 for duree in mesures["surcout"])
+    print(f"Premier affichage (ms) :        {mesures['premier'] * 1000:>8.1f}")
+    print(f"Réexécution, médiane (ms) :     {statistics.median(reexecutions):>8.1f}")
+    print(f"Réexécution, maximum (ms) :     {max(reexecutions):>8.1f}")
+    print(f"  dont streamlit.testing (ms) : {surcout:>8.1f}")
+    print("Modules lourds chargés au premier affichage : " + (", ".join(mesures["modules"]) or "aucun"))
+
+
+if __name__ == "__main__":
+    main()
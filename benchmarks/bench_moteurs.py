@@ -0,0 +1,69 @@
+"""Compare le débit des moteurs d'expressions régulières (re, regex, re2) sur la boucle du testeur.
+
+Les moteurs non installés sont signalés ; quand un moteur ne sait pas exécuter l'expression, le moteur
+de repli réellement utilisé est indiqué.
+
+Usage : python benchmarks/bench_moteurs.py [nombre_de_lignes]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+
+MOTIFS = {
+    "date JJ-MM-AAAA": (r"^\d{2}-\d{2}-\d{4}$", re.ASCII),
+    "WARN non ancré": (r"(\S+) WARN .*timeout after (\d+)ms", re.ASCII),
+    "email": (r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$", re.ASCII),
+    "référence arrière": (r"(\w)\1", re.ASCII),
+    "exponentielle": (r"^(a+)+$", 0),
+}
+
+
+def lignes_test(nombre):
+    """Dates, lignes de journal, adresses, et quelques chaînes qui font exploser le retour arrière."""
+    lignes = []
+    for i in range(nombre):
+        if i % 1000 == 0:
+            lignes.append("a" * 20 + "!")
+        elif i % 4 == 0:
+            lignes.append(f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-{2000 + i % 25}")
+        elif i % 4 == 1:
+            lignes.append(f"2024-01-01 WARN worker-{i % 7} timeout after {i % 900}ms")
+        elif i % 4 == 2:
+            lignes.append(f"prenom.nom{i}@exemple.fr")
+        else:
+            lignes.append(f"2024-01-01 INFO request {i} served in {i % 100} ms by worker-{i % 7}")
+    return lignes
+
+
+def mesurer(pattern, lignes):
+    """Durée de l'évaluation de toutes les lignes, en secondes."""
+    debut = time.perf_counter()
+    for _ in moteur.evaluer_lignes_prefiltrees(pattern, lignes):
+        pass
+    return time.perf_counter() - debut
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lignes = lignes_test(nombre)
+    print(f"{nombre} lignes ; moteurs installés : "
+          + ", ".join(nom for nom in moteur.MOTEURS if moteur.moteur_disponible(nom)))
+    print(f"{'Expression':<20} {'Demandé':<8} {'Utilisé':<8} {'Lignes/s':>12}")
+    for nom, (motif, flags) in MOTIFS.items():
+        for demande in moteur.MOTEURS:
+            pattern = moteur.compiler(motif, flags, demande)
+            utilise = moteur.moteur_de(pattern)
+            if utilise != demande and not moteur.moteur_disponible(demande):
+                print(f"{nom:<20} {demande:<8} {'-':<8} {'non installé':>12}")
+                continue
+            duree = mesurer(pattern, lignes)
+            print(f"{nom:<20} {demande:<8} {utilise:<8} {nombre / duree:>12,.0f}".replace(",", " "))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Mesure le gain du préfiltre par littéraux obligatoires (prefiltre.py) sur des lignes de journal.
+
+Usage : python benchmarks/bench_prefiltre.py [nombre_de_lignes]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+from prefiltre import construire_prefiltre  # noqa: E402
+
+MOTIFS = {
+    "WARN non ancré": r"(\S+) WARN .*timeout after (\d+)ms",
+    "email": r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$",
+    "date JJ-MM-AAAA": r"^\d{2}-\d{2}-\d{4}$",
+}
+
+
+def journal(nombre):
+    """Lignes de journal dont 5 % sont des avertissements de délai dépassé."""
+    return [
+        f"2024-01-01 WARN worker-{i % 7} timeout after {i % 900}ms" if i % 20 == 0
+        else f"2024-01-01 INFO request {i} served in {i % 100} ms by worker-{i % 7}"
+        for i in range(nombre)
+    ]
+
+
+def sans_prefiltre(pattern, lignes):
+    return [moteur.evaluer_ligne_prefiltree(pattern, numero, line, None) for numero, line in enumerate(lignes, start=1)]
+
+
+def avec_prefiltre(pattern, lignes):
+    return list(moteur.evaluer_lignes_prefiltrees(pattern, lignes))
+
+
+def mesurer(fonction, *arguments):
+    """Durée d'un appel, en secondes."""
+    debut = time.perf_counter()
+    fonction(*arguments)
+    return time.perf_counter() - debut
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    lignes = journal(nombre)
+    print(f"{nombre} lignes")
+    print(f"{'Expression':<18} {'Littéraux':<34} {'Écartées':>9} {'Sans (s)':>9} {'Avec (s)':>9}")
+    for nom, motif in MOTIFS.items():
+        pattern = re.compile(motif)
+        prefiltre = construire_prefiltre(pattern.pattern, pattern.flags)
+        ecartees = sum(1 for line in lignes if prefiltre and prefiltre.ecarte(line))
+        ancien = mesurer(sans_prefiltre, pattern, lignes)
+        nouveau = mesurer(avec_prefiltre, pattern, lignes)
+        print(f"{nom:<18} {prefiltre.description():<34} {ecartees:>9} {ancien:>9.2f} {nouveau:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
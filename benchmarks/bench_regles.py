@@ -0,0 +1,57 @@
+"""Compare le test d'un jeu de règles en une passe (regles.py) à une passe par règle.
+
+Usage : python benchmarks/bench_regles.py [nombre_de_lignes]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+from regles import JeuRegles, tester_regles  # noqa: E402
+
+
+def jeu_de_regles(nombre):
+    """Règles de codes ancrés : une lettre, un numéro de règle et un suffixe."""
+    aleatoire = random.Random(0)
+    return {
+        f"Code {i}": f"^{aleatoire.choice(string.ascii_uppercase)}{i:04d}-[A-Z]+$"
+        for i in range(nombre)
+    }
+
+
+def lignes_de_test(nombre, nombre_regles):
+    aleatoire = random.Random(1)
+    return [
+        f"{aleatoire.choice(string.ascii_uppercase)}{aleatoire.randrange(nombre_regles):04d}-ABC"
+        for _ in range(nombre)
+    ]
+
+
+def une_passe_par_regle(regles, lignes):
+    """Chemin du testeur : une évaluation complète des lignes par règle."""
+    for motif in regles.values():
+        moteur.tester_flux(moteur.compiler(motif), lignes)
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{nombre} lignes")
+    print(f"{'Règles':>7} {'Une passe par règle (s)':>24} {'Jeu de règles (s)':>18}")
+    for nombre_regles in (5, 50, 500):
+        regles = jeu_de_regles(nombre_regles)
+        lignes = lignes_de_test(nombre, nombre_regles)
+        debut = time.perf_counter()
+        une_passe_par_regle(regles, lignes)
+        ancien = time.perf_counter() - debut
+        debut = time.perf_counter()
+        tester_regles(JeuRegles(regles), lignes)
+        nouveau = time.perf_counter() - debut
+        print(f"{nombre_regles:>7} {ancien:>24.2f} {nouveau:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare l'évaluation vectorisée d'une colonne (tabulaire.py) à la boucle ligne par ligne du testeur.
+
+Usage : python benchmarks/bench_tabulaire.py [nombre_de_lignes]
+"""
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+import tabulaire  # noqa: E402
+
+MOTIFS = {
+    "date JJ-MM-AAAA": r"^(?P<jour>\d{2})-(?P<mois>\d{2})-(?P<annee>\d{4})$",
+    "INE": r"^\d{9}[A-Z]{2}$",
+}
+
+
+def colonne(nombre):
+    """Colonne de dates, dont une sur trois est au mauvais format."""
+    valeurs = [f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-{2000 + i % 25}" for i in range(nombre)]
+    for i in range(0, nombre, 3):
+        valeurs[i] = valeurs[i].replace("-", "/")
+    return pd.Series(valeurs, dtype=tabulaire.dtype_texte())
+
+
+def boucle(serie, pattern):
+    """Chemin du testeur : un dictionnaire par ligne, puis un DataFrame."""
+    return pd.DataFrame([resultat for resultat, _ in moteur.evaluer_lignes_prefiltrees(pattern, serie.tolist())])
+
+
+def mesurer(fonction, *arguments):
+    """Durée d'un appel, en secondes."""
+    debut = time.perf_counter()
+    fonction(*arguments)
+    return time.perf_counter() - debut
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    serie = colonne(nombre)
+    print(f"{nombre} lignes, type {serie.dtype}")
+    print(f"{'Expression':<18} {'Boucle (s)':>11} {'Vectorisé (s)':>14} {'Gain':>6}")
+    for nom, motif in MOTIFS.items():
+        pattern = re.compile(motif)
+        ancien = mesurer(boucle, serie, pattern)
+        nouveau = mesurer(tabulaire.evaluer_colonne, serie, pattern, "search")
+        print(f"{nom:<18} {ancien:>11.2f} {nouveau:>14.2f} {ancien / nouveau:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Mesure la recherche sur le texte entier (finditer sur un fichier projeté en mémoire) et la mémoire utilisée.
+
+Le fichier de test (un journal de N Mo) est écrit dans un répertoire temporaire. Le motif « . » produit une
+correspondance par octet : seules les premières sont conservées, la mémoire doit rester bornée.
+
+Usage : python benchmarks/bench_texte_entier.py [taille_en_mo]
+"""
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import moteur  # noqa: E402
+
+MOTIFS = (
+    ("erreurs multilignes", r"^ERREUR .*(?:\n  .*)*", re.MULTILINE),
+    ("dates", r"(?P<jour>\d{2})/(?P<mois>\d{2})/(?P<annee>\d{4})", 0),
+    ("tout caractère", r".", re.DOTALL),
+)
+
+BLOC_JOURNAL = (
+    b"12/03/2024 INFO demarrage du service\n"
+    b"ERREUR 12/03/2024 connexion refusee\n"
+    b"  a l'adresse 10.0.0.1\n"
+    b"  nouvelle tentative dans 5 s\n"
+    b"12/03/2024 INFO service pret\n"
+)
+
+
+def ecrire_journal(chemin, taille_mo):
+    """Journal d'environ taille_mo Mo fait de blocs répétés."""
+    repetitions = taille_mo * 1024 * 1024 // len(BLOC_JOURNAL)
+    with open(chemin, "wb") as f:
+        for _ in range(0, repetitions, 10_000):
+            f.write(BLOC_JOURNAL * min(10_000, repetitions))
+
+
+def memoire_max_mo():
+    """Mémoire résidente maximale du processus depuis son démarrage, en Mo (Linux : ru_maxrss en Kio)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    taille_mo = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "journal.log")
+        ecrire_journal(chemin, taille_mo)
+        taille = os.path.getsize(chemin)
+        print(f"Fichier de {taille / 1e6:.0f} Mo, au plus {moteur.TAILLE_MAX_OCCURRENCES} correspondances conservées")
+        print(f"{'Motif':<22} {'Correspondances':>16} {'Durée (s)':>10} {'Mo/s':>8} {'Mémoire max (Mo)':>17}")
+        for nom, motif, flags in MOTIFS:
+            pattern = moteur.compiler_tampon(motif, flags, octets=True)
+            with open(chemin, "rb") as fichier:
+                debut = time.perf_counter()
+                occurrences = moteur.rechercher_occurrences(pattern, moteur.ouvrir_tampon(fichier))
+                duree = time.perf_counter() - debut
+            print(f"{nom:<22} {occurrences.total:>16} {duree:>10.2f} {taille / 1e6 / duree:>8.1f} {memoire_max_mo():>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
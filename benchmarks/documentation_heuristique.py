@@ -0,0 +1,152 @@
+# Version précédente de generer_documentation (recherche de sous-chaînes dans le texte de l'expression),
+# conservée uniquement comme point de comparaison pour bench_explication.py
+import re
+
+
+def generer_documentation_heuristique(pattern):
+    """Analyse une expression régulière et génère une documentation explicative détaillée."""
+    try:
+        doc = []
+        exemples_valides = []
+        exemples_invalides = []
+        
+        # Analyse basique du pattern
+        if pattern.startswith('^') and pattern.endswith('$'):
+            doc.append("Cette expression régulière valide une chaîne complète (doit correspondre du début à la fin).")
+        elif pattern.startswith('^'):
+            doc.append("Cette expression régulière valide le début d'une chaîne.")
+        elif pattern.endswith('$'):
+            doc.append("Cette expression régulière valide la fin d'une chaîne.")
+        else:
+            doc.append("Cette expression régulière recherche un motif n'importe où dans la chaîne.")
+        
+        # Reconnaissance de motifs spécifiques avec interprétation détaillée
+        if pattern == r'^[A-Z][A-Z\s\-\']*$':
+            doc = ["Cette expression régulière valide un nom écrit entièrement en MAJUSCULES."]
+            doc.append("La chaîne doit commencer par une lettre majuscule ([A-Z]).")
+            doc.append("Elle peut ensuite contenir plusieurs (ou aucun) caractères parmi: lettres majuscules, espaces, tirets ou apostrophes ([A-Z\\s\\-\']*).")
+            doc.append("Aucun autre caractère n'est autorisé (chiffres, minuscules, symboles, etc.).")
+            exemples_valides = ["DUPONT", "MARTIN-DURAND", "O'CONNOR", "DE LA FONTAINE"]
+            exemples_invalides = ["Dupont", "MARTIN2", "dupont", "123NOM"]
+        
+        elif r'^[0-9]{9}[A-Z]{2}$' in pattern:
+            doc = ["Cette expression régulière valide un code INE (Identifiant National Étudiant)."]
+            doc.append("La chaîne doit contenir exactement 9 chiffres ([0-9]{9}) suivis de 2 lettres majuscules ([A-Z]{2}).")
+            doc.append("Aucun espace ou autre caractère n'est autorisé.")
+            exemples_valides = ["123456789AB", "987654321XY"]
+            exemples_invalides = ["12345678AB", "123456789abc", "ABC123456", "123456789A"]
+        
+        elif r'^\d{2}-\d{2}-\d{4}$' in pattern:
+            doc = ["Cette expression régulière valide une date au format JJ-MM-AAAA."]
+            doc.append("La chaîne doit contenir exactement 2 chiffres (jour), suivis d'un tiret, de 2 chiffres (mois), d'un tiret, puis de 4 chiffres (année).")
+            doc.append("Tous les chiffres doivent être sur 2 positions pour les jours et mois, et sur 4 positions pour l'année.")
+            doc.append("Le séparateur doit être un tiret (-) et non un autre caractère.")
+            exemples_valides = ["01-01-2023", "31-12-2022"]
+            exemples_invalides = ["1-1-2023", "01/01/2023"]
+        
+        elif r'^(0[1-9]|1[0-2])\/20[0-9]{2}$' in pattern:
+            doc = ["Cette expression régulière valide une date au format MM/AAAA pour le 21ème siècle (2000-2099)."]
+            doc.append("Le mois doit être compris entre 01 et 12 (0[1-9] ou 1[0-2]).")
+            doc.append("Le séparateur doit être un slash (/).")
+            doc.append("L'année doit commencer par '20' suivi de deux chiffres (entre 2000 et 2099).")
+            exemples_valides = ["01/2023", "12/2099", "05/2010"]
+            exemples_invalides = ["1/2023", "13/2023", "05/123", "05-2023", "05/1999"]
+        
+        elif r'@' in pattern and r'\.' in pattern:
+            doc.append("Elle semble valider un format d'adresse email.")
+            doc.append("Elle recherche un caractère '@' suivi d'un domaine contenant un point.")
+            exemples_valides = ["exemple@domaine.com", "prenom.nom@entreprise.fr"]
+            exemples_invalides = ["exemple@", "exemple@domaine", "@domaine.com"]
+        
+        # Si on n'a pas reconnu précisément le motif, faire une analyse plus générique
+        if len(doc) <= 2:
+            # Analyse détaillée des classes de caractères
+            if '[A-Z]' in pattern:
+                doc.append("Elle contient des lettres majuscules (A à Z).")
+            if '[a-z]' in pattern:
+                doc.append("Elle contient des lettres minuscules (a à z).")
+            if '[0-9]' in pattern:
+                doc.append("Elle contient des chiffres (0 à 9).")
+            
+            # Analyse détaillée des motifs courants
+            if r'\d' in pattern:
+                doc.append("Elle contient des chiffres (\\d équivaut à [0-9]).")
+            if r'\w' in pattern:
+                doc.append("Elle contient des caractères alphanumériques (lettres, chiffres, underscore).")
+            if r'\s' in pattern:
+                doc.append("Elle contient des espaces blancs (espaces, tabulations, retours à la ligne, etc.).")
+            
+            # Analyse des quantificateurs spécifiques
+            if '*' in pattern:
+                doc.append("Elle contient un élément qui peut se répéter zéro ou plusieurs fois (*).")
+            if '+' in pattern:
+                doc.append("Elle contient un élément qui doit se répéter une ou plusieurs fois (+).")
+            if '?' in pattern:
+                doc.append("Elle contient un élément optionnel (?).")
+            
+            # Analyse des séquences spécifiques (séquences d'échappement)
+            if r'\-' in pattern or r"\\'" in pattern:
+                doc.append("Elle contient des caractères spéciaux échappés (comme tiret ou apostrophe).")
+                
+            # Analyse plus détaillée des classes de caractères
+            if '[' in pattern and ']' in pattern:
+                # Analyser les classes de caractères complexes
+                classes = re.findall(r'\[(.*?)\]', pattern)
+                for classe in classes:
+                    if '-' in classe:
+                        # Tenter de décrire les plages
+                        plages = []
+                        if 'A-Z' in classe:
+                            plages.append("lettres majuscules (A-Z)")
+                        if 'a-z' in classe:
+                            plages.append("lettres minuscules (a-z)")
+                        if '0-9' in classe:
+                            plages.append("chiffres (0-9)")
+                        if plages:
+                            doc.append(f"Elle contient une classe de caractères incluant: {', '.join(plages)}.")
+                    
+                    # Caractères spécifiques
+                    special_chars = {'\\s': 'espaces', '\\d': 'chiffres', '\\w': 'caractères de mot'}
+                    for char, desc in special_chars.items():
+                        if char in classe:
+                            doc.append(f"Elle accepte des {desc} dans une classe de caractères.")
+            
+            # Analyse des groupes et alternatives
+            if '(' in pattern and ')' in pattern:
+                # Trouver les groupes pour analyse
+                groupes = re.findall(r'\((.*?)\)', pattern)
+                if groupes:
+                    doc.append(f"Elle contient {len(groupes)} groupe(s) de capture pour extraire des parties spécifiques du texte.")
+                    # Si un groupe contient un | (alternative)
+                    for groupe in groupes:
+                        if '|' in groupe:
+                            alternatives = groupe.split('|')
+                            doc.append(f"Elle contient une alternative entre plusieurs options: {', '.join([f'`{alt}`' for alt in alternatives])}.")
+            
+            # Analyse des quantificateurs précis
+            quantif_pattern = re.compile(r'\{(\d+)(?:,(\d+)?)?\}')
+            quantifs = quantif_pattern.findall(pattern)
+            for quantif in quantifs:
+                if quantif[1]:  # {n,m}
+                    doc.append(f"Elle impose entre {quantif[0]} et {quantif[1]} occurrences d'un élément.")
+                else:  # {n}
+                    doc.append(f"Elle impose exactement {quantif[0]} occurrences d'un élément.")
+        
+        # Construire la documentation finale
+        documentation = "\n".join(doc)
+        
+        if exemples_valides:
+            documentation += "\n\nExemples valides :\n"
+            documentation += "\n".join([f"- {ex}" for ex in exemples_valides])
+            
+        if exemples_invalides:
+            documentation += "\n\nExemples invalides :\n"
+            documentation += "\n".join([f"- {ex}" for ex in exemples_invalides])
+            
+        if not exemples_valides and not exemples_invalides:
+            documentation += "\n\nNote : Vous pouvez enrichir cette documentation en ajoutant vos propres exemples valides et invalides."
+        
+        return documentation
+    
+    except Exception as e:
+        return f"Impossible de générer la documentation automatiquement : {str(e)}\n\nVeuillez décrire manuellement ce que fait cette expression régulière."
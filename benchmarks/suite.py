@@ -0,0 +1,198 @@
+"""Suite de mesures des chemins critiques, comparée à une référence enregistrée (benchmarks/reference.json).
+
+Cas mesurés : boucle du testeur (1 000, 100 000 et 1 000 000 de lignes), generer_documentation sur une
+expression courte et sur de très longues expressions, construction du DataFrame et de la page mise en forme
+(Styler), et extraction de l'expression des réponses de Mistral (API simulée, aucun accès réseau).
+
+Chaque cas est exécuté plusieurs fois et le meilleur temps est retenu (le moins sensible à la charge de la
+machine). Le code de sortie est 1 si un cas est plus lent que la référence au-delà du seuil.
+
+Usage :
+    python benchmarks/suite.py                      # compare à la référence
+    python benchmarks/suite.py --enregistrer        # enregistre la référence (à faire sur la machine de mesure)
+    python benchmarks/suite.py --seuil 0.5 testeur  # seuil de 50 %, uniquement les cas contenant « testeur »
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import timeit
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+import moteur  # noqa: E402
+from client_mistral import ClientMistral, extraire_expression  # noqa: E402
+from explication import generer_documentation  # noqa: E402
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference.json")
+
+# Ralentissement toléré par rapport à la référence (0.25 : jusqu'à 25 % plus lent)
+SEUIL = 0.25
+
+# Même mise en page que l'affichage des résultats de main.py (une page de 100 lignes)
+TAILLE_PAGE = 100
+
+# Réponses typiques du modèle à la demande de génération d'expression
+REPONSES_MISTRAL = (
+    "`^0[67](?: ?\\d{2}){4}$`",
+    "Voici l'expression demandée : `^\\d{5}$` (code postal à cinq chiffres).",
+    "^[A-Z][A-Z\\s\\-']*$",
+    "L'expression suivante valide une adresse email ^[\\w.+-]+@[\\w-]+(?:\\.[\\w-]+)+$ sans espaces.",
+    "Je ne peux pas générer d'expression pour cette demande sans plus de précisions sur le format attendu. " * 20,
+)
+
+
+def lignes_dates(nombre):
+    """Dates JJ-MM-AAAA, dont une sur trois est au mauvais format."""
+    return [
+        f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/{2000 + i % 25}" if i % 3 == 0
+        else f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-{2000 + i % 25}"
+        for i in range(nombre)
+    ]
+
+
+def alternative_de_codes(nombre):
+    """Alternative de codes INE, comme celles produites pour les listes de référence."""
+    return "^(?:" + "|".join(f"{i:09d}[A-Z]{{2}}" for i in range(nombre)) + ")$"
+
+
+def sequence_de_groupes(nombre):
+    """Longue suite de groupes nommés, de classes et de quantificateurs."""
+    return "^" + "".join(f"(?P<g{i}>[A-Z]{{2}}\\d{{3,}})[-/]?" for i in range(nombre)) + "$"
+
+
+def style_correspondance(val):
+    """Même mise en forme que main.highlight_match."""
+    if val == "✓":
+        return 'color: green; font-weight: bold'
+    elif val == "✗":
+        return 'color: red; font-weight: bold'
+    return ''
+
+
+class ReponseSimulee:
+    """Réponse HTTP de l'API /chat/completions, sans réseau."""
+
+    status_code = 200
+
+    def __init__(self, contenu):
+        self.contenu = contenu
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.contenu}}]}
+
+
+def cas_testeur(nombre):
+    pattern = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+    lignes = lignes_dates(nombre)
+    return lambda: moteur.tester_flux(pattern, lignes)
+
+
+def cas_documentation(motif):
+    # Sans la mémoïsation, pour mesurer le coût réel d'une analyse
+    explication = generer_documentation.__wrapped__
+    return lambda: explication(motif)
+
+
+def cas_tableau(nombre):
+    pattern = re.compile(r"^(\d{2})-(\d{2})-(\d{4})$")
+    resultats = [resultat for resultat, _ in moteur.evaluer_lignes_prefiltrees(pattern, lignes_dates(nombre))]
+
+    def construire():
+        df = pd.DataFrame(resultats)
+        page = df.iloc[:TAILLE_PAGE]
+        page.style.map(style_correspondance, subset=["Correspond"]).to_html()
+    return construire
+
+
+def cas_extraction_mistral(nombre):
+    client = ClientMistral("cle-factice")
+    reponses = [ReponseSimulee(REPONSES_MISTRAL[i % len(REPONSES_MISTRAL)]) for i in range(nombre)]
+
+    def generer():
+        with mock.patch.object(client.session, "post", side_effect=reponses):
+            for _ in range(nombre):
+                extraire_expression(client.completer("Génère une expression régulière", "modele"))
+    return generer
+
+
+CAS = {
+    "testeur 1 000 lignes": lambda: cas_testeur(1_000),
+    "testeur 100 000 lignes": lambda: cas_testeur(100_000),
+    "testeur 1 000 000 lignes": lambda: cas_testeur(1_000_000),
+    "documentation date": lambda: cas_documentation(r"^(?P<jour>\d{2})-(?P<mois>\d{2})-(?P<annee>\d{4})$"),
+    "documentation 10 000 codes": lambda: cas_documentation(alternative_de_codes(10_000)),
+    "documentation 5 000 groupes": lambda: cas_documentation(sequence_de_groupes(5_000)),
+    "tableau 100 000 résultats": lambda: cas_tableau(100_000),
+    "extraction 1 000 réponses Mistral": lambda: cas_extraction_mistral(1_000),
+}
+
+
+def mesurer(fonction, repetitions):
+    """Meilleur temps d'un appel sur plusieurs séries, en millisecondes."""
+    timer = timeit.Timer(fonction)
+    nombre, _ = timer.autorange()
+    return min(timer.repeat(repeat=repetitions, number=nombre)) / nombre * 1000
+
+
+def machine():
+    return f"{platform.python_implementation()} {platform.python_version()}, {platform.machine()}, {os.cpu_count()} CPU"
+
+
+def analyser_arguments():
+    parser = argparse.ArgumentParser(description="Mesure les chemins critiques et les compare à la référence.")
+    parser.add_argument("cas", nargs="*", help="ne mesurer que les cas dont le nom contient l'un de ces textes")
+    parser.add_argument("--enregistrer", action="store_true", help="enregistrer les mesures comme nouvelle référence")
+    parser.add_argument("--seuil", type=float, default=SEUIL, help=f"ralentissement toléré ({SEUIL} par défaut)")
+    parser.add_argument("--repetitions", type=int, default=5, help="nombre de séries par cas (5 par défaut)")
+    parser.add_argument("--reference", default=REFERENCE, help="fichier de référence")
+    return parser.parse_args()
+
+
+def main():
+    args = analyser_arguments()
+    reference = {}
+    if os.path.exists(args.reference):
+        with open(args.reference, encoding="utf-8") as f:
+            reference = json.load(f)
+        if not args.enregistrer and reference.get("machine") != machine():
+            print(f"Attention : référence enregistrée sur une autre machine ({reference.get('machine')}).")
+
+    mesures = {}
+    regressions = []
+    print(f"{'Cas':<36} {'Référence (ms)':>15} {'Mesure (ms)':>12} {'Écart':>8}")
+    for nom, preparer in CAS.items():
+        if args.cas and not any(texte in nom for texte in args.cas):
+            continue
+        mesures[nom] = mesurer(preparer(), args.repetitions)
+        attendu = reference.get("cas", {}).get(nom)
+        if attendu is None:
+            print(f"{nom:<36} {'-':>15} {mesures[nom]:>12.2f}")
+            continue
+        ecart = mesures[nom] / attendu - 1
+        print(f"{nom:<36} {attendu:>15.2f} {mesures[nom]:>12.2f} {ecart:>+8.0%}")
+        if ecart > args.seuil:
+            regressions.append(nom)
+
+    if args.enregistrer:
+        # Les cas non mesurés cette fois gardent leur référence
+        cas = {**reference.get("cas", {}), **mesures}
+        with open(args.reference, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "cas": cas}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Référence enregistrée dans {args.reference}.")
+        return 0
+
+    if regressions:
+        print(f"Régression au-delà de {args.seuil:.0%} : " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
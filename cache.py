@@ -0,0 +1,176 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Durée de vie par défaut d'une réponse en cache (7 jours)
+TTL_DEFAUT = 7 * 24 * 3600
+
+
+class CacheLRU:
+    """Cache en mémoire borné (le moins récemment utilisé est évincé), partagé entre threads."""
+
+    def __init__(self, taille_max=256, ttl=None):
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cle, defaut=None):
+        with self._verrou:
+            if cle in self._entrees:
+                valeur, cree_le = self._entrees[cle]
+                if self.ttl is None or time.time() - cree_le <= self.ttl:
+                    self._entrees.move_to_end(cle)
+                    self.hits += 1
+                    return valeur
+                del self._entrees[cle]
+                self.evictions += 1
+            self.misses += 1
+            return defaut
+
+    def set(self, cle, valeur, cree_le=None):
+        """Enregistre la valeur ; cree_le (par défaut maintenant) est le point de départ de sa durée de vie."""
+        with self._verrou:
+            self._entrees[cle] = (valeur, time.time() if cree_le is None else cree_le)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def statistiques(self):
+        """Renvoie les compteurs du cache (hits, misses, évictions, taille)."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "taille": len(self)}
+
+
+class CacheDisque:
+    """Cache persistant SQLite avec durée de vie (TTL) et nombre maximal d'entrées."""
+
+    def __init__(self, chemin, ttl=TTL_DEFAUT, taille_max=5000):
+        self.chemin = chemin
+        self.ttl = ttl
+        self.taille_max = taille_max
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Nombre d'entrées, compté à la demande puis conservé jusqu'à la prochaine écriture de ce processus
+        self._taille = None
+        with self._connexion() as connexion:
+            connexion.execute("PRAGMA journal_mode=WAL")
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS reponses ("
+                "cle TEXT PRIMARY KEY, valeur TEXT NOT NULL, cree_le REAL NOT NULL, dernier_acces REAL NOT NULL)"
+            )
+            connexion.execute("CREATE INDEX IF NOT EXISTS reponses_dernier_acces ON reponses (dernier_acces)")
+
+    @contextmanager
+    def _connexion(self):
+        # Import tardif : le cache mémoire seul (moteur, ligne de commande) n'a pas besoin de sqlite3
+        import sqlite3
+        # Une connexion par opération : les sessions Streamlit tournent dans des threads différents
+        connexion = sqlite3.connect(self.chemin, timeout=10)
+        try:
+            with connexion:
+                yield connexion
+        finally:
+            connexion.close()
+
+    def get(self, cle, defaut=None):
+        entree = self.entree(cle)
+        return defaut if entree is None else entree[0]
+
+    def entree(self, cle):
+        """Renvoie (valeur, date de création) si la clé est présente et non expirée, sinon None."""
+        maintenant = time.time()
+        with self._connexion() as connexion:
+            ligne = connexion.execute(
+                "SELECT valeur, cree_le FROM reponses WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is None or maintenant - ligne[1] > self.ttl:
+                if ligne is not None:
+                    connexion.execute("DELETE FROM reponses WHERE cle = ?", (cle,))
+                    self.evictions += 1
+                    self._taille = None
+                self.misses += 1
+                return None
+            connexion.execute("UPDATE reponses SET dernier_acces = ? WHERE cle = ?", (maintenant, cle))
+        self.hits += 1
+        return ligne[0], ligne[1]
+
+    def set(self, cle, valeur):
+        maintenant = time.time()
+        with self._connexion() as connexion:
+            connexion.execute(
+                "INSERT OR REPLACE INTO reponses (cle, valeur, cree_le, dernier_acces) VALUES (?, ?, ?, ?)",
+                (cle, valeur, maintenant, maintenant)
+            )
+            # Suppression des entrées expirées puis des moins récemment utilisées au-delà de la taille maximale
+            expirees = connexion.execute("DELETE FROM reponses WHERE cree_le < ?", (maintenant - self.ttl,)).rowcount
+            en_trop = connexion.execute(
+                "DELETE FROM reponses WHERE cle IN ("
+                "SELECT cle FROM reponses ORDER BY dernier_acces DESC LIMIT -1 OFFSET ?)",
+                (self.taille_max,)
+            ).rowcount
+        self.evictions += expirees + en_trop
+        self._taille = None
+
+    def __len__(self):
+        # statistiques() est appelé à chaque réexécution de l'application : pas de COUNT(*) à chaque fois
+        if self._taille is None:
+            with self._connexion() as connexion:
+                self._taille = connexion.execute("SELECT COUNT(*) FROM reponses").fetchone()[0]
+        return self._taille
+
+    def statistiques(self):
+        """Renvoie les compteurs du cache (hits, misses, évictions, taille)."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "taille": len(self)}
+
+
+def normaliser_prompt(prompt):
+    """Normalise les espaces d'un prompt pour que des demandes équivalentes partagent la même entrée.
+
+    La casse est conservée : elle peut changer la réponse (ex. « dates en MAJUSCULES »).
+    """
+    return " ".join(prompt.split())
+
+
+class CacheReponses:
+    """Cache à deux niveaux (mémoire puis disque) des réponses de l'API Mistral."""
+
+    def __init__(self, chemin, ttl=TTL_DEFAUT, taille_memoire=256, taille_disque=5000):
+        self.memoire = CacheLRU(taille_memoire, ttl)
+        self.disque = CacheDisque(chemin, ttl, taille_disque)
+
+    @staticmethod
+    def cle(modele, prompt, pattern=""):
+        """Construit la clé de cache à partir du modèle, du prompt normalisé et de l'expression régulière."""
+        contenu = json.dumps([modele, normaliser_prompt(prompt), pattern], ensure_ascii=False)
+        return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+    def obtenir(self, modele, prompt, pattern=""):
+        """Renvoie la réponse en cache, ou None si elle est absente ou expirée."""
+        cle = self.cle(modele, prompt, pattern)
+        reponse = self.memoire.get(cle)
+        if reponse is None:
+            entree = self.disque.entree(cle)
+            if entree is not None:
+                reponse, cree_le = entree
+                # Promue avec sa date de création sur disque : elle n'expire pas plus tard en mémoire
+                self.memoire.set(cle, reponse, cree_le)
+        return reponse
+
+    def enregistrer(self, modele, prompt, reponse, pattern=""):
+        cle = self.cle(modele, prompt, pattern)
+        self.memoire.set(cle, reponse)
+        self.disque.set(cle, reponse)
+
+    def statistiques(self):
+        return {"memoire": self.memoire.statistiques(), "disque": self.disque.statistiques()}
@@ -0,0 +1,179 @@
+"""Test d'une expression régulière en ligne de commande, sans Streamlit.
+
+Exemples :
+    python cli.py '^\\d{2}-\\d{2}-\\d{4}$' dates.txt
+    zcat journal.gz | python cli.py -i 'timeout after (\\d+)ms' --correspondances --format csv
+    python cli.py '^[0-9]{9}[A-Z]{2}$' inscrits.csv.gz --colonne ine --resume
+    python cli.py --expliquer '^(0[1-9]|1[0-2])/20[0-9]{2}$'
+    python cli.py -m --texte-entier '^ERREUR.*(?:\\n\\s+.*)*' journal.log --max-occurrences 100 --resume
+
+Les lignes sont lues et écrites au fil de l'eau (mémoire constante). Code de sortie : 0 si au moins une
+ligne correspond, 1 sinon, 2 en cas d'erreur (comme grep).
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+import moteur
+
+FORMATS = ("jsonl", "csv")
+
+# Nombre de valeurs sans correspondance les plus fréquentes écrites par --resume avec --dedoublonner
+NOMBRE_VALEURS_RESUME = 10
+
+
+def analyser_arguments(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Teste une expression régulière sur des lignes (fichiers ou entrée standard).",
+        epilog="Les fichiers .gz sont décompressés ; pour un CSV, une seule colonne est testée (voir --colonne)."
+    )
+    parser.add_argument("pattern", help="expression régulière (syntaxe du module re)")
+    parser.add_argument("fichiers", nargs="*", default=["-"], help="fichiers à tester ('-' pour l'entrée standard, par défaut)")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="ignorer la casse (re.IGNORECASE)")
+    parser.add_argument("-m", "--multiline", action="store_true", help="mode multiligne (re.MULTILINE)")
+    parser.add_argument("-s", "--dotall", action="store_true", help="le point correspond aussi aux sauts de ligne (re.DOTALL)")
+    parser.add_argument("-x", "--verbose", action="store_true", help="mode verbeux (re.VERBOSE)")
+    parser.add_argument("-a", "--ascii", action="store_true", help="classes \\d, \\w, \\s et \\b limitées à l'ASCII (re.ASCII)")
+    parser.add_argument("--moteur", choices=moteur.MOTEURS, default=moteur.MOTEUR_PAR_DEFAUT,
+                        help="moteur d'expressions régulières (re par défaut ; regex et re2 s'ils sont installés, "
+                             "avec repli automatique)")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", help="format des résultats (jsonl par défaut)")
+    parser.add_argument("--colonne", default=None, help="colonne testée dans les fichiers CSV (nom ou index, la première par défaut)")
+    parser.add_argument("--correspondances", action="store_true", help="n'écrire que les lignes qui correspondent")
+    parser.add_argument("--processus", type=int, default=1, help="nombre de processus (1 par défaut)")
+    parser.add_argument("--dedoublonner", action="store_true",
+                        help="n'évaluer qu'une fois chaque valeur distincte (en série, --processus est ignoré)")
+    parser.add_argument("--texte-entier", action="store_true",
+                        help="toutes les correspondances (finditer) sur le contenu entier de chaque fichier, projeté en "
+                             "mémoire, au lieu de ligne à ligne ; positions en octets")
+    parser.add_argument("--max-occurrences", type=int, default=moteur.TAILLE_MAX_OCCURRENCES,
+                        help=f"avec --texte-entier, nombre de correspondances écrites par fichier, les suivantes étant "
+                             f"seulement comptées ({moteur.TAILLE_MAX_OCCURRENCES} par défaut)")
+    parser.add_argument("--resume", action="store_true", help="écrire les compteurs sur la sortie d'erreur à la fin")
+    parser.add_argument("--expliquer", action="store_true", help="afficher l'explication de l'expression au lieu de la tester")
+    return parser.parse_args(arguments)
+
+
+def ouvrir_entree(nom):
+    """Flux binaire d'une entrée : l'entrée standard pour '-' (sans la fermer ensuite), sinon le fichier."""
+    if nom == "-":
+        return open(sys.stdin.fileno(), "rb", closefd=False)
+    return open(nom, "rb")
+
+
+def lignes_entree(nom, fichier, colonne=None):
+    """Lignes à tester d'une entrée (voir moteur.lire_fichier), l'entrée standard étant lue ligne à ligne."""
+    if nom == "-":
+        return moteur.lire_lignes(moteur.ouvrir_texte(fichier))
+    return moteur.lire_fichier(fichier, colonne)
+
+
+class Sortie:
+    """Écrit les lignes de résultat en JSONL ou en CSV (entête écrit avec la première ligne)."""
+
+    def __init__(self, flux, format_sortie, avec_fichier):
+        self.flux = flux
+        self.format_sortie = format_sortie
+        self.avec_fichier = avec_fichier
+        self._csv = None
+
+    def ecrire(self, nom_fichier, resultat):
+        if self.avec_fichier:
+            resultat = {"Fichier": nom_fichier, **resultat}
+        if self.format_sortie == "jsonl":
+            self.flux.write(json.dumps(resultat, ensure_ascii=False) + "\n")
+            return
+        if self._csv is None:
+            self._csv = csv.DictWriter(self.flux, fieldnames=list(resultat), lineterminator="\n")
+            self._csv.writeheader()
+        self._csv.writerow(resultat)
+
+
+def rechercher_texte_entier(args, pattern, sortie):
+    """Mode --texte-entier : écrit les correspondances de chaque fichier, parcouru d'un seul bloc."""
+    total = 0
+    for nom in args.fichiers:
+        with ouvrir_entree(nom) as fichier:
+            occurrences = moteur.rechercher_occurrences(pattern, moteur.ouvrir_tampon(fichier), args.max_occurrences)
+        for occurrence in occurrences.occurrences:
+            sortie.ecrire(nom, occurrence)
+        total += occurrences.total
+        if args.resume:
+            print(f"{nom} : {occurrences.total} correspondance(s), {len(occurrences.occurrences)} écrite(s).",
+                  file=sys.stderr)
+    if args.resume:
+        print(f"Moteur {moteur.description_moteur(pattern)}.", file=sys.stderr)
+    return 0 if total else 1
+
+
+def main(arguments=None):
+    args = analyser_arguments(arguments)
+    flags = moteur.construire_flags(vars(args))
+
+    if args.expliquer:
+        # Import à la demande : l'analyse syntaxique n'est utile qu'ici
+        from explication import generer_documentation
+        print(generer_documentation(args.pattern))
+        return 0
+
+    try:
+        if args.texte_entier:
+            pattern = moteur.compiler_tampon(args.pattern, flags, args.moteur, octets=True)
+        else:
+            pattern = moteur.compiler(args.pattern, flags, args.moteur)
+    except re.error as e:
+        print(f"Expression invalide : {e}", file=sys.stderr)
+        return 2
+
+    sortie = Sortie(sys.stdout, args.format, avec_fichier=len(args.fichiers) > 1)
+    if args.texte_entier:
+        try:
+            return rechercher_texte_entier(args, pattern, sortie)
+        except OSError as e:
+            print(f"Erreur de lecture : {e}", file=sys.stderr)
+            return 2
+    resume = moteur.ResumeCorrespondances(taille_echantillon=0)
+    # Partagé par tous les fichiers : une valeur déjà vue dans un fichier précédent n'est pas réévaluée
+    dedoublonnage = moteur.Dedoublonnage(pattern) if args.dedoublonner else None
+    try:
+        for nom in args.fichiers:
+            with ouvrir_entree(nom) as fichier:
+                lignes = lignes_entree(nom, fichier, args.colonne)
+                if dedoublonnage is not None:
+                    resultats = dedoublonnage.evaluer(lignes)
+                else:
+                    resultats = moteur.evaluer(pattern, lignes, args.processus)
+                for resultat, ecartee in resultats:
+                    resume.ajouter(resultat, ecartee=ecartee)
+                    if resultat["Correspond"] == "✓" or not args.correspondances:
+                        sortie.ecrire(nom, resultat)
+    except BrokenPipeError:
+        raise
+    except (OSError, ValueError) as e:
+        # ValueError : colonne CSV introuvable, ou fichier qui n'est pas du texte UTF-8
+        print(f"Erreur de lecture : {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.resume:
+            print(f"{resume.correspondances} correspondance(s) sur {resume.total} ligne(s), "
+                  f"moteur {moteur.description_moteur(pattern)}.", file=sys.stderr)
+            if dedoublonnage is not None:
+                print(f"{dedoublonnage.valeurs_distinctes} valeur(s) distincte(s), dont "
+                      f"{dedoublonnage.valeurs_distinctes_invalides} sans correspondance ; "
+                      f"{dedoublonnage.evaluations} évaluation(s) de l'expression.", file=sys.stderr)
+                for valeur in dedoublonnage.valeurs_invalides_frequentes(NOMBRE_VALEURS_RESUME):
+                    print(f"{valeur['Occurrences']:>10}  {valeur['Texte']}", file=sys.stderr)
+
+    return 0 if resume.correspondances else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        # Sortie fermée par le lecteur (head...) : arrêt silencieux, sans erreur au vidage final de stdout
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
@@ -0,0 +1,162 @@
+import asyncio
+import itertools
+import json
+import re
+import threading
+from contextlib import contextmanager
+
+# Adresse de l'API Mistral (Le Chat)
+URL_API_MISTRAL = "https://api.mistral.ai/v1"
+
+# Codes HTTP pour lesquels la requête est relancée (limite de débit et erreurs serveur)
+CODES_A_RELANCER = (429, 500, 502, 503, 504)
+
+# Expressions auxiliaires de extraire_expression, compilées une seule fois au chargement
+ENTRE_BACKTICKS = re.compile(r'`(.*?)`')
+METACARACTERE = re.compile(r'[\^\$\[\]\(\)\{\}\.\*\+\?\\]')
+
+# Prompt de génération d'une expression régulière (le même pour une demande seule et pour un lot)
+PROMPT_GENERATION = ("Génère une expression régulière pour: {demande}. "
+                     "Réponds UNIQUEMENT avec l'expression régulière, sans autre texte.")
+
+
+class ErreurAPIMistral(Exception):
+    """Réponse en erreur de l'API Mistral (code HTTP et texte de la réponse)."""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"Erreur API: {status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def lire_evenements_sse(lignes):
+    """Décode un flux server-sent events de l'API (lignes en octets) et renvoie les morceaux de texte.
+
+    Les lignes « data: » d'un même événement sont réunies par des sauts de ligne ; l'événement est décodé à la
+    ligne vide qui le termine (ou à la fin du flux).
+    """
+    donnees = []
+    for ligne in itertools.chain(lignes, [b""]):
+        if isinstance(ligne, bytes):
+            ligne = ligne.decode("utf-8")
+        if ligne:
+            # Les lignes commençant par ':' sont des commentaires (maintien de la connexion) ; seul data est lu
+            champ, _, valeur = ligne.partition(":")
+            if champ == "data":
+                donnees.append(valeur[1:] if valeur.startswith(" ") else valeur)
+            continue
+        if not donnees:
+            continue
+        texte, donnees = "\n".join(donnees), []
+        if texte.strip() == "[DONE]":
+            break
+        evenement = json.loads(texte)
+        for choix in evenement.get("choices", []):
+            morceau = choix.get("delta", {}).get("content")
+            if morceau:
+                yield morceau
+
+
+def extraire_expression(reponse):
+    """Extrait l'expression régulière d'une réponse du modèle : le texte entre backticks s'il y en a,
+    sinon le premier mot contenant un métacaractère, sinon la réponse entière."""
+    pattern_match = ENTRE_BACKTICKS.search(reponse)
+    if pattern_match:
+        return pattern_match.group(1)
+    if METACARACTERE.search(reponse):
+        for word in reponse.split():
+            if METACARACTERE.search(word):
+                return word
+    return reponse
+
+
+class ClientMistral:
+    """Client HTTP de l'API Mistral : connexions réutilisées, délais maximaux, relances et appels simultanés limités."""
+
+    def __init__(self, cle_api, url_base=URL_API_MISTRAL, timeout=(5, 60), tentatives=3,
+                 facteur_attente=0.5, max_en_cours=4):
+        self.cle_api = cle_api
+        self.url_base = url_base.rstrip("/")
+        # (délai de connexion, délai de lecture) en secondes
+        self.timeout = timeout
+        # Limite globale d'appels en cours, partagée par toutes les sessions qui utilisent ce client
+        self.semaphore = threading.BoundedSemaphore(max_en_cours)
+
+        # Imports tardifs : requests n'est chargé qu'au premier appel à l'API, pas au démarrage de l'application
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        relances = Retry(
+            total=tentatives,
+            # Pas de relance après un délai de lecture dépassé : la requête a pu être traitée
+            read=0,
+            backoff_factor=facteur_attente,
+            status_forcelist=CODES_A_RELANCER,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adaptateur = HTTPAdapter(pool_connections=1, pool_maxsize=max_en_cours, max_retries=relances)
+        self.session = requests.Session()
+        self.session.mount("http://", adaptateur)
+        self.session.mount("https://", adaptateur)
+        self.session.headers.update({
+            "Authorization": f"Bearer {cle_api}",
+            "Content-Type": "application/json"
+        })
+
+    @contextmanager
+    def _emplacement(self):
+        """Réserve un des emplacements d'appel simultané, pendant toute la durée de l'échange."""
+        if not self.semaphore.acquire(timeout=self.timeout[1]):
+            raise ErreurAPIMistral(None, "Trop d'appels simultanés à l'API, réessayez dans quelques instants.")
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+    def _poster(self, chemin, payload, **kwargs):
+        """Envoie une requête POST (l'appelant doit détenir un emplacement)."""
+        return self.session.post(f"{self.url_base}{chemin}", json=payload, timeout=self.timeout, **kwargs)
+
+    def completer(self, prompt, modele):
+        """Envoie un prompt au modèle et renvoie le texte de la réponse."""
+        payload = {
+            "model": modele,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+        with self._emplacement():
+            response = self._poster("/chat/completions", payload)
+        if response.status_code != 200:
+            raise ErreurAPIMistral(response.status_code, response.text)
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
+
+    def completer_en_flux(self, prompt, modele):
+        """Envoie un prompt en mode streaming et renvoie les morceaux de texte au fur et à mesure (générateur)."""
+        payload = {
+            "model": modele,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "stream": True
+        }
+        with self._emplacement():
+            with self._poster("/chat/completions", payload, stream=True) as response:
+                if response.status_code != 200:
+                    raise ErreurAPIMistral(response.status_code, response.text)
+                yield from lire_evenements_sse(response.iter_lines(chunk_size=None))
+
+    async def completer_async(self, prompt, modele):
+        """Variante asyncio de completer (exécutée dans un thread, avec le même pool de connexions)."""
+        return await asyncio.to_thread(self.completer, prompt, modele)
+
+    async def completer_plusieurs(self, prompts, modele):
+        """Envoie plusieurs prompts simultanément ; renvoie les réponses (ou les exceptions) dans l'ordre."""
+        return await asyncio.gather(
+            *(self.completer_async(prompt, modele) for prompt in prompts),
+            return_exceptions=True
+        )
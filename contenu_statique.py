@@ -0,0 +1,182 @@
+"""Contenu statique de l'interface (style, exemples, guide, pied de page).
+
+Importé une seule fois par processus : ces textes ne sont plus reconstruits à chaque réexécution de main.py.
+"""
+
+# CSS pour le style
+CSS = """
+<style>
+/* Style général */
+.main {
+    background-color: #ffffff;
+    color: #1e1e1e;
+    font-family: Marianne, arial, sans-serif;
+}
+h1, h2, h3 {
+    color: #000091;
+}
+.stButton button {
+    background-color: #000091;
+    color: white;
+    border-radius: 4px;
+    border: none;
+    padding: 8px 16px;
+}
+.stButton button:hover {
+    background-color: #1212ff;
+}
+
+/* Style pour le pied de page */
+.footer {
+    position: fixed;
+    left: 0;
+    bottom: 0;
+    width: 100%;
+    background-color: #f5f5f5;
+    color: #666666;
+    text-align: center;
+    padding: 10px 0;
+    font-size: 14px;
+    border-top: 1px solid #e0e0e0;
+    z-index: 999;
+}
+
+.footer img {
+    height: 22px;
+    vertical-align: middle;
+    margin: 0 4px;
+}
+
+.cc-icon {
+    height: 20px;
+    vertical-align: middle;
+    margin: 0 4px;
+}
+
+/* Texte testé en entier, avec les correspondances surlignées */
+.texte-surligne {
+    white-space: pre-wrap;
+    font-family: monospace;
+    max-height: 400px;
+    overflow-y: auto;
+    padding: 8px;
+    border: 1px solid #e0e0e0;
+    border-radius: 4px;
+}
+.texte-surligne mark {
+    background-color: #fee7a0;
+    padding: 0;
+}
+</style>
+"""
+
+# Expressions régulières courantes : exemples proposés et jeu de règles par défaut
+EXEMPLES = {
+    "Nom en majuscules": {
+        "regex": r"^[A-Z][A-Z\s\-']*$",
+        "description": "Valide un nom écrit entièrement en majuscules, avec espaces, tirets ou apostrophes.",
+        "exemples_valides": ["DUPONT", "MARTIN-DURAND", "O'CONNOR", "DE LA FONTAINE"],
+        "exemples_invalides": ["Dupont", "MARTIN2", "dupont", "123NOM"]
+    },
+    "Code INE": {
+        "regex": r"^[0-9]{9}[A-Z]{2}$",
+        "description": "Valide un code INE (Identifiant National Étudiant) composé de 9 chiffres suivis de 2 lettres majuscules.",
+        "exemples_valides": ["123456789AB", "987654321XY"],
+        "exemples_invalides": ["12345678AB", "123456789abc", "ABC123456", "123456789A"]
+    },
+    "Format date mois/année": {
+        "regex": r"^(0[1-9]|1[0-2])\/20[0-9]{2}$",
+        "description": "Valide une date au format MM/AAAA pour le 21ème siècle (2000-2099).",
+        "exemples_valides": ["01/2023", "12/2099", "05/2010"],
+        "exemples_invalides": ["1/2023", "13/2023", "05/123", "05-2023", "05/1999"]
+    },
+    "Adresse email": {
+        "regex": r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$",
+        "description": "Valide une adresse email simple : partie locale, @, puis un nom de domaine avec au moins une extension.",
+        "exemples_valides": ["jean.dupont@exemple.fr", "contact+info@mon-site.education.gouv.fr"],
+        "exemples_invalides": ["jean.dupont", "@exemple.fr", "jean@exemple", "jean@@exemple.fr"]
+    },
+}
+
+# Guide des expressions régulières, par section
+GUIDE = (
+    r"""
+    ## Aide-mémoire sur les expressions régulières
+    
+    ### Métacaractères de base
+    - `.` : N'importe quel caractère sauf nouvelle ligne
+      * Exemple: `a.c` correspond à "abc", "adc", "a1c", etc.
+    - `^` : Début de chaîne
+      * Exemple: `^bonjour` correspond à "bonjour monde" mais pas à "mon bonjour"
+    - `$` : Fin de chaîne
+      * Exemple: `monde$` correspond à "bonjour monde" mais pas à "monde entier"
+    - `*` : 0 ou plusieurs occurrences
+      * Exemple: `ab*c` correspond à "ac", "abc", "abbc", "abbbc", etc.
+    - `+` : 1 ou plusieurs occurrences
+      * Exemple: `ab+c` correspond à "abc", "abbc", "abbbc", mais pas à "ac"
+    - `?` : 0 ou 1 occurrence
+      * Exemple: `colou?r` correspond à "color" et "colour"
+    - `{n}` : Exactement n occurrences
+      * Exemple: `a{3}` correspond à "aaa" mais pas à "aa" ou "aaaa"
+    - `{n,}` : Au moins n occurrences
+      * Exemple: `a{2,}` correspond à "aa", "aaa", "aaaa", etc. mais pas à "a"
+    - `{n,m}` : Entre n et m occurrences
+      * Exemple: `a{2,4}` correspond à "aa", "aaa", "aaaa" mais pas à "a" ou "aaaaa"
+    """,
+    r"""
+    ### Classes de caractères
+    - `[abc]` : Un des caractères a, b ou c
+      * Exemple: `[aeiou]` correspond à n'importe quelle voyelle
+    - `[^abc]` : Tout caractère sauf a, b et c
+      * Exemple: `[^0-9]` correspond à tout caractère qui n'est pas un chiffre
+    - `[a-z]` : Tout caractère entre a et z
+      * Exemple: `[a-z]` correspond à toute lettre minuscule de l'alphabet latin
+    - `\d` : Chiffre (`[0-9]`)
+      * Exemple: `\d{3}` correspond à trois chiffres comme "123", "456"
+    - `\D` : Non-chiffre (`[^0-9]`)
+      * Exemple: `\D+` correspond à une suite de caractères sans chiffres
+    - `\w` : Caractère de mot (`[a-zA-Z0-9_]`)
+      * Exemple: `\w+` correspond à un mot comme "exemple_123"
+    - `\W` : Non-caractère de mot
+      * Exemple: `\W` correspond à des caractères comme "!", "@", "#"
+    - `\s` : Espace blanc
+      * Exemple: `mot\ssuivant` correspond à "mot suivant"
+    - `\S` : Non-espace blanc
+      * Exemple: `\S+` correspond à une suite de caractères sans espaces
+    """,
+    r"""
+    ### Groupes
+    - `(...)` : Capture un groupe
+      * Exemple: `(\d{2})-(\d{2})-(\d{4})` capture jour, mois et année
+    - `(?:...)` : Groupe non capturant
+      * Exemple: `(?:https?://)?example\.com` groupe optionnel sans capture
+    - `(?P<name>...)` : Groupe nommé
+      * Exemple: `(?P<jour>\d{2})-(?P<mois>\d{2})-(?P<annee>\d{4})`
+    """,
+    r"""
+    ### Alternatives
+    - `a|b` : a ou b
+      * Exemple: `chat|chien` correspond à "chat" ou "chien"
+    """,
+)
+
+# Détails des options avancées
+DETAILS_OPTIONS = r"""
+    #### Détails des options
+    
+    - **Ignorer la casse** : Rend le regex insensible à la casse. Ex: `/abc/i` correspond à "ABC", "abc", "Abc", etc.
+    - **Mode multiligne** : Fait que `^` et `$` correspondent au début/fin de chaque ligne, pas seulement au début/fin du texte.
+    - **Point correspond à tout** : Fait que le caractère `.` correspond également aux sauts de ligne `\n`.
+    - **Mode verbose** : Permet d'écrire des regex plus lisibles avec des espaces et commentaires ignorés.
+    - **Exécution protégée** : Évite qu'une expression comme `(a+)+$` bloque l'application : les lignes trop longues à évaluer sont signalées « timeout ».
+    """
+
+# Pied de page avec copyright Creative Commons - style similaire au simulateur
+PIED_DE_PAGE = """
+<div class="footer">
+    © 2025 Creative Commons Attribution (CC BY) 
+    <img src="https://mirrors.creativecommons.org/presskit/icons/cc.svg" class="cc-icon" alt="CC">
+    <img src="https://mirrors.creativecommons.org/presskit/icons/by.svg" class="cc-icon" alt="BY">
+    DRAAF Occitanie - Tous droits réservés
+</div>
+"""
@@ -0,0 +1,398 @@
+import functools
+import re
+
+from analyse_redos import LINEAIRE, MAXREPEAT, analyser_arbre, sre_constants, sre_parse
+
+# Nombre maximal d'éléments cités (alternatives, quantificateurs...) pour garder une explication lisible
+MAX_CITES = 10
+
+DEBUTS = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+FINS = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+REPETITIONS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+# Début d'un groupe écrit dans le motif (les alternatives sont relevées dans le texte du motif, pas dans l'arbre :
+# l'analyseur de re met en facteur le préfixe commun des alternatives, « chat|chien » y devient « ch(?:at|ien) »)
+DEBUT_GROUPE = re.compile(r"\((?:\?(?:P<\w+>|<(?![=!])\w+>|[aiLmsux-]*:|<?[=!]|>))?")
+GROUPE_SANS_CONTENU = re.compile(r"\(\?(?:#[^)]*|P=\w+|[aiLmsux-]*)\)")
+
+# Alternative simple : un mot écrit sans métacaractère (les métacaractères échappés sont admis)
+ALTERNATIVE_SIMPLE = re.compile(r"(?:[^.^$*+?{}\[\]\\|()]|\\[^\w\s])+")
+GROUPE_ALTERNATIVE_SIMPLE = re.compile(r"\((?:\?:|\?P<(?P<nom>\w+)>)?(?P<corps>[^()]*)\)")
+
+# Descriptions des catégories rencontrées (dans l'ordre de la documentation)
+DESCRIPTIONS_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: "Elle contient des chiffres (\\d équivaut à [0-9]).",
+    sre_constants.CATEGORY_WORD: "Elle contient des caractères alphanumériques (lettres, chiffres, underscore).",
+    sre_constants.CATEGORY_SPACE: "Elle contient des espaces blancs (espaces, tabulations, retours à la ligne, etc.).",
+    sre_constants.CATEGORY_NOT_DIGIT: "Elle contient des caractères qui ne sont pas des chiffres (\\D).",
+    sre_constants.CATEGORY_NOT_WORD: "Elle contient des caractères qui ne sont pas alphanumériques (\\W).",
+    sre_constants.CATEGORY_NOT_SPACE: "Elle contient des caractères qui ne sont pas des espaces blancs (\\S).",
+}
+DESCRIPTIONS_PLAGES = {
+    (ord("A"), ord("Z")): ("Elle contient des lettres majuscules (A à Z).", "lettres majuscules (A-Z)"),
+    (ord("a"), ord("z")): ("Elle contient des lettres minuscules (a à z).", "lettres minuscules (a-z)"),
+    (ord("0"), ord("9")): ("Elle contient des chiffres (0 à 9).", "chiffres (0-9)"),
+}
+CATEGORIES_DANS_CLASSE = {
+    sre_constants.CATEGORY_SPACE: "espaces",
+    sre_constants.CATEGORY_DIGIT: "chiffres",
+    sre_constants.CATEGORY_WORD: "caractères de mot",
+}
+
+# Expressions reconnues précisément : (description, exemples valides, exemples invalides)
+MOTIFS_CONNUS = {
+    r"^[A-Z][A-Z\s\-\']*$": (
+        [
+            "Cette expression régulière valide un nom écrit entièrement en MAJUSCULES.",
+            "La chaîne doit commencer par une lettre majuscule ([A-Z]).",
+            "Elle peut ensuite contenir plusieurs (ou aucun) caractères parmi: lettres majuscules, espaces, tirets ou apostrophes ([A-Z\\s\\-\\']*).",
+            "Aucun autre caractère n'est autorisé (chiffres, minuscules, symboles, etc.).",
+        ],
+        ["DUPONT", "MARTIN-DURAND", "O'CONNOR", "DE LA FONTAINE"],
+        ["Dupont", "MARTIN2", "dupont", "123NOM"],
+    ),
+    r"^[0-9]{9}[A-Z]{2}$": (
+        [
+            "Cette expression régulière valide un code INE (Identifiant National Étudiant).",
+            "La chaîne doit contenir exactement 9 chiffres ([0-9]{9}) suivis de 2 lettres majuscules ([A-Z]{2}).",
+            "Aucun espace ou autre caractère n'est autorisé.",
+        ],
+        ["123456789AB", "987654321XY"],
+        ["12345678AB", "123456789abc", "ABC123456", "123456789A"],
+    ),
+    r"^\d{2}-\d{2}-\d{4}$": (
+        [
+            "Cette expression régulière valide une date au format JJ-MM-AAAA.",
+            "La chaîne doit contenir exactement 2 chiffres (jour), suivis d'un tiret, de 2 chiffres (mois), d'un tiret, puis de 4 chiffres (année).",
+            "Tous les chiffres doivent être sur 2 positions pour les jours et mois, et sur 4 positions pour l'année.",
+            "Le séparateur doit être un tiret (-) et non un autre caractère.",
+        ],
+        ["01-01-2023", "31-12-2022"],
+        ["1-1-2023", "01/01/2023"],
+    ),
+    r"^(0[1-9]|1[0-2])\/20[0-9]{2}$": (
+        [
+            "Cette expression régulière valide une date au format MM/AAAA pour le 21ème siècle (2000-2099).",
+            "Le mois doit être compris entre 01 et 12 (0[1-9] ou 1[0-2]).",
+            "Le séparateur doit être un slash (/).",
+            "L'année doit commencer par '20' suivi de deux chiffres (entre 2000 et 2099).",
+        ],
+        ["01/2023", "12/2099", "05/2010"],
+        ["1/2023", "13/2023", "05/123", "05-2023", "05/1999"],
+    ),
+}
+
+
+def _forme(noeud):
+    """Forme canonique (tuples imbriqués) d'un arbre : deux écritures équivalentes ont la même forme."""
+    if isinstance(noeud, sre_parse.SubPattern):
+        noeud = noeud.data
+    if isinstance(noeud, (list, tuple)):
+        return tuple(_forme(element) for element in noeud)
+    return noeud
+
+
+def _operations(arbre):
+    """Suite des opérations de premier niveau : filtre rapide avant de comparer les formes complètes."""
+    return tuple(op for op, _ in arbre)
+
+
+# Formes des expressions connues, pour reconnaître aussi leurs écritures équivalentes (ex. \' ou ')
+FORMES_CONNUES = {_forme(sre_parse.parse(motif)): motif for motif in MOTIFS_CONNUS}
+OPERATIONS_CONNUES = {_operations(sre_parse.parse(motif)) for motif in MOTIFS_CONNUS}
+
+
+class _Collecte:
+    """Faits relevés en un seul parcours de l'arbre, restitués ensuite dans l'ordre de la documentation."""
+
+    def __init__(self, noms_groupes):
+        self.noms_groupes = noms_groupes
+        self.plages = set()
+        self.categories = set()
+        self.quantificateurs = set()
+        self.repetitions = []
+        self.classes = []
+        self.groupes = 0
+        self.alternatives = []
+        self.litteraux_speciaux = set()
+        self.litteraux = set()
+        self.point = False
+        self.assertions = 0
+        self.references = 0
+
+    # --- Parcours ----------------------------------------------------------------------------
+
+    def parcourir(self, sequence):
+        """Relève les faits de chaque nœud ; chaque nœud n'est visité qu'une fois."""
+        for op, av in sequence:
+            if op == sre_constants.LITERAL:
+                self.relever_litteral(chr(av))
+            elif op == sre_constants.ANY:
+                self.point = True
+            elif op == sre_constants.IN:
+                self._classe(av)
+            elif op in REPETITIONS:
+                self._repetition(av[0], av[1])
+                self.parcourir(av[2])
+            elif op == sre_constants.SUBPATTERN:
+                if av[0] is not None:
+                    self.groupes += 1
+                self.parcourir(av[3])
+            elif op == sre_constants.BRANCH:
+                for alternative in av[1]:
+                    self.parcourir(alternative)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                self.assertions += 1
+                self.parcourir(av[1])
+            elif op == sre_constants.GROUPREF:
+                self.references += 1
+
+    def relever_litteral(self, caractere):
+        self.litteraux.add(caractere)
+        if not caractere.isalnum():
+            self.litteraux_speciaux.add(caractere)
+
+    def citer_alternatives(self, alternatives):
+        if len(self.alternatives) < MAX_CITES:
+            self.alternatives.append(
+                alternatives[:MAX_CITES] + ([f"… ({len(alternatives) - MAX_CITES} autres)"] if len(alternatives) > MAX_CITES else [])
+            )
+
+    def _classe(self, elements):
+        plages = []
+        speciaux = []
+        for op, av in elements:
+            if op == sre_constants.RANGE and av in DESCRIPTIONS_PLAGES:
+                self.plages.add(av)
+                plages.append(DESCRIPTIONS_PLAGES[av][1])
+            elif op == sre_constants.CATEGORY:
+                self.categories.add(av)
+                if av in CATEGORIES_DANS_CLASSE:
+                    speciaux.append(CATEGORIES_DANS_CLASSE[av])
+        # Une classe réduite à une catégorie (\d seul par exemple) est décrite avec les catégories
+        if len(elements) > 1 or plages:
+            description = []
+            if plages:
+                description.append(f"Elle contient une classe de caractères incluant: {', '.join(plages)}.")
+            description.extend(f"Elle accepte des {desc} dans une classe de caractères." for desc in speciaux)
+            for ligne in description:
+                if ligne not in self.classes:
+                    self.classes.append(ligne)
+
+    def _repetition(self, minimum, maximum):
+        if (minimum, maximum) == (0, MAXREPEAT):
+            self.quantificateurs.add("*")
+        elif (minimum, maximum) == (1, MAXREPEAT):
+            self.quantificateurs.add("+")
+        elif (minimum, maximum) == (0, 1):
+            self.quantificateurs.add("?")
+        elif len(self.repetitions) <= MAX_CITES:
+            if minimum == maximum:
+                self.repetitions.append(f"Elle impose exactement {minimum} occurrences d'un élément.")
+            elif maximum == MAXREPEAT:
+                self.repetitions.append(f"Elle impose au moins {minimum} occurrences d'un élément.")
+            else:
+                self.repetitions.append(f"Elle impose entre {minimum} et {maximum} occurrences d'un élément.")
+
+    # --- Restitution -------------------------------------------------------------------------
+
+    def lignes_generiques(self):
+        """Lignes de l'analyse générique, dans l'ordre historique de la documentation."""
+        doc = []
+        for plage in ((ord("A"), ord("Z")), (ord("a"), ord("z")), (ord("0"), ord("9"))):
+            if plage in self.plages:
+                doc.append(DESCRIPTIONS_PLAGES[plage][0])
+        for categorie, description in DESCRIPTIONS_CATEGORIES.items():
+            if categorie in self.categories:
+                doc.append(description)
+        if self.point:
+            doc.append("Elle contient un point (.) qui accepte n'importe quel caractère.")
+
+        if "*" in self.quantificateurs:
+            doc.append("Elle contient un élément qui peut se répéter zéro ou plusieurs fois (*).")
+        if "+" in self.quantificateurs:
+            doc.append("Elle contient un élément qui doit se répéter une ou plusieurs fois (+).")
+        if "?" in self.quantificateurs:
+            doc.append("Elle contient un élément optionnel (?).")
+
+        if self.litteraux_speciaux:
+            caracteres = ", ".join(f"'{c}'" for c in sorted(self.litteraux_speciaux)[:MAX_CITES])
+            doc.append(f"Elle contient les caractères littéraux suivants: {caracteres}.")
+
+        doc.extend(self.classes[:MAX_CITES])
+
+        if self.groupes:
+            doc.append(f"Elle contient {self.groupes} groupe(s) de capture pour extraire des parties spécifiques du texte.")
+        if self.noms_groupes:
+            noms = ", ".join(self.noms_groupes[g] for g in sorted(self.noms_groupes))
+            doc.append(f"Les groupes nommés sont: {noms}.")
+        for alternatives in self.alternatives:
+            doc.append(f"Elle contient une alternative entre plusieurs options: {', '.join(f'`{alt}`' for alt in alternatives)}.")
+        if self.assertions:
+            doc.append("Elle contient des assertions (?=...) ou (?!...) qui vérifient le contexte sans le consommer.")
+        if self.references:
+            doc.append("Elle contient des références arrière (\\1, ...) vers un groupe déjà capturé.")
+
+        doc.extend(self.repetitions)
+        return doc
+
+
+def _echappe(motif, position):
+    """Vrai si le caractère à cette position est précédé d'un nombre impair de barres obliques inverses."""
+    barres = len(motif[:position]) - len(motif[:position].rstrip("\\"))
+    return barres % 2 == 1
+
+
+def alternatives_ecrites(motif):
+    """Alternatives de chaque groupe (et du motif entier), telles qu'écrites, dans l'ordre des parenthèses ouvrantes."""
+    groupes = [[]]
+    # Pour chaque groupe ouvert : (indice dans groupes, début de l'alternative en cours)
+    ouverts = [(0, 0)]
+    position = 0
+    while position < len(motif):
+        caractere = motif[position]
+        if caractere == "\\":
+            position += 2
+            continue
+        if caractere == "[":
+            # Classe de caractères : « ] » en première position (ou après « ^ ») est un littéral
+            position += 2 if motif.startswith("[^", position) else 1
+            position += motif.startswith("]", position)
+            while position < len(motif) and motif[position] != "]":
+                position += 2 if motif[position] == "\\" else 1
+        elif caractere == "(":
+            sans_contenu = GROUPE_SANS_CONTENU.match(motif, position)
+            if sans_contenu:
+                position = sans_contenu.end()
+                continue
+            ouvrant = DEBUT_GROUPE.match(motif, position)
+            groupes.append([])
+            ouverts.append((len(groupes) - 1, ouvrant.end()))
+            position = ouvrant.end()
+            continue
+        elif caractere == "|" or (caractere == ")" and len(ouverts) > 1):
+            indice, debut = ouverts.pop()
+            groupes[indice].append(motif[debut:position])
+            if caractere == "|":
+                ouverts.append((indice, position + 1))
+        position += 1
+    while ouverts:
+        indice, debut = ouverts.pop()
+        groupes[indice].append(motif[debut:])
+    return [alternatives for alternatives in groupes if len(alternatives) > 1]
+
+
+def _alternative_simple(pattern):
+    """Décompose une liste de mots « ^(mot1|mot2|...)$ » : (début, fin, nom ou numéro du groupe, mots), sinon None."""
+    corps = pattern
+    debut = corps.startswith("^") or corps.startswith("\\A")
+    if debut:
+        corps = corps[1 if corps.startswith("^") else 2:]
+    fin = False
+    for ancre in ("$", "\\Z"):
+        if corps.endswith(ancre) and not _echappe(corps, len(corps) - len(ancre)):
+            corps, fin = corps[:-len(ancre)], True
+            break
+    groupe = None
+    correspondance = GROUPE_ALTERNATIVE_SIMPLE.fullmatch(corps)
+    if correspondance is None:
+        if debut or fin:
+            # « ^a|b$ » : les ancres ne portent que sur la première et la dernière alternative
+            return None
+    else:
+        if correspondance.group("nom") is not None and not correspondance.group("nom").isidentifier():
+            return None
+        corps = correspondance.group("corps")
+        if not correspondance.group(0).startswith("(?:"):
+            groupe = correspondance.group("nom") or 1
+    mots = corps.split("|")
+    if len(mots) < 2 or not all(ALTERNATIVE_SIMPLE.fullmatch(mot) for mot in mots):
+        return None
+    return debut, fin, groupe, mots
+
+
+def _collecte_alternative_simple(groupe, mots):
+    """Faits d'une liste de mots, relevés sans construire l'arbre (sans répétition, elle est toujours linéaire)."""
+    collecte = _Collecte({1: groupe} if isinstance(groupe, str) else {})
+    collecte.groupes = 1 if groupe is not None else 0
+    for caractere in set(re.sub(r"\\(.)", r"\1", "".join(mots))):
+        collecte.relever_litteral(caractere)
+    collecte.citer_alternatives(mots)
+    return collecte
+
+
+@functools.lru_cache(maxsize=256)
+def generer_documentation(pattern):
+    """Analyse une expression régulière et génère une documentation explicative détaillée."""
+    try:
+        exemples_valides = []
+        exemples_invalides = []
+
+        # Liste de mots (souvent longue) : expliquée sans construire l'arbre ni chercher de retour arrière
+        alternative_simple = _alternative_simple(pattern)
+        if alternative_simple is not None:
+            debut, fin, groupe, mots = alternative_simple
+            arbre = None
+        else:
+            arbre = sre_parse.parse(pattern)
+            # Ancrage, d'après le premier et le dernier élément de l'arbre
+            debut = len(arbre) and arbre[0][0] == sre_constants.AT and arbre[0][1] in DEBUTS
+            fin = len(arbre) and arbre[-1][0] == sre_constants.AT and arbre[-1][1] in FINS
+        if debut and fin:
+            doc = ["Cette expression régulière valide une chaîne complète (doit correspondre du début à la fin)."]
+        elif debut:
+            doc = ["Cette expression régulière valide le début d'une chaîne."]
+        elif fin:
+            doc = ["Cette expression régulière valide la fin d'une chaîne."]
+        else:
+            doc = ["Cette expression régulière recherche un motif n'importe où dans la chaîne."]
+
+        if arbre is None:
+            collecte = _collecte_alternative_simple(groupe, mots)
+            motif_connu = None
+        else:
+            etat = getattr(arbre, "state", None) or arbre.pattern
+            collecte = _Collecte({numero: nom for nom, numero in etat.groupdict.items()})
+            motif_connu = FORMES_CONNUES.get(_forme(arbre)) if _operations(arbre) in OPERATIONS_CONNUES else None
+
+        if motif_connu is not None:
+            # Reconnaissance de motifs spécifiques avec interprétation détaillée
+            doc, exemples_valides, exemples_invalides = MOTIFS_CONNUS[motif_connu]
+            doc = list(doc)
+        else:
+            if arbre is not None:
+                collecte.parcourir(arbre)
+                for alternatives in alternatives_ecrites(pattern):
+                    collecte.citer_alternatives(alternatives)
+            if "@" in collecte.litteraux and "." in collecte.litteraux:
+                doc.append("Elle semble valider un format d'adresse email.")
+                doc.append("Elle recherche un caractère '@' suivi d'un domaine contenant un point.")
+                exemples_valides = ["exemple@domaine.com", "prenom.nom@entreprise.fr"]
+                exemples_invalides = ["exemple@", "exemple@domaine", "@domaine.com"]
+            else:
+                doc.extend(collecte.lignes_generiques())
+
+        # Analyse de complexité : constructions qui provoquent un retour arrière catastrophique
+        rapport = analyser_arbre(arbre) if arbre is not None else None
+        if rapport is not None and rapport.complexite != LINEAIRE:
+            doc.append(f"Attention : temps de recherche au pire cas {rapport.description()}.")
+            doc.extend(rapport.problemes)
+
+        # Construire la documentation finale
+        documentation = "\n".join(doc)
+
+        if exemples_valides:
+            documentation += "\n\nExemples valides :\n"
+            documentation += "\n".join([f"- {ex}" for ex in exemples_valides])
+
+        if exemples_invalides:
+            documentation += "\n\nExemples invalides :\n"
+            documentation += "\n".join([f"- {ex}" for ex in exemples_invalides])
+
+        if not exemples_valides and not exemples_invalides:
+            documentation += "\n\nNote : Vous pouvez enrichir cette documentation en ajoutant vos propres exemples valides et invalides."
+
+        return documentation
+
+    except (re.error, RecursionError) as e:
+        return f"Impossible de générer la documentation automatiquement : {str(e)}\n\nVeuillez décrire manuellement ce que fait cette expression régulière."
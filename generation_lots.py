@@ -0,0 +1,155 @@
+"""Génération d'expressions régulières en lot : une liste de demandes envoyées simultanément à Mistral.
+
+Chaque réponse est réduite à l'expression (extraire_expression), puis l'expression est compilée et testée sur
+les exemples fournis avec la demande.
+"""
+import csv
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import moteur
+from analyse_redos import analyser
+from client_mistral import PROMPT_GENERATION, extraire_expression
+
+# Colonnes reconnues d'un fichier CSV de demandes (sinon, la première colonne est la demande)
+COLONNE_DEMANDE = "demande"
+COLONNE_VALIDES = "exemples_valides"
+COLONNE_INVALIDES = "exemples_invalides"
+
+# Séparateur des exemples dans une cellule du CSV
+SEPARATEUR_EXEMPLES = "|"
+
+# Nombre maximal de demandes envoyées en même temps par un lot
+CONCURRENCE_MAX = 16
+
+# Nombre maximal d'exemples cités dans le détail d'une validation
+EXEMPLES_CITES = 3
+
+
+class Demande:
+    """Une demande du lot et les exemples (valides et invalides) sur lesquels valider l'expression générée."""
+
+    def __init__(self, texte, valides=(), invalides=()):
+        self.texte = texte
+        self.valides = list(valides)
+        self.invalides = list(invalides)
+
+
+def _exemples(cellule):
+    return [valeur.strip() for valeur in (cellule or "").split(SEPARATEUR_EXEMPLES) if valeur.strip()]
+
+
+def lire_demandes(fichier):
+    """Lit les demandes d'un fichier déposé : une par ligne (TXT), ou un CSV avec les colonnes « demande »,
+    « exemples_valides » et « exemples_invalides » (exemples séparés par « | »)."""
+    flux_texte = moteur.ouvrir_texte(fichier)
+    if not fichier.name.lower().removesuffix(".gz").endswith(".csv"):
+        return [Demande(ligne.strip()) for ligne in moteur.lire_lignes(flux_texte) if ligne.strip()]
+
+    lecteur = csv.reader(flux_texte)
+    entete = [nom.strip().lower() for nom in next(lecteur, [])]
+    if not entete:
+        return []
+    index_demande = entete.index(COLONNE_DEMANDE) if COLONNE_DEMANDE in entete else 0
+    index_valides = entete.index(COLONNE_VALIDES) if COLONNE_VALIDES in entete else None
+    index_invalides = entete.index(COLONNE_INVALIDES) if COLONNE_INVALIDES in entete else None
+
+    def cellule(enregistrement, index):
+        return enregistrement[index] if index is not None and index < len(enregistrement) else ""
+
+    demandes = []
+    for enregistrement in lecteur:
+        texte = cellule(enregistrement, index_demande).strip()
+        if texte:
+            demandes.append(Demande(
+                texte,
+                _exemples(cellule(enregistrement, index_valides)),
+                _exemples(cellule(enregistrement, index_invalides))
+            ))
+    return demandes
+
+
+def _citer(valeurs):
+    cites = ", ".join(f"« {valeur} »" for valeur in valeurs[:EXEMPLES_CITES])
+    return cites + (" ..." if len(valeurs) > EXEMPLES_CITES else "")
+
+
+def valider_expression(motif, demande, flags=0):
+    """Compile l'expression et la teste sur les exemples de la demande : colonnes de validation du tableau."""
+    try:
+        pattern = moteur.compiler(motif, flags)
+    except re.error as e:
+        return {"Statut": "✗ invalide", "Détail": f"Expression invalide : {e}"}
+
+    rapport = analyser(motif, flags)
+    if rapport.dangereux:
+        # Les exemples ne sont pas testés : une seule valeur peut bloquer le script
+        return {"Statut": "⚠ exponentielle", "Détail": " ".join(rapport.problemes)}
+
+    non_reconnus = [valeur for valeur in demande.valides if not pattern.search(valeur)]
+    acceptes = [valeur for valeur in demande.invalides if pattern.search(valeur)]
+    details = []
+    if non_reconnus:
+        details.append("Non reconnus : " + _citer(non_reconnus))
+    if acceptes:
+        details.append("Acceptés à tort : " + _citer(acceptes))
+    if not demande.valides and not demande.invalides:
+        statut = "✓ compilée"
+    else:
+        statut = "✗ exemples" if details else "✓"
+    return {
+        "Statut": statut,
+        "Valides reconnus": f"{len(demande.valides) - len(non_reconnus)}/{len(demande.valides)}",
+        "Invalides rejetés": f"{len(demande.invalides) - len(acceptes)}/{len(demande.invalides)}",
+        "Détail": " ; ".join(details),
+    }
+
+
+def generer_reponse(demande, client, cache, modele):
+    """Réponse du modèle à une demande, depuis le cache si elle a déjà été obtenue : (réponse, depuis_cache)."""
+    prompt = PROMPT_GENERATION.format(demande=demande.texte)
+    reponse = cache.obtenir(modele, prompt)
+    if reponse is not None:
+        return reponse, True
+    reponse = client.completer(prompt, modele)
+    cache.enregistrer(modele, prompt, reponse)
+    return reponse, False
+
+
+def _generer_ligne(numero, demande, client, cache, modele, flags):
+    debut = time.perf_counter()
+    ligne = {"N°": numero, "Demande": demande.texte}
+    try:
+        reponse, depuis_cache = generer_reponse(demande, client, cache, modele)
+    except Exception as e:
+        return {**ligne, "Expression": None, "Statut": "✗ erreur API", "Détail": str(e),
+                "Source": "API", "Durée (ms)": round((time.perf_counter() - debut) * 1000)}
+    expression = extraire_expression(reponse)
+    return {
+        **ligne,
+        "Expression": expression,
+        **valider_expression(expression, demande, flags),
+        "Source": "cache" if depuis_cache else "API",
+        "Durée (ms)": round((time.perf_counter() - debut) * 1000),
+    }
+
+
+def generer_en_lot(demandes, client, cache, modele, concurrence=4, flags=0):
+    """Envoie les demandes {numéro: Demande} avec au plus `concurrence` appels en cours, et renvoie chaque ligne
+    du tableau dès que sa réponse arrive (générateur, dans l'ordre d'arrivée).
+
+    Si le générateur est fermé avant la fin (réexécution du script), les demandes pas encore commencées sont
+    annulées ; les réponses des appels déjà en cours sont tout de même enregistrées dans le cache.
+    """
+    executeur = ThreadPoolExecutor(max_workers=max(1, min(concurrence, CONCURRENCE_MAX)),
+                                   thread_name_prefix="generation_lot")
+    try:
+        futures = [
+            executeur.submit(_generer_ligne, numero, demande, client, cache, modele, flags)
+            for numero, demande in demandes.items()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executeur.shutdown(wait=False, cancel_futures=True)
@@ -1,15 +1,71 @@
 import streamlit as st
-import re
-import pandas as pd
-import requests
+import html
+import io
 import os
+import time
 
-# Accès au secret Streamlit
-LECHAT_API_KEY = os.getenv("LECHAT_API_KEY")
+# pandas, requests, explication, regles et tabulaire sont importés dans les fonctions et branches qui s'en servent :
+# le premier affichage n'attend pas leur chargement
+import moteur
+from analyse_redos import LINEAIRE, analyser
+from client_mistral import PROMPT_GENERATION, ErreurAPIMistral, extraire_expression
+from contenu_statique import CSS, DETAILS_OPTIONS, EXEMPLES, GUIDE, PIED_DE_PAGE
+from generation_lots import CONCURRENCE_MAX, generer_en_lot, lire_demandes
+from mesures import COMPTEURS, ETAPES, FLUX, MesuresExecution, publier
+from ressources import (
+    CHEMIN_METRIQUES, LECHAT_API_KEY, MODELE_MISTRAL, obtenir_cache_mistral, obtenir_client_mistral,
+    obtenir_metriques, obtenir_pool_bac_a_sable
+)
+
+def publier_mesures(mesures):
+    """Journalise les mesures de l'exécution et les conserve pour le panneau « Performance »."""
+    publier(mesures, obtenir_metriques(), CHEMIN_METRIQUES)
+    st.session_state.setdefault('mesures_performance', {})[mesures.flux] = mesures
+
+def appeler_mistral(prompt, pattern="", mesures=None):
+    """Renvoie la réponse de Mistral au prompt, depuis le cache si elle a déjà été obtenue."""
+    mesures = mesures or MesuresExecution("generation")
+    cache_mistral = obtenir_cache_mistral()
+    reponse = cache_mistral.obtenir(MODELE_MISTRAL, prompt, pattern)
+    if reponse is None:
+        with mesures.etape("api"):
+            reponse = obtenir_client_mistral().completer(prompt, MODELE_MISTRAL)
+        mesures.compter("appels_api")
+        mesures.compter("octets", len(reponse.encode("utf-8")))
+        cache_mistral.enregistrer(MODELE_MISTRAL, prompt, reponse, pattern)
+    else:
+        mesures.compter("cache_hits")
+    return reponse
+
+def appeler_mistral_en_flux(prompt, pattern="", mesures=None):
+    """Renvoie la réponse de Mistral morceau par morceau (générateur), d'un seul bloc si elle est en cache."""
+    mesures = mesures or MesuresExecution("explication")
+    cache_mistral = obtenir_cache_mistral()
+    reponse = cache_mistral.obtenir(MODELE_MISTRAL, prompt, pattern)
+    if reponse is not None:
+        mesures.compter("cache_hits")
+        yield reponse
+        return
+    debut = time.perf_counter()
+    morceaux = []
+    for morceau in obtenir_client_mistral().completer_en_flux(prompt, MODELE_MISTRAL):
+        if not morceaux:
+            # Latence perçue : délai avant le premier texte affiché
+            mesures.ajouter("premier_morceau", time.perf_counter() - debut)
+        morceaux.append(morceau)
+        yield morceau
+    mesures.ajouter("api", time.perf_counter() - debut)
+    reponse = "".join(morceaux)
+    mesures.compter("appels_api")
+    mesures.compter("octets", len(reponse.encode("utf-8")))
+    cache_mistral.enregistrer(MODELE_MISTRAL, prompt, reponse, pattern)
 
 # Fonction pour générer l'explication d'une expression régulière via l'API Mistral (Le Chat)
-def generer_explication_api(pattern, prompt=""):
-    """Utilise l'API Mistral (Le Chat) pour générer une explication détaillée d'une expression régulière."""
+def generer_explication_api(pattern, prompt="", zone_flux=None, mesures=None):
+    """Utilise l'API Mistral (Le Chat) pour générer une explication détaillée d'une expression régulière.
+
+    Si zone_flux (un st.empty()) est fourni, le texte y est affiché au fur et à mesure de sa réception.
+    """
     try:
         # Construire le prompt pour l'API
         if not prompt:
@@ -18,237 +74,169 @@ def generer_explication_api(pattern, prompt=""):
             prompt = f"{prompt} Expression régulière: {pattern}"
         
         # Appel à l'API Le Chat (Mistral)
-        headers = {
-            "Authorization": f"Bearer {LECHAT_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "mistral-large-latest",  # Modèle Mistral à utiliser
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        }
+        if zone_flux is None:
+            return appeler_mistral(prompt, pattern, mesures)
         
-        response = requests.post(
-            "https://api.mistral.ai/v1/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        else:
-            st.error(f"Erreur API: {response.status_code} - {response.text}")
-            return f"Impossible de générer l'explication via l'API: {response.status_code}"
+        # Affichage progressif, limité à une mise à jour toutes les 50 ms pour ne pas saturer le navigateur
+        explication = ""
+        derniere_maj = 0
+        for morceau in appeler_mistral_en_flux(prompt, pattern, mesures):
+            explication += morceau
+            if time.monotonic() - derniere_maj > 0.05:
+                zone_flux.markdown(explication + "▌")
+                derniere_maj = time.monotonic()
+        zone_flux.empty()
+        return explication
+    
+    except ErreurAPIMistral as e:
+        st.error(f"Erreur API: {e.status_code} - {e.text}")
+        return f"Impossible de générer l'explication via l'API: {e.status_code}"
     
     except Exception as e:
         return f"Erreur lors de la génération de l'explication: {str(e)}"
 
-# Fonction existante pour générer automatiquement la documentation d'une expression régulière
-def generer_documentation(pattern):
-    """Analyse une expression régulière et génère une documentation explicative détaillée."""
+# Nombre de lignes de résultat affichées par page, et par bloc lors de l'export CSV
+TAILLE_PAGE_RESULTATS = 100
+TAILLE_BLOC_CSV = 50000
+
+# Intervalle minimal entre deux mises à jour du tableau d'une génération en lot, en secondes
+INTERVALLE_AFFICHAGE_LOT = 0.25
+
+# Début du texte affiché avec les correspondances surlignées (caractères, ou octets pour un fichier)
+TAILLE_SURLIGNAGE = 100000
+
+# Un fichier déposé est conservé en entier en mémoire par Streamlit (limite : server.maxUploadSize)
+AIDE_DEPOT = (f"Le fichier déposé est gardé en mémoire par le serveur, {st.get_option('server.maxUploadSize')} Mo au "
+              "plus. Pour un fichier plus volumineux : python cli.py EXPRESSION FICHIER, qui le lit au fil de l'eau.")
+
+def highlight_match(val):
+    if val == "✓":
+        return 'color: green; font-weight: bold'
+    elif val == "✗":
+        return 'color: red; font-weight: bold'
+    elif val == moteur.DELAI_DEPASSE:
+        return 'color: orange; font-weight: bold'
+    else:
+        return ''
+
+def exporter_csv(df):
+    """Écrit le tableau complet en CSV, bloc par bloc, sans passer par une chaîne géante."""
+    fichier = io.BytesIO()
+    for debut in range(0, max(len(df), 1), TAILLE_BLOC_CSV):
+        bloc = df.iloc[debut:debut + TAILLE_BLOC_CSV]
+        fichier.write(bloc.to_csv(index=False, header=debut == 0).encode("utf-8"))
+    fichier.seek(0)
+    return fichier
+
+# Fragment : changer de page ne relance que l'affichage du tableau, pas le test
+@st.fragment
+def afficher_page_resultats(df, cle, echantillon=False):
+    """Affiche une page du tableau ; seule cette page est mise en forme et envoyée au navigateur.
+
+    echantillon indique que le tableau ne contient qu'une partie des lignes (échantillon d'un fichier) : l'export
+    est alors présenté comme tel.
+    """
+    nombre_pages = max(1, -(-len(df) // TAILLE_PAGE_RESULTATS))
+    page = 1
+    if nombre_pages > 1:
+        page = st.number_input(
+            f"Page (sur {nombre_pages}):",
+            min_value=1, max_value=nombre_pages, value=1,
+            key=f"page_{cle}"
+        )
+    debut = (page - 1) * TAILLE_PAGE_RESULTATS
+    page_df = df.iloc[debut:debut + TAILLE_PAGE_RESULTATS]
+    styled_df = page_df.style.map(highlight_match, subset=['Correspond'])
+    st.dataframe(styled_df, use_container_width=True)
+    st.caption(f"Lignes {debut + 1} à {debut + len(page_df)} sur {len(df)}.")
+    # Le CSV n'est produit qu'au clic sur le bouton
+    st.download_button(
+        "Télécharger l'échantillon affiché (CSV)" if echantillon else "Télécharger tous les résultats (CSV)",
+        data=lambda: exporter_csv(df),
+        file_name=f"{'echantillon' if echantillon else 'resultats'}_{cle}.csv",
+        mime="text/csv",
+        key=f"csv_{cle}",
+        help=("Seules les lignes conservées pour l'affichage sont exportées (voir « Nombre de lignes affichées par "
+              "catégorie »). Pour toutes les lignes d'un fichier : python cli.py EXPRESSION FICHIER --format csv")
+        if echantillon else None
+    )
+
+# Résumé du mode dédoublonné : valeurs distinctes et valeurs invalides les plus fréquentes
+def afficher_valeurs_distinctes(total, valeurs_distinctes, valeurs_distinctes_invalides, frequentes):
+    """Affiche le nombre de valeurs distinctes et les valeurs sans correspondance les plus fréquentes."""
+    import pandas as pd
+    st.write(
+        f"**Valeurs distinctes** : {valeurs_distinctes} pour {total} ligne(s), dont {valeurs_distinctes_invalides} "
+        f"sans correspondance. L'expression n'a été évaluée qu'une fois par valeur."
+    )
+    if frequentes:
+        df = pd.DataFrame(frequentes)
+        df["Part des lignes"] = (df["Occurrences"] / total).map("{:.1%}".format)
+        st.write(f"**Valeurs sans correspondance les plus fréquentes** ({len(df)} premières)")
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+# Affichage d'un tableau de résultats de test avec mise en évidence des correspondances
+def afficher_resultats(results, mesures, cle="resultats", echantillon=False):
+    """Affiche les lignes de résultat dans un tableau paginé, avec ✓ en vert et ✗ en rouge."""
+    import pandas as pd
+    with mesures.etape("tableau"):
+        df = results if isinstance(results, pd.DataFrame) else pd.DataFrame(results)
+        df = df.reset_index(drop=True)
+    with mesures.etape("mise_en_forme"):
+        afficher_page_resultats(df, cle, echantillon)
+
+# Tableau d'une génération en lot, dans l'ordre des demandes
+def afficher_lot(zone, lignes):
+    """Affiche (ou remplace) dans la zone le tableau des expressions générées pour les demandes déjà traitées."""
+    import pandas as pd
+    df = pd.DataFrame([lignes[numero] for numero in sorted(lignes)])
+    zone.dataframe(df, use_container_width=True, hide_index=True)
+
+# Génération en lot : les lignes sont conservées dans la session au fur et à mesure de leur arrivée
+def generer_lot(demandes, lot, concurrence, zone):
+    """Envoie les demandes {numéro: Demande} à Mistral et met à jour le tableau à chaque réponse reçue."""
+    mesures = MesuresExecution("lot")
+    barre = st.progress(0.0)
+    derniere_maj = 0
+    total = len(lot["lignes"]) + len(demandes)
+    lignes = generer_en_lot(
+        demandes, obtenir_client_mistral(), obtenir_cache_mistral(), MODELE_MISTRAL,
+        concurrence, moteur.construire_flags(st.session_state)
+    )
     try:
-        doc = []
-        exemples_valides = []
-        exemples_invalides = []
-        
-        # Analyse basique du pattern
-        if pattern.startswith('^') and pattern.endswith('$'):
-            doc.append("Cette expression régulière valide une chaîne complète (doit correspondre du début à la fin).")
-        elif pattern.startswith('^'):
-            doc.append("Cette expression régulière valide le début d'une chaîne.")
-        elif pattern.endswith('$'):
-            doc.append("Cette expression régulière valide la fin d'une chaîne.")
-        else:
-            doc.append("Cette expression régulière recherche un motif n'importe où dans la chaîne.")
-        
-        # Reconnaissance de motifs spécifiques avec interprétation détaillée
-        if pattern == r'^[A-Z][A-Z\s\-\']*$':
-            doc = ["Cette expression régulière valide un nom écrit entièrement en MAJUSCULES."]
-            doc.append("La chaîne doit commencer par une lettre majuscule ([A-Z]).")
-            doc.append("Elle peut ensuite contenir plusieurs (ou aucun) caractères parmi: lettres majuscules, espaces, tirets ou apostrophes ([A-Z\\s\\-\']*).")
-            doc.append("Aucun autre caractère n'est autorisé (chiffres, minuscules, symboles, etc.).")
-            exemples_valides = ["DUPONT", "MARTIN-DURAND", "O'CONNOR", "DE LA FONTAINE"]
-            exemples_invalides = ["Dupont", "MARTIN2", "dupont", "123NOM"]
-        
-        elif r'^[0-9]{9}[A-Z]{2}$' in pattern:
-            doc = ["Cette expression régulière valide un code INE (Identifiant National Étudiant)."]
-            doc.append("La chaîne doit contenir exactement 9 chiffres ([0-9]{9}) suivis de 2 lettres majuscules ([A-Z]{2}).")
-            doc.append("Aucun espace ou autre caractère n'est autorisé.")
-            exemples_valides = ["123456789AB", "987654321XY"]
-            exemples_invalides = ["12345678AB", "123456789abc", "ABC123456", "123456789A"]
-        
-        elif r'^\d{2}-\d{2}-\d{4}$' in pattern:
-            doc = ["Cette expression régulière valide une date au format JJ-MM-AAAA."]
-            doc.append("La chaîne doit contenir exactement 2 chiffres (jour), suivis d'un tiret, de 2 chiffres (mois), d'un tiret, puis de 4 chiffres (année).")
-            doc.append("Tous les chiffres doivent être sur 2 positions pour les jours et mois, et sur 4 positions pour l'année.")
-            doc.append("Le séparateur doit être un tiret (-) et non un autre caractère.")
-            exemples_valides = ["01-01-2023", "31-12-2022"]
-            exemples_invalides = ["1-1-2023", "01/01/2023"]
-        
-        elif r'^(0[1-9]|1[0-2])\/20[0-9]{2}$' in pattern:
-            doc = ["Cette expression régulière valide une date au format MM/AAAA pour le 21ème siècle (2000-2099)."]
-            doc.append("Le mois doit être compris entre 01 et 12 (0[1-9] ou 1[0-2]).")
-            doc.append("Le séparateur doit être un slash (/).")
-            doc.append("L'année doit commencer par '20' suivi de deux chiffres (entre 2000 et 2099).")
-            exemples_valides = ["01/2023", "12/2099", "05/2010"]
-            exemples_invalides = ["1/2023", "13/2023", "05/123", "05-2023", "05/1999"]
-        
-        elif r'@' in pattern and r'\.' in pattern:
-            doc.append("Elle semble valider un format d'adresse email.")
-            doc.append("Elle recherche un caractère '@' suivi d'un domaine contenant un point.")
-            exemples_valides = ["exemple@domaine.com", "prenom.nom@entreprise.fr"]
-            exemples_invalides = ["exemple@", "exemple@domaine", "@domaine.com"]
-        
-        # Si on n'a pas reconnu précisément le motif, faire une analyse plus générique
-        if len(doc) <= 2:
-            # Analyse détaillée des classes de caractères
-            if '[A-Z]' in pattern:
-                doc.append("Elle contient des lettres majuscules (A à Z).")
-            if '[a-z]' in pattern:
-                doc.append("Elle contient des lettres minuscules (a à z).")
-            if '[0-9]' in pattern:
-                doc.append("Elle contient des chiffres (0 à 9).")
-            
-            # Analyse détaillée des motifs courants
-            if r'\d' in pattern:
-                doc.append("Elle contient des chiffres (\\d équivaut à [0-9]).")
-            if r'\w' in pattern:
-                doc.append("Elle contient des caractères alphanumériques (lettres, chiffres, underscore).")
-            if r'\s' in pattern:
-                doc.append("Elle contient des espaces blancs (espaces, tabulations, retours à la ligne, etc.).")
-            
-            # Analyse des quantificateurs spécifiques
-            if '*' in pattern:
-                doc.append("Elle contient un élément qui peut se répéter zéro ou plusieurs fois (*).")
-            if '+' in pattern:
-                doc.append("Elle contient un élément qui doit se répéter une ou plusieurs fois (+).")
-            if '?' in pattern:
-                doc.append("Elle contient un élément optionnel (?).")
-            
-            # Analyse des séquences spécifiques (séquences d'échappement)
-            if r'\-' in pattern or r"\\'" in pattern:
-                doc.append("Elle contient des caractères spéciaux échappés (comme tiret ou apostrophe).")
-                
-            # Analyse plus détaillée des classes de caractères
-            if '[' in pattern and ']' in pattern:
-                # Analyser les classes de caractères complexes
-                classes = re.findall(r'\[(.*?)\]', pattern)
-                for classe in classes:
-                    if '-' in classe:
-                        # Tenter de décrire les plages
-                        plages = []
-                        if 'A-Z' in classe:
-                            plages.append("lettres majuscules (A-Z)")
-                        if 'a-z' in classe:
-                            plages.append("lettres minuscules (a-z)")
-                        if '0-9' in classe:
-                            plages.append("chiffres (0-9)")
-                        if plages:
-                            doc.append(f"Elle contient une classe de caractères incluant: {', '.join(plages)}.")
-                    
-                    # Caractères spécifiques
-                    special_chars = {'\\s': 'espaces', '\\d': 'chiffres', '\\w': 'caractères de mot'}
-                    for char, desc in special_chars.items():
-                        if char in classe:
-                            doc.append(f"Elle accepte des {desc} dans une classe de caractères.")
-            
-            # Analyse des groupes et alternatives
-            if '(' in pattern and ')' in pattern:
-                # Trouver les groupes pour analyse
-                groupes = re.findall(r'\((.*?)\)', pattern)
-                if groupes:
-                    doc.append(f"Elle contient {len(groupes)} groupe(s) de capture pour extraire des parties spécifiques du texte.")
-                    # Si un groupe contient un | (alternative)
-                    for groupe in groupes:
-                        if '|' in groupe:
-                            alternatives = groupe.split('|')
-                            doc.append(f"Elle contient une alternative entre plusieurs options: {', '.join([f'`{alt}`' for alt in alternatives])}.")
-            
-            # Analyse des quantificateurs précis
-            quantif_pattern = re.compile(r'\{(\d+)(?:,(\d+)?)?\}')
-            quantifs = quantif_pattern.findall(pattern)
-            for quantif in quantifs:
-                if quantif[1]:  # {n,m}
-                    doc.append(f"Elle impose entre {quantif[0]} et {quantif[1]} occurrences d'un élément.")
-                else:  # {n}
-                    doc.append(f"Elle impose exactement {quantif[0]} occurrences d'un élément.")
-        
-        # Construire la documentation finale
-        documentation = "\n".join(doc)
-        
-        if exemples_valides:
-            documentation += "\n\nExemples valides :\n"
-            documentation += "\n".join([f"- {ex}" for ex in exemples_valides])
-            
-        if exemples_invalides:
-            documentation += "\n\nExemples invalides :\n"
-            documentation += "\n".join([f"- {ex}" for ex in exemples_invalides])
-            
-        if not exemples_valides and not exemples_invalides:
-            documentation += "\n\nNote : Vous pouvez enrichir cette documentation en ajoutant vos propres exemples valides et invalides."
-        
-        return documentation
-    
-    except Exception as e:
-        return f"Impossible de générer la documentation automatiquement : {str(e)}\n\nVeuillez décrire manuellement ce que fait cette expression régulière."
+        with mesures.etape("api"):
+            for ligne in lignes:
+                lot["lignes"][ligne["N°"]] = ligne
+                mesures.compter("demandes")
+                mesures.compter("cache_hits" if ligne["Source"] == "cache" else "appels_api")
+                mesures.compter("expressions_valides", ligne["Statut"].startswith("✓"))
+                if time.monotonic() - derniere_maj > INTERVALLE_AFFICHAGE_LOT:
+                    afficher_lot(zone, lot["lignes"])
+                    barre.progress(len(lot["lignes"]) / total, text=f"{len(lot['lignes'])} demande(s) sur {total}")
+                    derniere_maj = time.monotonic()
+    finally:
+        # Réexécution en cours de lot : les demandes pas encore envoyées sont annulées
+        lignes.close()
+    barre.empty()
+    publier_mesures(mesures)
+
+# Texte entier avec les correspondances surlignées
+def afficher_texte_surligne(tampon, occurrences):
+    """Affiche le début du texte, chaque correspondance conservée étant surlignée (numéro au survol)."""
+    morceaux = [
+        html.escape(texte) if numero is None else f'<mark title="Correspondance {numero}">{html.escape(texte)}</mark>'
+        for texte, numero in moteur.segments_surlignes(tampon, occurrences.occurrences, TAILLE_SURLIGNAGE)
+    ]
+    # HTML rendu tel quel : avec st.markdown, une ligne vide termine le bloc et la suite est lue comme du Markdown
+    st.html(f'<div class="texte-surligne">{"".join(morceaux)}</div>')
+    if len(tampon) > TAILLE_SURLIGNAGE:
+        st.caption(f"Seuls les {TAILLE_SURLIGNAGE} premiers caractères (ou octets) du texte sont affichés.")
 
 # Configuration de la page
 st.set_page_config(page_title="one trick Cat RegEx", page_icon="🐱", layout="wide")
 
 # CSS pour le style
-st.markdown("""
-<style>
-/* Style général */
-.main {
-    background-color: #ffffff;
-    color: #1e1e1e;
-    font-family: Marianne, arial, sans-serif;
-}
-h1, h2, h3 {
-    color: #000091;
-}
-.stButton button {
-    background-color: #000091;
-    color: white;
-    border-radius: 4px;
-    border: none;
-    padding: 8px 16px;
-}
-.stButton button:hover {
-    background-color: #1212ff;
-}
-
-/* Style pour le pied de page */
-.footer {
-    position: fixed;
-    left: 0;
-    bottom: 0;
-    width: 100%;
-    background-color: #f5f5f5;
-    color: #666666;
-    text-align: center;
-    padding: 10px 0;
-    font-size: 14px;
-    border-top: 1px solid #e0e0e0;
-    z-index: 999;
-}
-
-.footer img {
-    height: 22px;
-    vertical-align: middle;
-    margin: 0 4px;
-}
-
-.cc-icon {
-    height: 20px;
-    vertical-align: middle;
-    margin: 0 4px;
-}
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CSS, unsafe_allow_html=True)
 
 # Titre principal de l'application
 st.title("One trick Cat RegEx")
@@ -279,64 +267,90 @@ with col1:
     if st.button("Générer une expression régulière avec Mistral (IA)"):
         if regex_prompt:
             with st.spinner("Génération en cours via Mistral..."):
-                prompt = f"Génère une expression régulière pour: {regex_prompt}. Réponds UNIQUEMENT avec l'expression régulière, sans autre texte."
+                prompt = PROMPT_GENERATION.format(demande=regex_prompt)
                 try:
-                    headers = {
-                        "Authorization": f"Bearer {LECHAT_API_KEY}",
-                        "Content-Type": "application/json"
-                    }
-                    
-                    payload = {
-                        "model": "mistral-large-latest",
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ]
-                    }
+                    mesures = MesuresExecution("generation")
+                    reponse = appeler_mistral(prompt, mesures=mesures)
+                    with mesures.etape("extraction"):
+                        generated_regex = extraire_expression(reponse)
+                    publier_mesures(mesures)
                     
-                    response = requests.post(
-                        "https://api.mistral.ai/v1/chat/completions",
-                        headers=headers,
-                        json=payload
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        generated_regex = result["choices"][0]["message"]["content"]
-                        # Extraction du regex entre backticks si présents
-                        pattern_match = re.search(r'`(.*?)`', generated_regex)
-                        if pattern_match:
-                            generated_regex = pattern_match.group(1)
-                        elif re.search(r'[\^\$\[\]\(\)\{\}\.\*\+\?\\]', generated_regex):
-                            words = generated_regex.split()
-                            for word in words:
-                                if re.search(r'[\^\$\[\]\(\)\{\}\.\*\+\?\\]', word):
-                                    generated_regex = word
-                                    break
-                        
-                        st.session_state['regex_pattern'] = generated_regex
-                        # Réinitialiser le champ d'explication lors de la génération du regex
-                        st.session_state['documentation_generee'] = ""
-                        st.rerun()
-                    else:
-                        st.error(f"Erreur API: {response.status_code} - {response.text}")
+                    st.session_state['regex_pattern'] = generated_regex
+                    # Réinitialiser le champ d'explication lors de la génération du regex
+                    st.session_state['documentation_generee'] = ""
+                    st.rerun()
+                except ErreurAPIMistral as e:
+                    st.error(f"Erreur API: {e.status_code} - {e.text}")
                 except Exception as e:
                     st.error(f"Erreur: {str(e)}")
         else:
             st.warning("Veuillez entrer un prompt pour générer une expression régulière.")
     
+    with st.expander("Génération en lot (une liste de demandes)"):
+        fichier_lot = st.file_uploader(
+            "Demandes (TXT : une par ligne ; CSV : colonnes demande, exemples_valides et exemples_invalides, "
+            "exemples séparés par « | »):",
+            type=["txt", "csv"],
+            key="fichier_lot"
+        )
+        concurrence_lot = st.number_input(
+            "Demandes envoyées simultanément:",
+            min_value=1, max_value=CONCURRENCE_MAX, value=4,
+            help="Les appels restent limités par MISTRAL_MAX_EN_COURS, partagé par toutes les sessions."
+        )
+        if fichier_lot is not None:
+            # Le lot en cours est conservé dans la session tant que le même fichier est déposé
+            signature = (fichier_lot.name, fichier_lot.size)
+            lot = st.session_state.get('generation_lot')
+            if lot is None or lot["signature"] != signature:
+                lot = st.session_state['generation_lot'] = {"signature": signature, "lignes": {}}
+            demandes = dict(enumerate(lire_demandes(fichier_lot), start=1))
+            # Les demandes en erreur sont renvoyées à la reprise
+            restantes = {
+                numero: demande for numero, demande in demandes.items()
+                if numero not in lot["lignes"] or lot["lignes"][numero]["Expression"] is None
+            }
+            # Après une réexécution, seules les demandes restantes sont envoyées
+            lancer_lot = st.button("Générer le lot avec Mistral (IA)")
+            zone_lot = st.empty()
+            if lancer_lot and restantes:
+                generer_lot(restantes, lot, concurrence_lot, zone_lot)
+            if lot["lignes"]:
+                afficher_lot(zone_lot, lot["lignes"])
+                valides = sum(ligne["Statut"].startswith("✓") for ligne in lot["lignes"].values())
+                erreurs = sum(ligne["Expression"] is None for ligne in lot["lignes"].values())
+                st.caption(f"{len(lot['lignes']) - erreurs} demande(s) traitée(s) sur {len(demandes)}, "
+                           f"{valides} expression(s) validée(s), {erreurs} erreur(s) de l'API à renvoyer.")
+                import pandas as pd
+                st.download_button(
+                    "Télécharger les expressions (CSV)",
+                    data=lambda: exporter_csv(pd.DataFrame([lot["lignes"][n] for n in sorted(lot["lignes"])])),
+                    file_name="expressions_generees.csv",
+                    mime="text/csv"
+                )
+    
     st.subheader("Explication")
     
     # Boutons pour générer l'explication
     col_buttons1, col_buttons2 = st.columns(2)
     with col_buttons1:
-        if st.button("Générer avec Mistral (IA)"):
-            with st.spinner("Génération en cours via Mistral..."):
-                doc_generee = generer_explication_api(regex_pattern)
-                st.session_state['documentation_generee'] = doc_generee
+        generer_avec_mistral = st.button("Générer avec Mistral (IA)")
     
     with col_buttons2:
         if st.button("Générer localement"):
-            doc_generee = generer_documentation(regex_pattern)
+            from explication import generer_documentation
+            mesures = MesuresExecution("explication")
+            with mesures.etape("documentation"):
+                doc_generee = generer_documentation(regex_pattern)
+            publier_mesures(mesures)
+            st.session_state['documentation_generee'] = doc_generee
+    
+    # L'explication de Mistral s'affiche au fur et à mesure, puis est reprise dans la zone de texte
+    if generer_avec_mistral:
+        with st.spinner("Génération en cours via Mistral..."):
+            mesures = MesuresExecution("explication")
+            doc_generee = generer_explication_api(regex_pattern, zone_flux=st.empty(), mesures=mesures)
+            publier_mesures(mesures)
             st.session_state['documentation_generee'] = doc_generee
     
     documentation_defaut = "Cette expression régulière valide une date au format JJ-MM-AAAA.\n\nExemples valides :\n- 01-01-2023\n- 31-12-2022\n\nExemples invalides :\n- 1-1-2023 (les chiffres doivent être sur 2 positions)\n- 01/01/2023 (mauvais séparateur)"
@@ -345,68 +359,420 @@ with col1:
         height=250,
         value=st.session_state.get('documentation_generee', documentation_defaut)
     )
+    
+    stats_cache = obtenir_cache_mistral().statistiques()
+    st.caption(
+        f"Cache Mistral : {stats_cache['memoire']['hits'] + stats_cache['disque']['hits']} réponse(s) servie(s) depuis le cache, "
+        f"{stats_cache['disque']['misses']} appel(s) à l'API, {stats_cache['disque']['taille']} réponse(s) conservée(s)."
+    )
 
 with col2:
     st.subheader("Tester votre expression régulière")
     
-    test_strings = st.text_area(
-        "Entrez des textes à tester (un par ligne):",
-        height=150,
-        value="01-01-2023\n31-12-2022\n1-1-2023\n01/01/2023\nABC"
+    source_tests = st.radio(
+        "Source des textes à tester:",
+        ["Saisie", "Fichier (TXT/CSV, gzip accepté)", "Tableau (CSV/Parquet, vectorisé)"],
+        horizontal=True
     )
     
+    if source_tests == "Saisie":
+        test_strings = st.text_area(
+            "Entrez des textes à tester (un par ligne):",
+            height=150,
+            value="01-01-2023\n31-12-2022\n1-1-2023\n01/01/2023\nABC"
+        )
+        test_direct = st.checkbox(
+            "Test en direct",
+            help="Les textes sont testés dès que l'expression ou les textes sont validés (Entrée, Ctrl+Entrée ou clic "
+                 "ailleurs), sans cliquer sur « Tester ». Seules les lignes modifiées sont réévaluées."
+        )
+    elif source_tests == "Tableau (CSV/Parquet, vectorisé)":
+        fichier_tableau = st.file_uploader(
+            "Tableau à tester (la colonne est chargée en entier et évaluée par pandas):",
+            type=["csv", "gz", "parquet"],
+            help=AIDE_DEPOT
+        )
+        colonne_tableau = st.text_input(
+            "Colonne à tester (nom ou index, la première par défaut):",
+            value=""
+        )
+        mode_tableau = st.selectbox(
+            "Type de correspondance:",
+            ["search", "match", "fullmatch"],
+            format_func={
+                "search": "N'importe où dans la valeur (search)",
+                "match": "Au début de la valeur (match)",
+                "fullmatch": "Valeur entière (fullmatch)",
+            }.get
+        )
+        dedoublonner = st.checkbox(
+            "Dédoublonner les valeurs",
+            help="Chaque valeur distincte n'est testée qu'une fois, puis son résultat est reporté sur toutes ses lignes. "
+                 "Indiqué pour les données répétitives (dates, codes, noms) ; donne aussi les valeurs invalides les "
+                 "plus fréquentes."
+        )
+    else:
+        fichier_test = st.file_uploader(
+            "Fichier à tester (une valeur par ligne, ou une colonne de CSV):",
+            type=["txt", "csv", "gz"],
+            help=AIDE_DEPOT
+        )
+        colonne_csv = st.text_input(
+            "Colonne CSV à tester (nom ou index, la première par défaut):",
+            value="",
+            help="Ignoré pour les fichiers texte."
+        )
+        taille_echantillon = st.number_input(
+            "Nombre de lignes affichées par catégorie:",
+            min_value=1, max_value=10000, value=moteur.TAILLE_ECHANTILLON
+        )
+        processus_test = st.number_input(
+            "Nombre de processus pour le test du fichier:",
+            min_value=1, max_value=os.cpu_count() or 1, value=1,
+            help="Au-delà de 1, le fichier est découpé en blocs évalués en parallèle (sauf en exécution protégée). "
+                 "Le démarrage des processus prend une demi-seconde ou plus : à réserver aux gros fichiers."
+        )
+        dedoublonner = st.checkbox(
+            "Dédoublonner les valeurs",
+            help="Chaque valeur distincte n'est testée qu'une fois, en série, puis son résultat est reporté sur toutes ses lignes. "
+                 "Indiqué pour les données répétitives (dates, codes, noms) ; donne aussi les valeurs invalides les "
+                 "plus fréquentes."
+        )
+    
+    mode_texte_entier = source_tests != "Tableau (CSV/Parquet, vectorisé)" and st.checkbox(
+        "Toutes les correspondances sur le texte entier (finditer)",
+        help="Le texte (ou le fichier entier, projeté en mémoire) est parcouru d'un seul bloc et non ligne à ligne : "
+             "utile avec re.MULTILINE ou re.DOTALL. Chaque correspondance est donnée avec ses positions et celles de ses "
+             "groupes. Pour un fichier, la recherche porte sur les octets UTF-8 : \\d, \\w et \\s sont limités à l'ASCII "
+             "et les positions sont en octets."
+    )
+    if mode_texte_entier:
+        taille_max_occurrences = st.number_input(
+            "Nombre maximal de correspondances conservées:",
+            min_value=1, max_value=1000000, value=moteur.TAILLE_MAX_OCCURRENCES,
+            help="Au-delà, les correspondances sont seulement comptées (le total reste exact)."
+        )
+    
+    mode_regles = st.checkbox(
+        "Tester un jeu de règles (toutes les expressions en une seule passe)",
+        help="Chaque ligne est comparée à toutes les règles ; l'expression de gauche n'est pas utilisée."
+    )
+    if mode_regles:
+        texte_regles = st.text_area(
+            "Règles (une par ligne, « nom = expression »):",
+            height=150,
+            value="\n".join(f"{name} = {example['regex']}" for name, example in EXEMPLES.items())
+        )
+    
     test_button = st.button("Tester", type="primary")
     
-    if test_button:
+    if test_button and mode_regles:
         try:
-            current_flags = 0
-            if 'ignore_case' in st.session_state and st.session_state['ignore_case']:
-                current_flags |= re.IGNORECASE
-            if 'multiline' in st.session_state and st.session_state['multiline']:
-                current_flags |= re.MULTILINE
-            if 'dotall' in st.session_state and st.session_state['dotall']:
-                current_flags |= re.DOTALL
-            if 'verbose' in st.session_state and st.session_state['verbose']:
-                current_flags |= re.VERBOSE
+            import pandas as pd
+            import tabulaire
+            from regles import JeuRegles, lire_regles, tester_regles
+            
+            mesures = MesuresExecution("regles")
+            current_flags = moteur.construire_flags(st.session_state)
+            regles = lire_regles(texte_regles)
+            
+            # Sans processus séparés, les règles à complexité exponentielle ne sont pas évaluées
+            with mesures.etape("analyse"):
+                dangereuses = [nom for nom, motif in regles.items() if analyser(motif, current_flags).dangereux]
+            if dangereuses:
+                st.warning("Règle(s) ignorée(s) car à complexité exponentielle : " + ", ".join(dangereuses))
+                for nom in dangereuses:
+                    del regles[nom]
+            with mesures.etape("compilation"):
+                jeu = JeuRegles(regles, current_flags)
+            
+            if source_tests == "Saisie":
+                lignes, taille_affichee = test_strings.splitlines(), None
+            elif source_tests == "Tableau (CSV/Parquet, vectorisé)":
+                if fichier_tableau is None:
+                    lignes = None
+                else:
+                    with mesures.etape("lecture"):
+                        serie = tabulaire.charger_colonne(fichier_tableau, fichier_tableau.name, colonne_tableau)
+                        lignes, taille_affichee = serie.fillna("").tolist(), None
+            else:
+                if fichier_test is None:
+                    lignes = None
+                else:
+                    lignes, taille_affichee = moteur.lire_fichier(fichier_test, colonne_csv), taille_echantillon
+            
+            if lignes is None:
+                st.warning("Veuillez choisir un fichier à tester.")
+            else:
+                with st.spinner("Test du jeu de règles en cours..."):
+                    with mesures.etape("correspondance"):
+                        resume = tester_regles(jeu, lignes, taille_affichee or float("inf"))
+                mesures.compter("lignes", resume.total)
+                mesures.compter("correspondances", resume.correspondances)
                 
-            pattern = re.compile(regex_pattern, flags=current_flags)
-            results = []
-            for i, line in enumerate(test_strings.splitlines()):
-                if not line.strip():
-                    continue
-                    
-                match = pattern.search(line)
-                groups = match.groups() if match else None
-                group_dict = match.groupdict() if match else None
+                if resume.total:
+                    st.success(f"{resume.correspondances} ligne(s) sur {resume.total} vérifient au moins une règle.")
+                    st.dataframe(pd.DataFrame(resume.compteurs()), use_container_width=True, hide_index=True)
+                    st.write(f"**Lignes qui vérifient au moins une règle** ({len(resume.echantillon_valides)} affichée(s) sur {resume.correspondances})")
+                    if resume.echantillon_valides:
+                        afficher_resultats(resume.echantillon_valides, mesures, "regles_valides",
+                                           echantillon=len(resume.echantillon_valides) < resume.correspondances)
+                    st.write(f"**Lignes qui ne vérifient aucune règle** ({len(resume.echantillon_invalides)} affichée(s) sur {resume.non_correspondances})")
+                    if resume.echantillon_invalides:
+                        afficher_resultats(resume.echantillon_invalides, mesures, "regles_invalides",
+                                           echantillon=len(resume.echantillon_invalides) < resume.non_correspondances)
+                else:
+                    st.warning("Aucun texte à tester.")
+                publier_mesures(mesures)
+        
+        except Exception as e:
+            st.error(f"Erreur lors de l'exécution du jeu de règles: {str(e)}")
+    
+    elif mode_texte_entier and (test_button or (source_tests == "Saisie" and test_direct)):
+        try:
+            import pandas as pd
+            
+            mesures = MesuresExecution("texte_entier")
+            current_flags = moteur.construire_flags(st.session_state)
+            saisie = source_tests == "Saisie"
+            if not saisie and fichier_test is None:
+                st.warning("Veuillez choisir un fichier à tester.")
+            else:
+                with mesures.etape("compilation"):
+                    pattern = moteur.compiler_tampon(regex_pattern, current_flags,
+                                                     st.session_state.get('moteur_regex', moteur.MOTEUR_PAR_DEFAUT),
+                                                     octets=not saisie)
+                mesures.etiquettes["moteur"] = moteur.moteur_de(pattern)
+                with mesures.etape("analyse"):
+                    rapport = analyser(regex_pattern, current_flags) if moteur.analysable(pattern) else None
+                if rapport is None:
+                    st.info(f"Syntaxe propre à {moteur.moteur_de(pattern)} : l'analyse de complexité, qui lit "
+                            "l'expression comme re, n'a pas pu être faite.")
                 
-                results.append({
-                    "Ligne": i+1,
-                    "Texte": line,
-                    "Correspond": "✓" if match else "✗",
-                    "Valeur trouvée": match.group(0) if match else None,
-                    "Groupes": str(groups) if groups else None,
-                    "Groupes nommés": str(group_dict) if group_dict and len(group_dict) > 0 else None
-                })
+                # Le texte entier ne passe pas par l'exécution protégée : une expression exponentielle n'est exécutée
+                # que par RE2
+                if rapport is not None and rapport.dangereux and mesures.etiquettes["moteur"] != "re2":
+                    st.warning(f"Expression à complexité {rapport.description()} : la recherche sur le texte entier n'est "
+                               "pas protégée par délai. Choisissez le moteur re2 ou testez ligne à ligne en exécution "
+                               "protégée. " + " ".join(rapport.problemes))
+                else:
+                    with mesures.etape("lecture"):
+                        tampon = test_strings if saisie else moteur.ouvrir_tampon(fichier_test)
+                    with st.spinner("Recherche sur le texte entier en cours..."):
+                        with mesures.etape("correspondance"):
+                            occurrences = moteur.rechercher_occurrences(pattern, tampon, taille_max_occurrences)
+                    mesures.compter("octets", len(tampon.encode("utf-8")) if saisie else len(tampon))
+                    mesures.compter("correspondances", occurrences.total)
+                    mesures.compter("occurrences_conservees", len(occurrences.occurrences))
+                    
+                    if occurrences.total > 0:
+                        st.success(f"{occurrences.total} correspondance(s) trouvée(s) sur le texte entier.")
+                    else:
+                        st.error("0 correspondance trouvée sur le texte entier.")
+                    if occurrences.tronquees:
+                        st.info(f"Seules les {len(occurrences.occurrences)} premières correspondances sont conservées "
+                                f"(positions, groupes et surlignage) ; les suivantes sont seulement comptées.")
+                    if len(tampon):
+                        with mesures.etape("mise_en_forme"):
+                            afficher_texte_surligne(tampon, occurrences)
+                    if occurrences.occurrences:
+                        with mesures.etape("tableau"):
+                            df = pd.DataFrame(occurrences.occurrences)
+                        st.dataframe(df, use_container_width=True, hide_index=True)
+                    st.caption(f"Moteur : {moteur.description_moteur(pattern)}."
+                               + ("" if saisie else " Positions en octets."))
+                publier_mesures(mesures)
+        
+        except Exception as e:
+            st.error(f"Erreur lors de l'exécution du regex: {str(e)}")
+    
+    elif test_button or (source_tests == "Saisie" and test_direct):
+        try:
+            debut_test = time.perf_counter()
+            mesures = MesuresExecution("test")
+            current_flags = moteur.construire_flags(st.session_state)
+            compilations_avant = moteur.cache_motifs.compilations
+            with mesures.etape("compilation"):
+                pattern = moteur.compiler(regex_pattern, current_flags,
+                                          st.session_state.get('moteur_regex', moteur.MOTEUR_PAR_DEFAUT))
+            mesures.compter("compilations", moteur.cache_motifs.compilations - compilations_avant)
+            # Le mode vectorisé passe par pandas, qui choisit son moteur (voir tabulaire.moteur_colonne)
+            vectorise = source_tests == "Tableau (CSV/Parquet, vectorisé)"
+            description_moteur = "pandas" if vectorise else moteur.description_moteur(pattern)
+            mesures.etiquettes["moteur"] = "re" if vectorise else moteur.moteur_de(pattern)
+            
+            # Exécution protégée : recherche dans des processus séparés, interrompue au-delà des délais
+            pool_protege = obtenir_pool_bac_a_sable() if st.session_state.get('execution_protegee') else None
+            
+            # Analyse statique : une expression exponentielle n'est jamais exécutée hors de l'exécution protégée,
+            # sauf par RE2 dont le temps d'exécution est linéaire quelle que soit l'expression
+            with mesures.etape("analyse"):
+                rapport = analyser(regex_pattern, current_flags) if moteur.analysable(pattern) else None
+            if rapport is None:
+                st.info(f"Syntaxe propre à {moteur.moteur_de(pattern)} : l'analyse de complexité et le préfiltre, "
+                        "qui lisent l'expression comme re, ne s'appliquent pas. Activez l'exécution protégée si "
+                        "l'expression risque d'être lente.")
+            elif rapport.dangereux and mesures.etiquettes["moteur"] == "re2":
+                st.info(f"Expression à complexité {rapport.description()} avec re : exécutée par RE2, en temps linéaire.")
+            elif rapport.dangereux:
+                if pool_protege is None:
+                    pool_protege = obtenir_pool_bac_a_sable()
+                st.warning(f"Expression à complexité {rapport.description()} : exécution protégée activée. "
+                           + " ".join(rapport.problemes))
+            elif rapport.complexite != LINEAIRE:
+                st.info(f"Expression à complexité {rapport.description()} sur certaines entrées. "
+                        + " ".join(rapport.problemes))
+            delai_ligne = st.session_state.get('delai_ligne_ms', 1000) / 1000
+            delai_bloc = st.session_state.get('delai_bloc_s', 30)
             
-            if results:
-                df = pd.DataFrame(results)
-                def highlight_match(val):
-                    if val == "✓":
-                        return 'color: green; font-weight: bold'
-                    elif val == "✗":
-                        return 'color: red; font-weight: bold'
+            # Littéraux obligatoires : les lignes qui ne les contiennent pas sont écartées sans exécuter l'expression
+            prefiltre = moteur.prefiltre_de(pattern)
+            lignes_ecartees = None
+            
+            if source_tests == "Saisie":
+                with mesures.etape("correspondance"):
+                    if pool_protege is None:
+                        # Résultats des lignes inchangées repris du cache : seules les lignes modifiées sont réévaluées
+                        evaluations, lignes_evaluees = moteur.evaluer_lignes_incremental(pattern, test_strings.splitlines())
                     else:
-                        return ''
-                styled_df = df.style.map(highlight_match, subset=['Correspond'])
-                st.dataframe(styled_df, use_container_width=True)
+                        evaluations = list(moteur.evaluer(pattern, test_strings.splitlines(), pool_protege=pool_protege,
+                                                          delai_ligne=delai_ligne, delai_bloc=delai_bloc))
+                        lignes_evaluees = len(evaluations)
+                    results = [resultat for resultat, _ in evaluations]
+                mesures.compter("lignes", len(results))
+                mesures.compter("octets", len(test_strings.encode("utf-8")))
+                mesures.compter("lignes_reevaluees", lignes_evaluees)
                 
-                matches_count = sum(1 for r in results if r["Correspond"] == "✓")
-                if matches_count > 0:
-                    st.success(f"{matches_count} correspondance(s) trouvée(s) sur {len(results)} ligne(s).")
+                if results:
+                    afficher_resultats(results, mesures)
+                    
+                    delais_depasses = sum(1 for r in results if r["Correspond"] == moteur.DELAI_DEPASSE)
+                    lignes_ecartees = sum(ecartee for _, ecartee in evaluations)
+                    if delais_depasses > 0:
+                        st.warning(f"{delais_depasses} ligne(s) interrompue(s) après dépassement du délai (timeout).")
+                    
+                    matches_count = sum(1 for r in results if r["Correspond"] == "✓")
+                    mesures.compter("correspondances", matches_count)
+                    if matches_count > 0:
+                        st.success(f"{matches_count} correspondance(s) trouvée(s) sur {len(results)} ligne(s).")
+                    else:
+                        st.error(f"0 correspondance trouvée sur {len(results)} ligne(s).")
+                    st.caption(f"Testé en {(time.perf_counter() - debut_test) * 1000:.0f} ms, "
+                               f"{lignes_evaluees} ligne(s) réévaluée(s) sur {len(results)}.")
                 else:
-                    st.error(f"0 correspondance trouvée sur {len(results)} ligne(s).")
+                    st.warning("Aucun texte à tester.")
+            
+            elif source_tests == "Tableau (CSV/Parquet, vectorisé)":
+                if fichier_tableau is None:
+                    st.warning("Veuillez choisir un tableau à tester.")
+                elif pool_protege is not None:
+                    # Les méthodes vectorisées ne peuvent pas être interrompues : le tableau n'est pas évalué
+                    st.warning("Le mode vectorisé n'est pas disponible en exécution protégée : "
+                               "utilisez la source « Fichier » pour tester cette expression.")
+                else:
+                    import tabulaire
+                    with st.spinner("Évaluation vectorisée en cours..."):
+                        with mesures.etape("lecture"):
+                            serie = tabulaire.charger_colonne(fichier_tableau, fichier_tableau.name, colonne_tableau)
+                        with mesures.etape("correspondance"):
+                            tableau = tabulaire.evaluer_colonne(serie, pattern, mode_tableau, dedoublonner)
+                    lignes_ecartees = tableau.attrs["lignes_ecartees"]
+                    description_moteur = tableau.attrs["moteur"]
+                    mesures.etiquettes["moteur"] = description_moteur.split()[0]
+                    mesures.compter("lignes", len(serie))
+                    mesures.compter("octets", fichier_tableau.size)
+                    mesures.compter("evaluations", tableau.attrs.get("valeurs_distinctes", len(tableau)))
+                    
+                    if len(tableau):
+                        correspond = tableau["Correspond"] == "✓"
+                        correspondances = int(correspond.sum())
+                        mesures.compter("correspondances", correspondances)
+                        if correspondances > 0:
+                            st.success(f"{correspondances} correspondance(s) trouvée(s) sur {len(tableau)} ligne(s).")
+                        else:
+                            st.error(f"0 correspondance trouvée sur {len(tableau)} ligne(s).")
+                        if dedoublonner:
+                            afficher_valeurs_distinctes(
+                                len(tableau), tableau.attrs["valeurs_distinctes"],
+                                tableau.attrs["valeurs_distinctes_invalides"], tableau.attrs["valeurs_invalides_frequentes"]
+                            )
+                        
+                        # Tableaux complets : seule la page affichée est mise en forme
+                        valides = tableau[correspond]
+                        invalides = tableau[~correspond]
+                        st.write(f"**Lignes qui correspondent** ({correspondances})")
+                        if len(valides):
+                            afficher_resultats(valides, mesures, "tableau_valides")
+                        st.write(f"**Lignes qui ne correspondent pas** ({len(invalides)})")
+                        if len(invalides):
+                            afficher_resultats(invalides, mesures, "tableau_invalides")
+                    else:
+                        st.warning("Aucun texte à tester.")
+            
+            elif fichier_test is None:
+                st.warning("Veuillez choisir un fichier à tester.")
+            
             else:
-                st.warning("Aucun texte à tester.")
+                # Lecture du fichier par blocs : seuls les compteurs et un échantillon borné sont conservés
+                # La lecture se fait au fil de la recherche : elle est comptée dans l'étape « correspondance »
+                with st.spinner("Test du fichier en cours..."):
+                    with mesures.etape("correspondance"):
+                        lignes = moteur.lire_fichier(fichier_test, colonne_csv)
+                        resume = moteur.tester_flux(pattern, lignes, taille_echantillon, processus_test, pool_protege,
+                                                    delai_ligne, delai_bloc, dedoublonner)
+                
+                lignes_ecartees = resume.lignes_ecartees
+                dedoublonnage = resume.dedoublonnage
+                if dedoublonner and dedoublonnage is None:
+                    st.info("Le dédoublonnage n'est pas appliqué en exécution protégée : chaque ligne a été évaluée.")
+                mesures.compter("lignes", resume.total)
+                mesures.compter("evaluations", dedoublonnage.evaluations if dedoublonnage else resume.total)
+                mesures.compter("octets", fichier_test.size)
+                mesures.compter("correspondances", resume.correspondances)
+                if resume.delais_depasses > 0:
+                    st.warning(f"{resume.delais_depasses} ligne(s) interrompue(s) après dépassement du délai (timeout).")
+                
+                if resume.total:
+                    if resume.correspondances > 0:
+                        st.success(f"{resume.correspondances} correspondance(s) trouvée(s) sur {resume.total} ligne(s).")
+                    else:
+                        st.error(f"0 correspondance trouvée sur {resume.total} ligne(s).")
+                    if dedoublonnage is not None:
+                        afficher_valeurs_distinctes(
+                            resume.total, dedoublonnage.valeurs_distinctes, dedoublonnage.valeurs_distinctes_invalides,
+                            dedoublonnage.valeurs_invalides_frequentes()
+                        )
+                        if dedoublonnage.occurrences_non_suivies:
+                            st.caption(
+                                f"Au-delà de {dedoublonnage.taille_max} valeurs distinctes, les nouvelles valeurs ne sont plus "
+                                f"mémorisées : {dedoublonnage.occurrences_non_suivies} ligne(s) non comptées dans les fréquences."
+                            )
+                    
+                    st.write(f"**Lignes qui correspondent** ({len(resume.echantillon_valides)} affichée(s) sur {resume.correspondances})")
+                    if resume.echantillon_valides:
+                        afficher_resultats(resume.echantillon_valides, mesures, "fichier_valides",
+                                           echantillon=len(resume.echantillon_valides) < resume.correspondances)
+                    st.write(f"**Lignes qui ne correspondent pas** ({len(resume.echantillon_invalides)} affichée(s) sur {resume.non_correspondances})")
+                    if resume.echantillon_invalides:
+                        afficher_resultats(resume.echantillon_invalides, mesures, "fichier_invalides",
+                                           echantillon=len(resume.echantillon_invalides) < resume.non_correspondances)
+                else:
+                    st.warning("Aucun texte à tester.")
+            
+            if prefiltre and lignes_ecartees is not None:
+                mesures.compter("lignes_ecartees", lignes_ecartees)
+                st.caption(
+                    f"Préfiltre (littéraux obligatoires : {prefiltre.description()}) : "
+                    f"{lignes_ecartees} ligne(s) écartée(s) sans exécuter l'expression."
+                )
+            st.caption(f"Moteur : {description_moteur}.")
+            stats_motifs = moteur.cache_motifs.statistiques()
+            st.caption(
+                f"Cache des expressions compilées : {stats_motifs['taux_hits']:.0%} de réutilisation, "
+                f"{stats_motifs['compilations']} compilation(s) ({stats_motifs['compilation_totale_ms']:.1f} ms au total, "
+                f"{stats_motifs['compilation_max_ms']:.1f} ms au plus), {stats_motifs['evictions']} éviction(s)."
+            )
+            publier_mesures(mesures)
             
         except Exception as e:
             st.error(f"Erreur lors de l'exécution du regex: {str(e)}")
@@ -414,30 +780,7 @@ with col2:
 
 # Expander séparé pour les exemples d'expressions régulières courantes
 with st.expander("**Exemples d'expressions régulières courantes**"):
-    examples = {
-        "Nom en majuscules": {
-            "regex": r"^[A-Z][A-Z\s\-']*$",
-            "description": "Valide un nom écrit entièrement en majuscules, avec espaces, tirets ou apostrophes.",
-            "exemples_valides": ["DUPONT", "MARTIN-DURAND", "O'CONNOR", "DE LA FONTAINE"],
-            "exemples_invalides": ["Dupont", "MARTIN2", "dupont", "123NOM"]
-        },
-        "Code INE": {
-            "regex": r"^[0-9]{9}[A-Z]{2}$",
-            "description": "Valide un code INE (Identifiant National Étudiant) composé de 9 chiffres suivis de 2 lettres majuscules.",
-            "exemples_valides": ["123456789AB", "987654321XY"],
-            "exemples_invalides": ["12345678AB", "123456789abc", "ABC123456", "123456789A"]
-        },
-        "Format date mois/année": {
-            "regex": r"^(0[1-9]|1[0-2])\/20[0-9]{2}$",
-            "description": "Valide une date au format MM/AAAA pour le 21ème siècle (2000-2099).",
-            "exemples_valides": ["01/2023", "12/2099", "05/2010"],
-            "exemples_invalides": ["1/2023", "13/2023", "05/123", "05-2023", "05/1999"]
-        },
-        
-       
-    }
-    
-    for name, example in examples.items():
+    for name, example in EXEMPLES.items():
         st.subheader(name)
         st.code(example["regex"])
         st.write(example["description"])
@@ -452,105 +795,81 @@ with st.expander("**Exemples d'expressions régulières courantes**"):
 
 # Afficher le guide des expressions régulières dans un expander séparé
 with st.expander("Guide des expressions régulières"):
-    st.markdown(r"""
-    ## Aide-mémoire sur les expressions régulières
-    
-    ### Métacaractères de base
-    - `.` : N'importe quel caractère sauf nouvelle ligne
-      * Exemple: `a.c` correspond à "abc", "adc", "a1c", etc.
-    - `^` : Début de chaîne
-      * Exemple: `^bonjour` correspond à "bonjour monde" mais pas à "mon bonjour"
-    - `$` : Fin de chaîne
-      * Exemple: `monde$` correspond à "bonjour monde" mais pas à "monde entier"
-    - `*` : 0 ou plusieurs occurrences
-      * Exemple: `ab*c` correspond à "ac", "abc", "abbc", "abbbc", etc.
-    - `+` : 1 ou plusieurs occurrences
-      * Exemple: `ab+c` correspond à "abc", "abbc", "abbbc", mais pas à "ac"
-    - `?` : 0 ou 1 occurrence
-      * Exemple: `colou?r` correspond à "color" et "colour"
-    - `{n}` : Exactement n occurrences
-      * Exemple: `a{3}` correspond à "aaa" mais pas à "aa" ou "aaaa"
-    - `{n,}` : Au moins n occurrences
-      * Exemple: `a{2,}` correspond à "aa", "aaa", "aaaa", etc. mais pas à "a"
-    - `{n,m}` : Entre n et m occurrences
-      * Exemple: `a{2,4}` correspond à "aa", "aaa", "aaaa" mais pas à "a" ou "aaaaa"
-    """)
-    
-    st.markdown(r"""
-    ### Classes de caractères
-    - `[abc]` : Un des caractères a, b ou c
-      * Exemple: `[aeiou]` correspond à n'importe quelle voyelle
-    - `[^abc]` : Tout caractère sauf a, b et c
-      * Exemple: `[^0-9]` correspond à tout caractère qui n'est pas un chiffre
-    - `[a-z]` : Tout caractère entre a et z
-      * Exemple: `[a-z]` correspond à toute lettre minuscule de l'alphabet latin
-    - `\d` : Chiffre (`[0-9]`)
-      * Exemple: `\d{3}` correspond à trois chiffres comme "123", "456"
-    - `\D` : Non-chiffre (`[^0-9]`)
-      * Exemple: `\D+` correspond à une suite de caractères sans chiffres
-    - `\w` : Caractère de mot (`[a-zA-Z0-9_]`)
-      * Exemple: `\w+` correspond à un mot comme "exemple_123"
-    - `\W` : Non-caractère de mot
-      * Exemple: `\W` correspond à des caractères comme "!", "@", "#"
-    - `\s` : Espace blanc
-      * Exemple: `mot\ssuivant` correspond à "mot suivant"
-    - `\S` : Non-espace blanc
-      * Exemple: `\S+` correspond à une suite de caractères sans espaces
-    """)
-    
-    st.markdown(r"""
-    ### Groupes
-    - `(...)` : Capture un groupe
-      * Exemple: `(\d{2})-(\d{2})-(\d{4})` capture jour, mois et année
-    - `(?:...)` : Groupe non capturant
-      * Exemple: `(?:https?://)?example\.com` groupe optionnel sans capture
-    - `(?P<name>...)` : Groupe nommé
-      * Exemple: `(?P<jour>\d{2})-(?P<mois>\d{2})-(?P<annee>\d{4})`
-    """)
-    
-    st.markdown(r"""
-    ### Alternatives
-    - `a|b` : a ou b
-      * Exemple: `chat|chien` correspond à "chat" ou "chien"
-    """)
+    for section in GUIDE:
+        st.markdown(section)
 
 
 # Expander séparé pour les options avancées
+# Les options sont des widgets à clé : Streamlit met leur valeur dans st.session_state avant la réexécution,
+# le test (affiché plus haut) utilise donc déjà les options que l'on vient de changer
 with st.expander("Options avancées"):
     st.write("Ces options modifient le comportement de l'expression régulière:")
     col_options1, col_options2 = st.columns(2)
     with col_options1:
-        st.session_state['ignore_case'] = st.checkbox("Ignorer la casse (re.IGNORECASE)", 
-                                                       value=st.session_state.get('ignore_case', False))
-        st.session_state['multiline'] = st.checkbox("Mode multiligne (re.MULTILINE)", 
-                                                     value=st.session_state.get('multiline', False))
+        st.checkbox("Ignorer la casse (re.IGNORECASE)", key='ignore_case')
+        st.checkbox("Mode multiligne (re.MULTILINE)", key='multiline')
+        st.checkbox("Classes ASCII (re.ASCII)", key='ascii',
+                    help=r"\d, \w, \s et \b ne reconnaissent que des caractères ASCII.")
     with col_options2:
-        st.session_state['dotall'] = st.checkbox("Point correspond à tout (re.DOTALL)", 
-                                                  value=st.session_state.get('dotall', False))
-        st.session_state['verbose'] = st.checkbox("Mode verbose (re.VERBOSE)", 
-                                                   value=st.session_state.get('verbose', False))
+        st.checkbox("Point correspond à tout (re.DOTALL)", key='dotall')
+        st.checkbox("Mode verbose (re.VERBOSE)", key='verbose')
+    
+    st.selectbox(
+        "Moteur d'expressions régulières",
+        moteur.MOTEURS,
+        index=moteur.MOTEURS.index(moteur.MOTEUR_PAR_DEFAUT),
+        key='moteur_regex',
+        format_func=lambda nom: nom if moteur.moteur_disponible(nom) else f"{nom} (non installé)",
+        help="re2 garantit un temps d'exécution linéaire ; regex gère mieux l'Unicode. Si le moteur choisi n'est pas "
+             "installé ou ne sait pas exécuter l'expression (références arrière, assertions...), le suivant est utilisé : "
+             "re2, puis regex, puis re."
+    )
     
-    st.markdown(r"""
-    #### Détails des options
+    st.checkbox(
+        "Exécution protégée (interrompre les recherches trop longues)",
+        key='execution_protegee',
+        help="Les recherches sont exécutées dans des processus séparés, arrêtés au-delà des délais ci-dessous."
+    )
+    col_delais1, col_delais2 = st.columns(2)
+    with col_delais1:
+        st.number_input("Délai maximal par ligne (ms)", min_value=10, max_value=60000, value=1000, key='delai_ligne_ms')
+    with col_delais2:
+        st.number_input("Délai maximal par bloc de lignes (s)", min_value=1, max_value=3600, value=30,
+                        key='delai_bloc_s')
     
-    - **Ignorer la casse** : Rend le regex insensible à la casse. Ex: `/abc/i` correspond à "ABC", "abc", "Abc", etc.
-    - **Mode multiligne** : Fait que `^` et `$` correspondent au début/fin de chaque ligne, pas seulement au début/fin du texte.
-    - **Point correspond à tout** : Fait que le caractère `.` correspond également aux sauts de ligne `\n`.
-    - **Mode verbose** : Permet d'écrire des regex plus lisibles avec des espaces et commentaires ignorés.
-    """)
+    st.markdown(DETAILS_OPTIONS)
+
+# Durées par étape et compteurs de la dernière exécution de chaque flux de cette session
+with st.expander("Performance"):
+    mesures_performance = st.session_state.get('mesures_performance', {})
+    if not mesures_performance:
+        st.write("Aucune exécution mesurée pour l'instant : lancez un test ou une génération.")
+    for flux, mesures in mesures_performance.items():
+        st.write(f"**{FLUX[flux]}** : {mesures.duree * 1000:.1f} ms au total")
+        lignes_mesures = [
+            f"- {libelle} : {mesures.etapes[nom] * 1000:.1f} ms" for nom, libelle in ETAPES.items() if nom in mesures.etapes
+        ]
+        lignes_mesures += [
+            f"- {COMPTEURS.get(nom, nom)} : {valeur}" for nom, valeur in mesures.compteurs.items()
+        ]
+        lignes_mesures += [f"- {nom.capitalize()} : {valeur}" for nom, valeur in mesures.etiquettes.items()]
+        debits = mesures.debits()
+        if "lignes_par_seconde" in debits:
+            lignes_mesures.append(f"- Débit : {debits['lignes_par_seconde']:,.0f} lignes/s".replace(",", " "))
+        if "octets_par_seconde" in debits:
+            lignes_mesures.append(f"- Débit : {debits['octets_par_seconde'] / 1e6:.2f} Mo/s")
+        st.markdown("\n".join(lignes_mesures))
+    st.caption(
+        "Métriques cumulées par le serveur (format Prometheus)"
+        + (f", réécrites après chaque exécution dans {CHEMIN_METRIQUES}" if CHEMIN_METRIQUES else "") + " :"
+    )
+    st.code(obtenir_metriques().texte_prometheus(), language="text")
 
 # Ajout d'un espacement pour éviter que le contenu soit caché par le pied de page fixe
 st.markdown("<div style='margin-bottom:60px;'></div>", unsafe_allow_html=True)
 
 # Pied de page avec copyright Creative Commons - style similaire au simulateur
-st.markdown("""
-<div class="footer">
-    © 2025 Creative Commons Attribution (CC BY) 
-    <img src="https://mirrors.creativecommons.org/presskit/icons/cc.svg" class="cc-icon" alt="CC">
-    <img src="https://mirrors.creativecommons.org/presskit/icons/by.svg" class="cc-icon" alt="BY">
-    DRAAF Occitanie - Tous droits réservés
-</div>
-""", unsafe_allow_html=True)
+st.markdown(PIED_DE_PAGE, unsafe_allow_html=True)
 
 if 'regex_pattern' in st.session_state:
     if st.session_state['regex_pattern'] != regex_pattern:
@@ -0,0 +1,177 @@
+"""Mesures de performance par étape (compilation, correspondance, tableau, appel à l'API...) et leur export.
+
+Chaque exécution mesurée (un test, une génération d'expression, une explication) est écrite dans le journal
+« one_trick_regex.performance » sous forme d'une ligne JSON, et cumulée dans des compteurs du processus
+exportables au format texte de Prometheus.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+journal = logging.getLogger("one_trick_regex.performance")
+
+# Préfixe des métriques exportées au format Prometheus
+PREFIXE_METRIQUES = "one_trick_regex"
+
+# Libellés affichés des étapes, dans l'ordre où elles s'enchaînent
+ETAPES = {
+    "compilation": "Compilation de l'expression",
+    "analyse": "Analyse de complexité",
+    "lecture": "Lecture du fichier",
+    "correspondance": "Recherche des correspondances",
+    "tableau": "Construction du tableau (DataFrame)",
+    "mise_en_forme": "Mise en forme et envoi de la page (Styler)",
+    "api": "Appel à l'API Mistral",
+    "premier_morceau": "Premier morceau de la réponse",
+    "extraction": "Extraction de l'expression",
+    "documentation": "Génération locale de l'explication",
+}
+
+# Libellés affichés des compteurs
+COMPTEURS = {
+    "lignes": "Lignes testées",
+    "octets": "Octets traités",
+    "correspondances": "Correspondances",
+    "occurrences_conservees": "Correspondances conservées (positions)",
+    "lignes_ecartees": "Lignes écartées par le préfiltre",
+    "lignes_reevaluees": "Lignes réévaluées",
+    "compilations": "Compilations (hors cache)",
+    "evaluations": "Évaluations de l'expression",
+    "appels_api": "Appels à l'API",
+    "cache_hits": "Réponses servies par le cache",
+    "demandes": "Demandes traitées",
+    "expressions_valides": "Expressions validées",
+}
+
+# Libellés affichés des flux mesurés
+FLUX = {
+    "test": "Test de l'expression",
+    "regles": "Test du jeu de règles",
+    "texte_entier": "Recherche sur le texte entier",
+    "generation": "Génération de l'expression",
+    "lot": "Génération en lot",
+    "explication": "Explication",
+}
+
+NOM_INVALIDE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class MesuresExecution:
+    """Durées des étapes et compteurs (lignes, octets, hits de cache...) d'une exécution."""
+
+    def __init__(self, flux):
+        self.flux = flux
+        self.debut = time.perf_counter()
+        self.duree = None
+        self.etapes = {}
+        self.compteurs = {}
+        # Informations qualitatives de l'exécution, comme le moteur utilisé
+        self.etiquettes = {}
+
+    @contextmanager
+    def etape(self, nom):
+        """Ajoute à l'étape la durée du bloc (une étape peut être mesurée en plusieurs fois)."""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter(nom, time.perf_counter() - debut)
+
+    def ajouter(self, nom, duree):
+        self.etapes[nom] = self.etapes.get(nom, 0.0) + duree
+
+    def compter(self, nom, valeur=1):
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + valeur
+
+    def terminer(self):
+        self.duree = time.perf_counter() - self.debut
+
+    def debits(self):
+        """Lignes et octets traités par seconde de recherche des correspondances."""
+        duree = self.etapes.get("correspondance", 0.0) + self.etapes.get("lecture", 0.0)
+        if not duree:
+            return {}
+        return {
+            f"{nom}_par_seconde": self.compteurs[nom] / duree
+            for nom in ("lignes", "octets") if nom in self.compteurs
+        }
+
+    def en_dict(self):
+        return {
+            "flux": self.flux,
+            "horodatage": time.time(),
+            "duree_ms": round((self.duree or 0.0) * 1000, 3),
+            "etapes_ms": {nom: round(duree * 1000, 3) for nom, duree in self.etapes.items()},
+            "compteurs": self.compteurs,
+            **self.etiquettes,
+            **{nom: round(valeur, 1) for nom, valeur in self.debits().items()},
+        }
+
+
+class MetriquesProcessus:
+    """Cumul des exécutions mesurées par le processus serveur, toutes sessions confondues."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.executions = {}
+        self.secondes = {}
+        self.compteurs = {}
+
+    def ajouter(self, mesures):
+        with self._verrou:
+            self.executions[mesures.flux] = self.executions.get(mesures.flux, 0) + 1
+            for nom, duree in mesures.etapes.items():
+                cle = (mesures.flux, nom)
+                self.secondes[cle] = self.secondes.get(cle, 0.0) + duree
+            for nom, valeur in mesures.compteurs.items():
+                cle = (mesures.flux, nom)
+                self.compteurs[cle] = self.compteurs.get(cle, 0) + valeur
+
+    def texte_prometheus(self):
+        """Compteurs cumulés au format d'exposition texte de Prometheus."""
+        with self._verrou:
+            executions = sorted(self.executions.items())
+            secondes = sorted(self.secondes.items())
+            compteurs = sorted(self.compteurs.items())
+        lignes = [
+            f"# HELP {PREFIXE_METRIQUES}_executions_total Nombre d'exécutions mesurées par flux.",
+            f"# TYPE {PREFIXE_METRIQUES}_executions_total counter",
+        ]
+        lignes += [f'{PREFIXE_METRIQUES}_executions_total{{flux="{flux}"}} {nombre}' for flux, nombre in executions]
+        lignes += [
+            f"# HELP {PREFIXE_METRIQUES}_etape_secondes_total Temps cumulé passé dans chaque étape.",
+            f"# TYPE {PREFIXE_METRIQUES}_etape_secondes_total counter",
+        ]
+        lignes += [
+            f'{PREFIXE_METRIQUES}_etape_secondes_total{{flux="{flux}",etape="{etape}"}} {duree:.6f}'
+            for (flux, etape), duree in secondes
+        ]
+        for nom in sorted({nom for (_, nom), _ in compteurs}):
+            metrique = f"{PREFIXE_METRIQUES}_{NOM_INVALIDE.sub('_', nom)}_total"
+            lignes.append(f"# TYPE {metrique} counter")
+            lignes += [f'{metrique}{{flux="{flux}"}} {valeur}' for (flux, autre), valeur in compteurs if autre == nom]
+        return "\n".join(lignes) + "\n"
+
+    def ecrire(self, chemin):
+        """Écrit les métriques dans un fichier (collecteur « textfile » de node_exporter), en le remplaçant d'un bloc."""
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(self.texte_prometheus())
+        os.replace(temporaire, chemin)
+
+
+def publier(mesures, metriques, chemin_metriques=None):
+    """Termine la mesure, l'écrit dans le journal (une ligne JSON) et l'ajoute aux métriques du processus."""
+    mesures.terminer()
+    journal.info(json.dumps(mesures.en_dict(), ensure_ascii=False))
+    metriques.ajouter(mesures)
+    if chemin_metriques:
+        try:
+            metriques.ecrire(chemin_metriques)
+        except OSError as e:
+            journal.warning(f"Écriture des métriques impossible ({chemin_metriques}) : {e}")
+    return mesures
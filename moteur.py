@@ -0,0 +1,734 @@
+import csv
+import functools
+import gzip
+import heapq
+import importlib
+import importlib.util
+import io
+import itertools
+import mmap
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from analyse_redos import ATOMIC_GROUP, POSSESSIVE_REPEAT, sre_constants, sre_parse
+from cache import CacheLRU
+from prefiltre import Prefiltre, construire_prefiltre
+
+# Nombre de lignes conservées par défaut pour l'affichage (correspondances et non-correspondances)
+TAILLE_ECHANTILLON = 100
+
+# Nombre de lignes envoyées à un processus en une fois pour le traitement parallèle
+TAILLE_BLOC = 20000
+
+# Valeur de la colonne "Correspond" pour une ligne dont l'évaluation a dépassé le délai
+DELAI_DEPASSE = "timeout"
+
+# Signature des fichiers compressés gzip
+SIGNATURE_GZIP = b"\x1f\x8b"
+
+# Nombre de résultats de lignes conservés pour le test en direct
+TAILLE_CACHE_LIGNES = 50000
+
+# Nombre maximal de valeurs distinctes mémorisées par le dédoublonnage (au-delà, évaluées sans être mémorisées)
+TAILLE_MAX_VALEURS_DISTINCTES = 200000
+
+# Nombre de valeurs invalides les plus fréquentes rapportées par le dédoublonnage
+NOMBRE_VALEURS_FREQUENTES = 20
+
+# Nombre d'occurrences conservées (positions et groupes) par la recherche sur le texte entier ; au-delà,
+# les occurrences sont seulement comptées
+TAILLE_MAX_OCCURRENCES = 10000
+
+# Longueur maximale du texte d'une occurrence repris dans les résultats (caractères, ou octets pour un fichier)
+TAILLE_MAX_VALEUR = 200
+
+# Ancres dont le sens dépend de re.MULTILINE
+ANCRES_MULTILIGNE = (sre_constants.AT_BEGINNING, sre_constants.AT_END)
+
+# Moteurs d'expressions régulières : re (bibliothèque standard), regex et re2 (facultatifs)
+MOTEUR_PAR_DEFAUT = "re"
+MOTEURS = ("re", "regex", "re2")
+PAQUETS_MOTEURS = {"regex": "regex", "re2": "google-re2"}
+
+# Moteurs essayés dans l'ordre quand le moteur demandé n'est pas installé ou ne sait pas exécuter l'expression
+REPLIS = {"re": ("re",), "regex": ("regex", "re"), "re2": ("re2", "regex", "re")}
+
+# Constructions que RE2 n'exécute pas : elles exigent des retours arrière, que RE2 s'interdit
+OPERATIONS_SANS_RE2 = {
+    op: description for op, description in (
+        (sre_constants.GROUPREF, "références arrière"),
+        (sre_constants.GROUPREF_EXISTS, "groupes conditionnels"),
+        (sre_constants.ASSERT, "assertions avant ou arrière"),
+        (sre_constants.ASSERT_NOT, "assertions avant ou arrière"),
+        (ATOMIC_GROUP, "groupes atomiques"),
+        (POSSESSIVE_REPEAT, "quantificateurs possessifs"),
+    ) if op is not None
+}
+# Ancres \b et \B : comme \d, \w et \s, RE2 ne les évalue qu'en ASCII
+ANCRES_MOTS = (sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY)
+
+# Flags transmis à RE2 sous forme de flags en tête d'expression
+FLAGS_EN_LIGNE_RE2 = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+# Flags de regex correspondant aux flags re.* : les valeurs ne sont pas toutes les mêmes (regex.ASCII vaut 0x80,
+# re.ASCII vaut 0x100, qui est regex.VERSION1)
+FLAGS_REGEX = (
+    (re.IGNORECASE, "IGNORECASE"), (re.MULTILINE, "MULTILINE"), (re.DOTALL, "DOTALL"),
+    (re.VERBOSE, "VERBOSE"), (re.ASCII, "ASCII"), (re.LOCALE, "LOCALE"), (re.UNICODE, "UNICODE"),
+)
+
+
+def construire_flags(options):
+    """Construit les flags re.* à partir des options cochées (ignore_case, multiline, dotall, verbose, ascii)."""
+    flags = 0
+    if options.get('ignore_case'):
+        flags |= re.IGNORECASE
+    if options.get('multiline'):
+        flags |= re.MULTILINE
+    if options.get('dotall'):
+        flags |= re.DOTALL
+    if options.get('verbose'):
+        flags |= re.VERBOSE
+    if options.get('ascii'):
+        flags |= re.ASCII
+    return flags
+
+
+def _parcourir(sous_motif):
+    """Toutes les opérations (op, av) de l'arbre, sous-motifs compris."""
+    for op, av in sous_motif:
+        yield op, av
+        for element in av if isinstance(av, (list, tuple)) else (av,):
+            if isinstance(element, sre_parse.SubPattern):
+                yield from _parcourir(element)
+            elif isinstance(element, list):
+                # Branches d'une alternative
+                for branche in element:
+                    if isinstance(branche, sre_parse.SubPattern):
+                        yield from _parcourir(branche)
+
+
+def _sensible_a_la_casse(op, av):
+    """Vrai si l'opération peut donner un résultat différent avec re.IGNORECASE."""
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL):
+        caractere = chr(av)
+        return caractere.lower() != caractere or caractere.upper() != caractere
+    if op == sre_constants.IN:
+        return any(_sensible_a_la_casse(op_classe, av_classe) for op_classe, av_classe in av)
+    if op == sre_constants.RANGE:
+        return any(_sensible_a_la_casse(sre_constants.LITERAL, c) for c in range(av[0], av[1] + 1))
+    # Références arrière : comparées sans tenir compte de la casse
+    return op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS)
+
+
+@functools.lru_cache(maxsize=1024)
+def flags_utiles(motif, flags):
+    """Retire les flags sans effet sur l'expression (ex. re.DOTALL sans '.'), pour réutiliser la compilation.
+
+    Les résultats sont identiques ; re.VERBOSE, qui change la lecture du motif, est toujours conservé.
+    """
+    try:
+        operations = list(_parcourir(sre_parse.parse(motif, flags)))
+    except re.error:
+        return flags
+    if flags & re.MULTILINE and not any(op == sre_constants.AT and av in ANCRES_MULTILIGNE for op, av in operations):
+        flags &= ~re.MULTILINE
+    if flags & re.DOTALL and not any(op == sre_constants.ANY for op, _ in operations):
+        flags &= ~re.DOTALL
+    if flags & re.IGNORECASE and not any(_sensible_a_la_casse(op, av) for op, av in operations):
+        flags &= ~re.IGNORECASE
+    return flags
+
+
+def moteur_disponible(nom):
+    """Vrai si le module du moteur est installé (re l'est toujours)."""
+    return nom == "re" or importlib.util.find_spec(nom) is not None
+
+
+def incompatibilite_re2(motif, flags, tampon=False):
+    """Raison pour laquelle RE2 ne donnerait pas les mêmes résultats que re (None s'il peut exécuter l'expression).
+
+    tampon indique une recherche sur le texte entier, qui peut se terminer par un saut de ligne.
+    """
+    if flags & (re.VERBOSE | re.LOCALE):
+        return "mode verbeux ou re.LOCALE"
+    try:
+        operations = list(_parcourir(sre_parse.parse(motif, flags)))
+    except re.error:
+        return "expression invalide"
+    for op, av in operations:
+        if op in OPERATIONS_SANS_RE2:
+            return OPERATIONS_SANS_RE2[op]
+        if op == sre_constants.AT and av == sre_constants.AT_END_STRING:
+            return "ancre \\Z"
+        if tampon and op == sre_constants.AT and av == sre_constants.AT_END and not flags & re.MULTILINE:
+            # re accepte aussi « $ » juste avant un saut de ligne final, RE2 seulement à la toute fin
+            return "ancre $ sans re.MULTILINE sur le texte entier"
+        if flags & re.ASCII:
+            continue
+        if (op == sre_constants.IN and any(op_classe == sre_constants.CATEGORY for op_classe, _ in av)
+                or op == sre_constants.AT and av in ANCRES_MOTS):
+            return "classes \\d, \\w, \\s ou \\b en Unicode (activez re.ASCII pour utiliser RE2)"
+    return None
+
+
+def _compiler_avec(nom, motif, flags):
+    """Compile l'expression avec un moteur donné (regex et re2 sont importés au premier usage)."""
+    if nom == "re":
+        return re.compile(motif, flags)
+    module = importlib.import_module(nom)
+    if nom == "regex":
+        # La syntaxe par défaut de regex (VERSION0) est celle de re
+        flags_regex = 0
+        for flag, nom_flag in FLAGS_REGEX:
+            if flags & flag:
+                flags_regex |= getattr(module, nom_flag)
+        return module.compile(motif, flags_regex)
+    en_ligne = "".join(lettre for flag, lettre in FLAGS_EN_LIGNE_RE2 if flags & flag)
+    options = module.Options()
+    # Les erreurs de syntaxe sont rapportées par l'exception (qui déclenche le repli), pas sur la sortie d'erreur
+    options.log_errors = False
+    if en_ligne:
+        # Le préfixe doit être du même type que le motif (octets pour la recherche sur le texte entier)
+        prefixe = f"(?{en_ligne})"
+        motif = (prefixe.encode() if isinstance(motif, bytes) else prefixe) + motif
+    return module.compile(motif, options)
+
+
+def _flags_effectifs(nom, compile, motif, flags):
+    """Flags re.* en vigueur, y compris ceux écrits dans le motif (« (?i) »...), comme re.Pattern.flags."""
+    if nom == "re":
+        return compile.flags
+    if nom == "regex":
+        module = importlib.import_module(nom)
+        effectifs = 0
+        for flag, nom_flag in FLAGS_REGEX:
+            if compile.flags & getattr(module, nom_flag):
+                effectifs |= flag
+        return effectifs & ~re.UNICODE if effectifs & re.ASCII else effectifs
+    # RE2 n'est employé que pour des motifs que l'analyseur de re sait lire (voir incompatibilite_re2)
+    return sre_parse.parse(motif, flags).state.flags
+
+
+class MotifCompile:
+    """Expression compilée par regex ou re2, ou par re après un repli, avec les attributs de re.Pattern utilisés ici.
+
+    flags sont les flags effectifs (y compris ceux écrits dans le motif), comme re.Pattern.flags ;
+    moteur est le moteur qui s'exécute ; replis donne, pour chaque moteur écarté, la raison du repli.
+    """
+
+    def __init__(self, motif, flags, demande, nom, compile, replis):
+        self.pattern = motif
+        self.flags = flags
+        self.demande = demande
+        self.moteur = nom
+        self.replis = replis
+        self.groups = compile.groups
+        self.groupindex = compile.groupindex
+        # Méthodes du moteur reprises telles quelles : aucune indirection à chaque ligne
+        self.search = compile.search
+        self.match = compile.match
+        self.fullmatch = compile.fullmatch
+        self.finditer = compile.finditer
+
+    def __reduce__(self):
+        # Recompilée au dépicklage dans les processus de travail (une expression re2 ne se pickle pas)
+        return compiler_moteur, (self.pattern, self.flags, self.demande)
+
+
+def compiler_moteur(motif, flags=0, demande=MOTEUR_PAR_DEFAUT, tampon=False):
+    """Compile avec le moteur demandé, ou avec le suivant de REPLIS s'il n'est pas installé ou pas compatible.
+
+    Avec re, renvoie le re.Pattern ; sinon un MotifCompile. Une expression invalide lève re.error.
+    """
+    if demande == "re":
+        return re.compile(motif, flags)
+    replis = []
+    for nom in REPLIS[demande]:
+        if not moteur_disponible(nom):
+            replis.append((nom, f"non installé (pip install {PAQUETS_MOTEURS[nom]})"))
+            continue
+        raison = incompatibilite_re2(motif, flags, tampon) if nom == "re2" else None
+        if raison:
+            replis.append((nom, raison))
+            continue
+        try:
+            compile = _compiler_avec(nom, motif, flags)
+        except importlib.import_module(nom).error as e:
+            if nom == "re":
+                raise
+            message = e.args[0] if e.args else str(e)
+            replis.append((nom, message.decode("utf-8", "replace") if isinstance(message, bytes) else str(message)))
+            continue
+        return MotifCompile(motif, _flags_effectifs(nom, compile, motif, flags), demande, nom, compile, tuple(replis))
+
+
+def moteur_de(pattern):
+    """Nom du moteur qui exécute l'expression compilée."""
+    return getattr(pattern, "moteur", "re")
+
+
+@functools.lru_cache(maxsize=1024)
+def _lisible_par_re(motif, flags):
+    try:
+        sre_parse.parse(motif, flags)
+    except re.error:
+        return False
+    return True
+
+
+def analysable(pattern):
+    """Faux si l'analyseur de re ne sait pas lire une expression compilée par un autre moteur (ex. \\p{L} avec regex).
+
+    L'analyse de complexité et le préfiltre, qui passent par cet analyseur, ne s'appliquent alors pas.
+    """
+    return moteur_de(pattern) == "re" or _lisible_par_re(pattern.pattern, pattern.flags)
+
+
+def prefiltre_de(pattern):
+    """Préfiltre de l'expression compilée (sans littéraux si elle n'est pas analysable)."""
+    return construire_prefiltre(pattern.pattern, pattern.flags) if analysable(pattern) else Prefiltre(())
+
+
+def description_moteur(pattern):
+    """Moteur utilisé, suivi des replis et de leur raison, ex. « re (repli : re2 : références arrière) »."""
+    replis = getattr(pattern, "replis", ())
+    if not replis:
+        return moteur_de(pattern)
+    return f"{moteur_de(pattern)} (repli : " + " ; ".join(f"{nom} : {raison}" for nom, raison in replis) + ")"
+
+
+class CacheMotifs:
+    """Cache borné des expressions compilées, indexé par (motif, flags, moteur), avec mesure des temps de compilation."""
+
+    def __init__(self, taille_max=256):
+        self._cache = CacheLRU(taille_max)
+        self._verrou = threading.Lock()
+        self.compilations = 0
+        self.temps_compilation = 0.0
+        self.plus_longue_compilation = 0.0
+        self.derniere_compilation = 0.0
+
+    def compiler(self, motif, flags=0, nom_moteur=MOTEUR_PAR_DEFAUT, tampon=False):
+        """Renvoie l'expression compilée, en ne la compilant qu'au premier appel."""
+        cle = (motif, flags_utiles(motif, flags), nom_moteur, tampon)
+        pattern = self._cache.get(cle)
+        if pattern is None:
+            debut = time.perf_counter()
+            pattern = compiler_moteur(motif, cle[1], nom_moteur, tampon)
+            duree = time.perf_counter() - debut
+            with self._verrou:
+                self.compilations += 1
+                self.temps_compilation += duree
+                self.plus_longue_compilation = max(self.plus_longue_compilation, duree)
+                self.derniere_compilation = duree
+            self._cache.set(cle, pattern)
+        return pattern
+
+    def statistiques(self):
+        """Renvoie les compteurs du cache (hits, misses, évictions, taille) et les temps de compilation en ms."""
+        stats = self._cache.statistiques()
+        appels = stats["hits"] + stats["misses"]
+        stats.update({
+            "taux_hits": stats["hits"] / appels if appels else 0.0,
+            "compilations": self.compilations,
+            "compilation_totale_ms": self.temps_compilation * 1000,
+            "compilation_max_ms": self.plus_longue_compilation * 1000,
+            "derniere_compilation_ms": self.derniere_compilation * 1000
+        })
+        return stats
+
+
+# Cache partagé par toutes les sessions du processus serveur
+cache_motifs = CacheMotifs()
+
+
+def compiler(motif, flags=0, nom_moteur=MOTEUR_PAR_DEFAUT):
+    """Compile une expression régulière en passant par le cache du processus (voir compiler_moteur)."""
+    return cache_motifs.compiler(motif, flags, nom_moteur)
+
+
+def compiler_tampon(motif, flags=0, nom_moteur=MOTEUR_PAR_DEFAUT, octets=False):
+    """Compile l'expression pour la recherche sur le texte entier (voir rechercher_occurrences).
+
+    Avec octets=True (fichier projeté en mémoire), le motif est encodé en UTF-8 : \\d, \\w, \\s et \\b sont
+    alors limités à l'ASCII, « . » correspond à un octet et les positions sont en octets.
+    """
+    if octets:
+        motif, flags = motif.encode("utf-8"), flags | re.ASCII
+    return cache_motifs.compiler(motif, flags, nom_moteur, tampon=True)
+
+
+def evaluer_ligne_prefiltree(pattern, numero, line, prefiltre):
+    """Applique le pattern compilé sur une ligne : (ligne de résultat à afficher, écartée par le préfiltre).
+
+    Les lignes que le préfiltre (éventuellement None) écarte ne passent pas par l'expression (résultat identique).
+    """
+    ecartee = prefiltre is not None and prefiltre.ecarte(line)
+    return _resultat(numero, line, None if ecartee else pattern.search(line)), ecartee
+
+
+def _resultat(numero, line, match):
+    groups = match.groups() if match else None
+    group_dict = match.groupdict() if match else None
+
+    return {
+        "Ligne": numero,
+        "Texte": line,
+        "Correspond": "✓" if match else "✗",
+        "Valeur trouvée": match.group(0) if match else None,
+        "Groupes": str(groups) if groups else None,
+        "Groupes nommés": str(group_dict) if group_dict and len(group_dict) > 0 else None
+    }
+
+
+def evaluer_lignes_prefiltrees(pattern, lignes, debut=1):
+    """Évalue les lignes une à une (générateur), en ignorant les lignes vides : paires (résultat, écartée)."""
+    prefiltre = prefiltre_de(pattern)
+    for numero, line in enumerate(lignes, start=debut):
+        if not line.strip():
+            continue
+        yield evaluer_ligne_prefiltree(pattern, numero, line, prefiltre)
+
+
+# Résultats déjà calculés, indexés par (motif, flags, moteur, ligne) : seules les lignes modifiées sont réévaluées
+cache_lignes = CacheLRU(TAILLE_CACHE_LIGNES)
+
+
+def evaluer_lignes_incremental(pattern, lignes):
+    """Comme evaluer_lignes_prefiltrees, mais seules les lignes absentes du cache (nouvelles ou modifiées) passent
+    par l'expression.
+
+    Renvoie la liste des paires (résultat, écartée par le préfiltre) et le nombre de lignes réévaluées par cet
+    appel (le cache est partagé par toutes les sessions : ses compteurs mêlent leurs évaluations).
+    """
+    prefiltre = prefiltre_de(pattern)
+    nom_moteur = moteur_de(pattern)
+    resultats = []
+    reevaluees = 0
+    for numero, line in enumerate(lignes, start=1):
+        if not line.strip():
+            continue
+        cle = (pattern.pattern, pattern.flags, nom_moteur, line)
+        evaluation = cache_lignes.get(cle)
+        if evaluation is None:
+            evaluation = evaluer_ligne_prefiltree(pattern, numero, line, prefiltre)
+            cache_lignes.set(cle, evaluation)
+            reevaluees += 1
+        resultats.append((dict(evaluation[0], Ligne=numero), evaluation[1]))
+    return resultats, reevaluees
+
+
+class Dedoublonnage:
+    """Résultats par valeur distincte : chaque valeur n'est évaluée qu'une fois, puis comptée à chaque occurrence.
+
+    Au-delà de taille_max valeurs distinctes, les nouvelles valeurs sont évaluées sans être mémorisées
+    (mémoire bornée) ; leurs occurrences sont comptées dans occurrences_non_suivies.
+    """
+
+    def __init__(self, pattern, taille_max=TAILLE_MAX_VALEURS_DISTINCTES):
+        self.pattern = pattern
+        self.prefiltre = prefiltre_de(pattern)
+        self.taille_max = taille_max
+        # Valeur -> [(résultat sans numéro de ligne, écartée par le préfiltre), nombre d'occurrences]
+        self._valeurs = {}
+        self.evaluations = 0
+        self.occurrences_non_suivies = 0
+
+    def resultat(self, line):
+        """(résultat, écartée) de la valeur, calculés à sa première occurrence seulement (la clé "Ligne" vaut None)."""
+        entree = self._valeurs.get(line)
+        if entree is not None:
+            entree[1] += 1
+            return entree[0]
+        evaluation = evaluer_ligne_prefiltree(self.pattern, None, line, self.prefiltre)
+        self.evaluations += 1
+        if len(self._valeurs) < self.taille_max:
+            self._valeurs[line] = [evaluation, 1]
+        else:
+            self.occurrences_non_suivies += 1
+        return evaluation
+
+    def evaluer(self, lignes, debut=1):
+        """Comme evaluer_lignes_prefiltrees : une paire (résultat, écartée) par ligne non vide, avec son numéro de ligne."""
+        for numero, line in enumerate(lignes, start=debut):
+            if not line.strip():
+                continue
+            resultat, ecartee = self.resultat(line)
+            yield dict(resultat, Ligne=numero), ecartee
+
+    @property
+    def valeurs_distinctes(self):
+        return len(self._valeurs)
+
+    @property
+    def valeurs_distinctes_invalides(self):
+        return sum(1 for (resultat, _), _ in self._valeurs.values() if resultat["Correspond"] != "✓")
+
+    def valeurs_invalides_frequentes(self, nombre=NOMBRE_VALEURS_FREQUENTES):
+        """Valeurs qui ne correspondent pas, les plus fréquentes d'abord, avec leur nombre d'occurrences."""
+        invalides = (
+            (valeur, occurrences) for valeur, ((resultat, _), occurrences) in self._valeurs.items()
+            if resultat["Correspond"] != "✓"
+        )
+        return [
+            {"Texte": valeur, "Occurrences": occurrences}
+            for valeur, occurrences in heapq.nlargest(nombre, invalides, key=lambda element: element[1])
+        ]
+
+
+def ouvrir_texte(fichier, encodage="utf-8"):
+    """Ouvre un fichier binaire (éventuellement compressé en gzip) comme flux texte lu par blocs."""
+    flux = fichier if hasattr(fichier, "peek") else io.BufferedReader(fichier)
+    if flux.peek(2)[:2] == SIGNATURE_GZIP:
+        flux = gzip.GzipFile(fileobj=flux, mode="rb")
+    return io.TextIOWrapper(flux, encoding=encodage, errors="replace", newline="")
+
+
+def lire_lignes(flux_texte):
+    """Générateur qui renvoie les lignes d'un flux texte sans les caractères de fin de ligne."""
+    for line in flux_texte:
+        yield line.rstrip("\r\n")
+
+
+def lire_colonne_csv(flux_texte, colonne=None, separateur=","):
+    """Générateur qui renvoie les valeurs d'une colonne d'un CSV (par nom ou par index, la première par défaut)."""
+    lecteur = csv.reader(flux_texte, delimiter=separateur)
+    entete = next(lecteur, None)
+    if entete is None:
+        return
+
+    if colonne is None or colonne == "":
+        index = 0
+    elif isinstance(colonne, int):
+        index = colonne
+    elif colonne in entete:
+        index = entete.index(colonne)
+    elif str(colonne).isdigit():
+        index = int(colonne)
+    else:
+        raise ValueError(f"Colonne introuvable dans le CSV : {colonne}")
+
+    for enregistrement in lecteur:
+        yield enregistrement[index] if index < len(enregistrement) else ""
+
+
+def lire_fichier(fichier, colonne=None):
+    """Lignes à tester d'un fichier déposé : une colonne pour un CSV (éventuellement gzip), sinon chaque ligne."""
+    flux_texte = ouvrir_texte(fichier)
+    nom_fichier = fichier.name.lower().removesuffix(".gz")
+    if nom_fichier.endswith(".csv"):
+        return lire_colonne_csv(flux_texte, colonne)
+    return lire_lignes(flux_texte)
+
+
+def ouvrir_tampon(fichier):
+    """Contenu entier d'un fichier, si possible sans copie : projeté en mémoire (mmap) pour un fichier sur disque,
+    la mémoire du fichier déposé sinon. Un fichier gzip est décompressé en mémoire."""
+    if hasattr(fichier, "getbuffer"):
+        tampon = fichier.getbuffer()
+    else:
+        try:
+            tampon = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Fichier vide ou entrée standard : pas de projection possible
+            tampon = fichier.read()
+    if bytes(tampon[:2]) == SIGNATURE_GZIP:
+        tampon = gzip.decompress(tampon)
+    return tampon
+
+
+def extraire(tampon, debut, fin):
+    """Texte du tampon entre deux positions (décodé en UTF-8 pour un tampon d'octets)."""
+    extrait = tampon[debut:fin]
+    return extrait if isinstance(extrait, str) else bytes(extrait).decode("utf-8", errors="replace")
+
+
+class Occurrences:
+    """Toutes les correspondances d'une expression sur un texte entier : le nombre exact, et les premières
+    (au plus taille_max) avec leurs positions et celles de leurs groupes."""
+
+    def __init__(self, taille_max=TAILLE_MAX_OCCURRENCES):
+        self.taille_max = taille_max
+        self.total = 0
+        self.occurrences = []
+
+    @property
+    def tronquees(self):
+        return self.total > len(self.occurrences)
+
+
+def _occurrence(numero, match, tampon, noms):
+    debut, fin = match.span()
+    # Extrait borné : une occurrence peut couvrir presque tout le fichier (ex. « (?s).* »)
+    valeur = extraire(tampon, debut, min(fin, debut + TAILLE_MAX_VALEUR))
+    groupes = {noms[index]: match.span(index) for index in range(1, len(noms) + 1)} if noms else None
+    return {
+        "Occurrence": numero,
+        "Début": debut,
+        "Fin": fin,
+        "Valeur trouvée": valeur + "…" if fin - debut > TAILLE_MAX_VALEUR else valeur,
+        # (-1, -1) pour un groupe qui n'a pas participé à la correspondance
+        "Groupes": str(groupes) if groupes else None,
+    }
+
+
+def rechercher_occurrences(pattern, tampon, taille_max=TAILLE_MAX_OCCURRENCES):
+    """Parcourt toutes les correspondances (finditer) du texte entier, en une passe et en mémoire bornée.
+
+    tampon est une chaîne, ou des octets (bytes, mmap, memoryview) pour une expression compilée par compiler_tampon
+    avec octets=True.
+    """
+    resultat = Occurrences(taille_max)
+    noms = {index: index for index in range(1, pattern.groups + 1)}
+    noms.update({index: nom for nom, index in pattern.groupindex.items()})
+    correspondances = pattern.finditer(tampon)
+    for numero, match in enumerate(itertools.islice(correspondances, taille_max), start=1):
+        resultat.occurrences.append(_occurrence(numero, match, tampon, noms))
+    # Au-delà, les correspondances sont seulement comptées
+    resultat.total = len(resultat.occurrences) + sum(1 for _ in correspondances)
+    return resultat
+
+
+def segments_surlignes(tampon, occurrences, limite):
+    """Découpe le début du texte (jusqu'à la position limite) en segments (texte, numéro d'occurrence ou None)."""
+    limite = min(limite, len(tampon))
+    segments = []
+    position = 0
+    for occurrence in occurrences:
+        debut, fin = occurrence["Début"], min(occurrence["Fin"], limite)
+        if debut >= limite:
+            break
+        if fin == debut:
+            # Correspondance vide : rien à surligner
+            continue
+        segments.append((extraire(tampon, position, debut), None))
+        segments.append((extraire(tampon, debut, fin), occurrence["Occurrence"]))
+        position = fin
+    segments.append((extraire(tampon, position, limite), None))
+    return segments
+
+
+class ResumeCorrespondances:
+    """Compteurs de correspondances et échantillons bornés de lignes valides et invalides.
+
+    Compte aussi les lignes écartées par le préfiltre sans exécuter l'expression (verdict fourni avec chaque ligne).
+    """
+
+    def __init__(self, taille_echantillon=TAILLE_ECHANTILLON):
+        self.taille_echantillon = taille_echantillon
+        self.total = 0
+        self.correspondances = 0
+        self.delais_depasses = 0
+        self.lignes_ecartees = 0
+        self.echantillon_valides = []
+        self.echantillon_invalides = []
+        # Renseigné par tester_flux en mode dédoublonné (voir Dedoublonnage)
+        self.dedoublonnage = None
+
+    @property
+    def non_correspondances(self):
+        return self.total - self.correspondances
+
+    def ajouter(self, resultat, numero=None, ecartee=False):
+        """Comptabilise une ligne de résultat et la conserve si l'échantillon n'est pas plein.
+
+        Si numero est fourni, le résultat (partagé par plusieurs lignes) est copié avec ce numéro de ligne ;
+        ecartee indique que le préfiltre a écarté la ligne.
+        """
+        self.total += 1
+        if resultat["Correspond"] == "✓":
+            self.correspondances += 1
+            if len(self.echantillon_valides) < self.taille_echantillon:
+                self.echantillon_valides.append(resultat if numero is None else dict(resultat, Ligne=numero))
+            return
+        if resultat["Correspond"] == DELAI_DEPASSE:
+            self.delais_depasses += 1
+        elif ecartee:
+            self.lignes_ecartees += 1
+        if len(self.echantillon_invalides) < self.taille_echantillon:
+            self.echantillon_invalides.append(resultat if numero is None else dict(resultat, Ligne=numero))
+
+
+# Pattern compilé une seule fois par processus de travail (voir _initialiser_processus)
+_pattern_processus = None
+
+
+def _initialiser_processus(pattern):
+    """Initialise un processus de travail avec le pattern (recompilé une fois au dépicklage)."""
+    global _pattern_processus
+    _pattern_processus = pattern
+
+
+def _evaluer_bloc(debut, lignes):
+    """Évalue un bloc de lignes dans un processus de travail."""
+    return list(evaluer_lignes_prefiltrees(_pattern_processus, lignes, debut))
+
+
+def evaluer_en_parallele(pattern, lignes, processus=None, taille_bloc=TAILLE_BLOC):
+    """Évalue les lignes par blocs dans un pool de processus et renvoie les résultats dans l'ordre des lignes.
+
+    Les paires (résultat, écartée) sont identiques à celles de evaluer_lignes_prefiltrees. Le nombre de blocs en cours est borné
+    pour que la mémoire reste constante quelle que soit la taille de l'entrée.
+    """
+    # Imports tardifs : ils pèsent sur le démarrage de la ligne de commande, qui est souvent en série
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    processus = processus or os.cpu_count() or 1
+    lignes = iter(lignes)
+    # "spawn" évite de dupliquer par fork les threads du serveur Streamlit
+    contexte = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processus, mp_context=contexte,
+                             initializer=_initialiser_processus, initargs=(pattern,)) as executor:
+        en_cours = deque()
+        debut = 1
+        while True:
+            bloc = list(itertools.islice(lignes, taille_bloc))
+            if bloc:
+                en_cours.append(executor.submit(_evaluer_bloc, debut, bloc))
+                debut += len(bloc)
+            # On garde deux blocs par processus en file pour les occuper sans tout charger en mémoire
+            while en_cours and (not bloc or len(en_cours) >= 2 * processus):
+                yield from en_cours.popleft().result()
+            if not bloc:
+                break
+
+
+def evaluer(pattern, lignes, processus=1, pool_protege=None, delai_ligne=None, delai_bloc=None):
+    """Évalue les lignes avec le mode d'exécution choisi : protégé par délai, multi-processus ou en série.
+
+    Renvoie des paires (résultat, écartée par le préfiltre), comme evaluer_lignes_prefiltrees.
+    pool_protege est un bac_a_sable.PoolBacASable ; les délais (en secondes) ne concernent que ce mode.
+    """
+    if pool_protege is not None:
+        return pool_protege.evaluer(pattern, lignes, delai_ligne, delai_bloc)
+    if processus > 1:
+        return evaluer_en_parallele(pattern, lignes, processus)
+    return evaluer_lignes_prefiltrees(pattern, lignes)
+
+
+def tester_flux(pattern, lignes, taille_echantillon=TAILLE_ECHANTILLON, processus=1, pool_protege=None,
+                delai_ligne=None, delai_bloc=None, dedoublonner=False):
+    """Teste un flux de lignes de taille quelconque en mémoire constante (voir evaluer pour les modes d'exécution).
+
+    Avec dedoublonner, chaque valeur distincte n'est évaluée qu'une fois, en série (processus est ignoré) ;
+    le résumé donne alors les valeurs distinctes et les valeurs invalides les plus fréquentes (resume.dedoublonnage).
+    Le dédoublonnage n'est pas appliqué en exécution protégée.
+    """
+    resume = ResumeCorrespondances(taille_echantillon)
+    if dedoublonner and pool_protege is None:
+        resume.dedoublonnage = Dedoublonnage(pattern)
+        resultat_valeur = resume.dedoublonnage.resultat
+        # Aucun dictionnaire n'est créé par ligne : seules les lignes conservées dans l'échantillon sont copiées
+        for numero, line in enumerate(lignes, start=1):
+            if line.strip():
+                resultat, ecartee = resultat_valeur(line)
+                resume.ajouter(resultat, numero, ecartee)
+        return resume
+    for resultat, ecartee in evaluer(pattern, lignes, processus, pool_protege, delai_ligne, delai_bloc):
+        resume.ajouter(resultat, ecartee=ecartee)
+    return resume
@@ -0,0 +1,80 @@
+import functools
+import re
+
+from analyse_redos import ATOMIC_GROUP, POSSESSIVE_REPEAT, sre_constants, sre_parse
+
+# Nombre maximal de littéraux vérifiés par ligne (les plus longs, donc les plus sélectifs)
+NOMBRE_MAX_LITTERAUX = 4
+
+REPETITIONS = tuple(
+    op for op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, POSSESSIVE_REPEAT) if op is not None
+)
+# Flags qui changent la comparaison des caractères : les littéraux ne peuvent plus être cherchés tels quels
+FLAGS_CASSE = re.IGNORECASE | re.LOCALE
+
+
+def _litteraux(sous_motif):
+    """Chaînes littérales présentes dans toute correspondance du sous-motif."""
+    litteraux = []
+    courant = []
+    for op, av in sous_motif:
+        if op == sre_constants.LITERAL:
+            courant.append(chr(av))
+            continue
+        if op == sre_constants.AT:
+            # Ancre de largeur nulle : les littéraux qui l'entourent restent contigus
+            continue
+        if courant:
+            litteraux.append("".join(courant))
+            courant = []
+        if op == sre_constants.SUBPATTERN:
+            _, ajoutes, _, contenu = av
+            if not ajoutes & FLAGS_CASSE:
+                litteraux.extend(_litteraux(contenu))
+        elif op == ATOMIC_GROUP:
+            litteraux.extend(_litteraux(av))
+        elif op in REPETITIONS and av[0] >= 1:
+            litteraux.extend(_litteraux(av[2]))
+        # Alternatives, classes, assertions... : aucun littéral garanti
+    if courant:
+        litteraux.append("".join(courant))
+    return litteraux
+
+
+def litteraux_obligatoires(motif, flags=0):
+    """Littéraux que toute ligne vérifiant l'expression contient forcément (vide si aucun n'est garanti)."""
+    arbre = sre_parse.parse(motif, flags)
+    if arbre.state.flags & FLAGS_CASSE:
+        return ()
+    # Les plus longs d'abord ; un littéral contenu dans un autre déjà retenu n'apporte rien
+    retenus = []
+    for litteral in sorted(set(_litteraux(arbre.data)), key=len, reverse=True):
+        if not any(litteral in autre for autre in retenus):
+            retenus.append(litteral)
+    return tuple(retenus[:NOMBRE_MAX_LITTERAUX])
+
+
+class Prefiltre:
+    """Écarte, par de simples recherches de sous-chaînes, les lignes qui ne peuvent pas correspondre."""
+
+    def __init__(self, litteraux):
+        self.litteraux = litteraux
+
+    def __bool__(self):
+        return bool(self.litteraux)
+
+    def ecarte(self, line):
+        """Vrai si la ligne ne contient pas l'un des littéraux obligatoires (l'expression échouerait)."""
+        for litteral in self.litteraux:
+            if litteral not in line:
+                return True
+        return False
+
+    def description(self):
+        return ", ".join(repr(litteral) for litteral in self.litteraux)
+
+
+@functools.lru_cache(maxsize=256)
+def construire_prefiltre(motif, flags=0):
+    """Préfiltre d'une expression, calculé une fois par (motif, flags)."""
+    return Prefiltre(litteraux_obligatoires(motif, flags))
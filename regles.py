@@ -0,0 +1,158 @@
+import re
+
+import moteur
+from analyse_redos import sre_constants, sre_parse
+from prefiltre import construire_prefiltre
+
+# Séparateur entre le nom d'une règle et son expression, une règle par ligne
+SEPARATEUR_REGLE = " = "
+
+# Au-delà, une plage de caractères n'est pas énumérée dans l'index
+TAILLE_MAX_PLAGE = 1000
+
+DEBUTS = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+
+
+def lire_regles(texte):
+    """Lit un jeu de règles écrit sous la forme « nom = expression », une règle par ligne."""
+    regles = {}
+    for numero, ligne in enumerate(texte.splitlines(), start=1):
+        if not ligne.strip() or ligne.lstrip().startswith("#"):
+            continue
+        nom, separateur, motif = ligne.partition(SEPARATEUR_REGLE)
+        if not separateur or not nom.strip():
+            raise ValueError(f"Ligne {numero} : format attendu « nom{SEPARATEUR_REGLE}expression ».")
+        regles[nom.strip()] = motif.strip()
+    return regles
+
+
+def _premiers_caracteres(sous_motif, flags):
+    """Caractères par lesquels une correspondance peut commencer, ou None si l'ensemble n'est pas borné.
+
+    flags sont les options en vigueur à cet endroit du motif : celles d'un groupe (?i:...) ou (?-i:...)
+    s'appliquent à son contenu.
+    """
+    for op, av in sous_motif:
+        if op == sre_constants.AT and av in DEBUTS:
+            continue
+        if op == sre_constants.LITERAL:
+            caracteres = {chr(av)}
+        elif op == sre_constants.IN:
+            caracteres = set()
+            for op_classe, av_classe in av:
+                if op_classe == sre_constants.LITERAL:
+                    caracteres.add(chr(av_classe))
+                elif op_classe == sre_constants.RANGE and av_classe[1] - av_classe[0] < TAILLE_MAX_PLAGE:
+                    caracteres.update(chr(c) for c in range(av_classe[0], av_classe[1] + 1))
+                else:
+                    # Négation, catégorie (\d, \w...) ou grande plage : pas d'index
+                    return None
+        elif op == sre_constants.SUBPATTERN:
+            _, flags_ajoutes, flags_retires, contenu = av
+            return _premiers_caracteres(contenu, (flags | flags_ajoutes) & ~flags_retires)
+        elif op == sre_constants.BRANCH:
+            caracteres = set()
+            for branche in av[1]:
+                premiers = _premiers_caracteres(branche, flags)
+                if premiers is None:
+                    return None
+                caracteres |= premiers
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            return _premiers_caracteres(av[2], flags)
+        else:
+            return None
+        if flags & re.IGNORECASE:
+            if not flags & re.ASCII:
+                # Les équivalences de casse Unicode (ſ, K...) ne se résument pas à swapcase
+                return None
+            caracteres |= {c.swapcase() for c in caracteres}
+        return caracteres
+    return None
+
+
+def indexer_regle(motif, flags=0):
+    """Premiers caractères possibles d'une règle ancrée en début de ligne, ou None si elle doit toujours être essayée."""
+    arbre = sre_parse.parse(motif, flags)
+    flags_effectifs = arbre.state.flags
+    if not arbre.data or arbre.data[0][0] != sre_constants.AT or arbre.data[0][1] not in DEBUTS:
+        # Sans ancrage, la correspondance peut commencer n'importe où dans la ligne
+        return None
+    if flags_effectifs & re.MULTILINE:
+        # ^ peut aussi correspondre après un saut de ligne contenu dans la valeur
+        return None
+    return _premiers_caracteres(arbre.data, flags_effectifs)
+
+
+class JeuRegles:
+    """Jeu de règles évalué en une seule passe : pour chaque ligne, seules les règles compatibles avec son premier caractère sont essayées."""
+
+    def __init__(self, regles, flags=0):
+        self.noms = list(regles)
+        self.patterns = [moteur.compiler(motif, flags) for motif in regles.values()]
+        # Longueur minimale d'une correspondance : les lignes plus courtes ne sont pas essayées
+        self.longueurs_min = [sre_parse.parse(motif, flags).getwidth()[0] for motif in regles.values()]
+        # Littéraux obligatoires de chaque règle, vérifiés avant l'expression
+        self.prefiltres = [construire_prefiltre(motif, flags) for motif in regles.values()]
+
+        # Index premier caractère -> règles candidates (dans l'ordre du jeu), plus les règles toujours essayées
+        premiers = [indexer_regle(motif, flags) for motif in regles.values()]
+        self._toujours = tuple(i for i, caracteres in enumerate(premiers) if caracteres is None)
+        par_caractere = {}
+        for i, caracteres in enumerate(premiers):
+            for caractere in caracteres or ():
+                par_caractere.setdefault(caractere, []).append(i)
+        self._index = {
+            caractere: tuple(sorted(regles_caractere + list(self._toujours)))
+            for caractere, regles_caractere in par_caractere.items()
+        }
+
+    def candidates(self, line):
+        """Indices des règles qui peuvent correspondre à la ligne."""
+        return self._index.get(line[:1], self._toujours)
+
+    def regles_verifiees(self, line):
+        """Indices des règles vérifiées par la ligne."""
+        return [
+            i for i in self.candidates(line)
+            if len(line) >= self.longueurs_min[i]
+            and not (self.prefiltres[i] and self.prefiltres[i].ecarte(line))
+            and self.patterns[i].search(line)
+        ]
+
+    def evaluer_ligne(self, numero, line):
+        verifiees = self.regles_verifiees(line)
+        return {
+            "Ligne": numero,
+            "Texte": line,
+            "Correspond": "✓" if verifiees else "✗",
+            "Règles vérifiées": ", ".join(self.noms[i] for i in verifiees),
+        }, verifiees
+
+
+class ResumeRegles(moteur.ResumeCorrespondances):
+    """Résumé d'un test de jeu de règles : compteurs globaux et nombre de lignes vérifiant chaque règle."""
+
+    def __init__(self, noms, taille_echantillon=moteur.TAILLE_ECHANTILLON):
+        super().__init__(taille_echantillon)
+        self.noms = noms
+        self.par_regle = [0] * len(noms)
+
+    def compteurs(self):
+        """Nombre et proportion de lignes vérifiant chaque règle."""
+        return [
+            {"Règle": nom, "Lignes": nombre, "Proportion": f"{nombre / self.total:.1%}" if self.total else "-"}
+            for nom, nombre in zip(self.noms, self.par_regle)
+        ]
+
+
+def tester_regles(jeu, lignes, taille_echantillon=moteur.TAILLE_ECHANTILLON):
+    """Évalue toutes les règles sur un flux de lignes en une passe, en mémoire constante."""
+    resume = ResumeRegles(jeu.noms, taille_echantillon)
+    for numero, line in enumerate(lignes, start=1):
+        if not line.strip():
+            continue
+        resultat, verifiees = jeu.evaluer_ligne(numero, line)
+        for i in verifiees:
+            resume.par_regle[i] += 1
+        resume.ajouter(resultat)
+    return resume
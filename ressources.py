@@ -0,0 +1,64 @@
+"""Ressources partagées par toutes les sessions du processus (cache, client de l'API, pool de processus).
+
+Les fonctions sont décorées une seule fois, à l'import, et non à chaque réexécution de main.py.
+"""
+import os
+
+import streamlit as st
+
+from cache import CacheReponses
+from client_mistral import URL_API_MISTRAL, ClientMistral
+
+# Accès au secret Streamlit
+LECHAT_API_KEY = os.getenv("LECHAT_API_KEY")
+
+# Modèle Mistral à utiliser
+MODELE_MISTRAL = "mistral-large-latest"
+
+# Fichier où les métriques de performance sont réécrites après chaque exécution (collecteur textfile de Prometheus)
+CHEMIN_METRIQUES = os.getenv("METRIQUES_PROMETHEUS_FICHIER")
+
+
+# Cache des réponses Mistral (mémoire + disque), partagé entre les sessions et les redémarrages
+@st.cache_resource
+def obtenir_cache_mistral():
+    """Crée une seule fois par processus le cache des réponses de l'API Mistral."""
+    return CacheReponses(
+        os.getenv("MISTRAL_CACHE_PATH", "cache_mistral.sqlite3"),
+        ttl=int(os.getenv("MISTRAL_CACHE_TTL", 7 * 24 * 3600))
+    )
+
+
+# Client HTTP de l'API Mistral, partagé entre les sessions (pool de connexions et limite d'appels simultanés)
+@st.cache_resource
+def obtenir_client_mistral():
+    """Crée une seule fois par processus le client de l'API Mistral."""
+    return ClientMistral(
+        LECHAT_API_KEY,
+        url_base=os.getenv("MISTRAL_API_URL", URL_API_MISTRAL),
+        max_en_cours=int(os.getenv("MISTRAL_MAX_EN_COURS", 4))
+    )
+
+
+# Processus de correspondance démarrés une fois pour toutes, pour l'exécution protégée par délai
+@st.cache_resource
+def obtenir_pool_bac_a_sable():
+    """Crée une seule fois par processus le pool de processus de l'exécution protégée."""
+    # Import tardif : multiprocessing n'est chargé que si l'exécution protégée est utilisée
+    from bac_a_sable import PoolBacASable
+    return PoolBacASable(taille=int(os.getenv("BAC_A_SABLE_PROCESSUS", 2)))
+
+
+# Compteurs de performance cumulés par le processus, et journal des mesures de chaque exécution
+@st.cache_resource
+def obtenir_metriques():
+    """Crée une seule fois par processus les métriques de performance et le journal qui reçoit les mesures."""
+    import logging
+    from mesures import MetriquesProcessus, journal
+    if not journal.handlers:
+        gestionnaire = logging.StreamHandler()
+        gestionnaire.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        journal.addHandler(gestionnaire)
+        journal.setLevel(os.getenv("JOURNAL_PERFORMANCE_NIVEAU", "INFO"))
+        journal.propagate = False
+    return MetriquesProcessus()
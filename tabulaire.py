@@ -0,0 +1,169 @@
+import importlib.util
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from moteur import NOMBRE_VALEURS_FREQUENTES, incompatibilite_re2, prefiltre_de
+
+# Modes d'évaluation : méthode de Series.str et ancrage équivalent pour l'extraction de la valeur
+MODES = {
+    "search": ("contains", "{}"),
+    "match": ("match", r"\A(?:{})"),
+    "fullmatch": ("fullmatch", r"\A(?:{})\Z"),
+}
+
+# Flags globaux en tête d'expression, comme (?i) : ils doivent rester en tête quand l'expression est englobée
+FLAGS_EN_TETE = re.compile(r"^\(\?[aiLmsux]+\)")
+
+# Références numériques (\1, (?(1)...)) à décaler d'un rang quand l'expression est englobée dans un groupe
+REFERENCE_NUMERIQUE = re.compile(r"(?<!\\)((?:\\\\)*)(\\|\(\?\()([1-9]\d?)(?!\d)")
+
+# Nom de la colonne interne qui capture la valeur trouvée
+CAPTURE_VALEUR = "_valeur_trouvee"
+
+# Moteurs qui évaluent la colonne : RE2 (via Arrow) quand il donne les mêmes résultats que re, re sinon
+MOTEUR_ARROW = "re2 (pandas, Arrow)"
+MOTEUR_PYTHON = "re (pandas)"
+
+
+def dtype_texte():
+    """Type des colonnes de texte : chaînes Arrow si pyarrow est installé, sinon chaînes pandas."""
+    if importlib.util.find_spec("pyarrow") is not None:
+        return "string[pyarrow]"
+    return "string"
+
+
+def charger_colonne(fichier, nom_fichier, colonne=None, separateur=","):
+    """Charge une seule colonne d'un fichier CSV (éventuellement gzip) ou Parquet sous forme de Series de texte."""
+    nom_fichier = nom_fichier.lower()
+    if nom_fichier.endswith(".parquet"):
+        if colonne and colonne.isdigit():
+            # Colonne désignée par son index : son nom est lu dans le schéma, sans charger les données
+            import pyarrow.parquet as pq
+            colonne = pq.ParquetFile(fichier).schema_arrow.names[int(colonne)]
+            fichier.seek(0)
+        colonnes = [colonne] if colonne else None
+        tableau = pd.read_parquet(fichier, columns=colonnes)
+        serie = tableau[colonne] if colonne else tableau.iloc[:, 0]
+        return serie.astype(dtype_texte())
+
+    compression = "gzip" if nom_fichier.endswith(".gz") else "infer"
+    if colonne and colonne.isdigit():
+        colonne = int(colonne)
+    tableau = pd.read_csv(
+        fichier,
+        sep=separateur,
+        usecols=[colonne] if colonne not in (None, "") else [0],
+        dtype=dtype_texte(),
+        keep_default_na=False,
+        compression=compression
+    )
+    return tableau.iloc[:, 0]
+
+
+def _expression_englobee(pattern, mode):
+    """Expression avec un groupe nommé autour du motif (pour extraire la valeur trouvée), ancrée selon le mode."""
+    motif = FLAGS_EN_TETE.sub("", pattern.pattern)
+    motif = REFERENCE_NUMERIQUE.sub(lambda m: f"{m.group(1)}{m.group(2)}{int(m.group(3)) + 1}", motif)
+    englobee = f"(?P<{CAPTURE_VALEUR}>{motif})"
+    return MODES[mode][1].format(englobee)
+
+
+def evaluer_colonne(serie, pattern, mode="search", dedoublonner=False):
+    """Évalue l'expression sur toute une colonne avec les méthodes vectorisées de pandas.
+
+    Renvoie un DataFrame (Ligne, Texte, Correspond, Valeur trouvée, puis une colonne par groupe)
+    sans construire de dictionnaire Python par ligne. Les lignes vides sont ignorées, comme dans le testeur.
+    Le nombre de lignes écartées par le préfiltre est dans attrs["lignes_ecartees"], le moteur qui a évalué
+    l'expression dans attrs["moteur"] (voir moteur_colonne).
+
+    Avec dedoublonner, l'expression n'est évaluée qu'une fois par valeur distincte (voir evaluer_valeurs_distinctes).
+    """
+    serie = serie[serie.notna() & (serie.str.strip() != "")]
+    if dedoublonner:
+        return evaluer_valeurs_distinctes(serie, pattern, mode)
+    resultats, candidates = _evaluer(serie, pattern, mode)
+    resultats.attrs["lignes_ecartees"] = int((~candidates).sum())
+    return resultats
+
+
+def evaluer_valeurs_distinctes(serie, pattern, mode="search", nombre_frequentes=NOMBRE_VALEURS_FREQUENTES):
+    """Évalue chaque valeur distincte une seule fois, puis reporte les résultats sur toutes les lignes.
+
+    En plus de attrs["lignes_ecartees"], le DataFrame renvoyé a dans attrs le nombre de valeurs distinctes
+    ("valeurs_distinctes", "valeurs_distinctes_invalides") et les valeurs invalides les plus fréquentes
+    ("valeurs_invalides_frequentes" : liste de {"Texte", "Occurrences"}).
+    """
+    codes, valeurs = pd.factorize(serie)
+    occurrences = np.bincount(codes, minlength=len(valeurs))
+    distinctes, candidates = _evaluer(pd.Series(valeurs, dtype=serie.dtype), pattern, mode)
+
+    resultats = distinctes.take(codes).reset_index(drop=True)
+    resultats["Ligne"] = serie.index + 1
+    invalides = (distinctes["Correspond"] != "✓").to_numpy()
+    frequentes = pd.DataFrame({"Texte": valeurs, "Occurrences": occurrences})[invalides]
+    resultats.attrs.update({
+        "moteur": distinctes.attrs["moteur"],
+        "lignes_ecartees": int(occurrences[~candidates.to_numpy()].sum()),
+        "valeurs_distinctes": len(valeurs),
+        "valeurs_distinctes_invalides": int(invalides.sum()),
+        "valeurs_invalides_frequentes": frequentes.nlargest(nombre_frequentes, "Occurrences").to_dict("records"),
+    })
+    return resultats
+
+
+def moteur_colonne(serie, pattern):
+    """Moteur qui évaluera l'expression sur la colonne.
+
+    pandas confie les colonnes Arrow sans flags à RE2, dont les résultats diffèrent de ceux de re pour \\d, \\w,
+    \\s et \\b en Unicode, « $ » avant un saut de ligne final, etc. : RE2 n'est gardé que si l'expression n'utilise
+    aucune de ces constructions (voir moteur.incompatibilite_re2), sinon la colonne est évaluée par re.
+    """
+    flags = pattern.flags & ~re.UNICODE
+    if getattr(serie.dtype, "storage", None) == "pyarrow" and not flags:
+        # Les valeurs d'une cellule peuvent se terminer par un saut de ligne : mêmes règles que le texte entier
+        if incompatibilite_re2(pattern.pattern, flags, tampon=True) is None:
+            return MOTEUR_ARROW
+    return MOTEUR_PYTHON
+
+
+def _evaluer(serie, pattern, mode):
+    """Résultats des lignes non vides de la série, et masque des lignes retenues par le préfiltre."""
+    methode, _ = MODES[mode]
+    flags = pattern.flags & ~re.UNICODE
+    nom_moteur = moteur_colonne(serie, pattern)
+
+    # Préfiltre : recherche des littéraux obligatoires (sans expression régulière) avant l'expression complète
+    candidates = pd.Series(True, index=serie.index)
+    for litteral in prefiltre_de(pattern).litteraux:
+        candidates &= serie.str.contains(litteral, regex=False).fillna(False).astype(bool)
+
+    # Valeurs en objets Python : les méthodes de pandas les évaluent avec re
+    serie_re = serie if nom_moteur == MOTEUR_ARROW else serie.astype(object)
+    with warnings.catch_warnings():
+        # contains signale les groupes de capture, qui sont justement extraits ensuite
+        warnings.simplefilter("ignore", UserWarning)
+        masque_candidates = getattr(serie_re[candidates].str, methode)(pattern.pattern, flags=flags)
+    masque = pd.Series(False, index=serie.index)
+    masque[candidates] = masque_candidates.fillna(False).astype(bool)
+
+    # Extraction de la valeur et des groupes uniquement sur les lignes qui correspondent, toujours avec re
+    # (l'expression englobée est ancrée par \Z, que RE2 n'accepte pas)
+    extraits = serie[masque].astype(object).str.extract(_expression_englobee(pattern, mode), flags=flags, expand=True)
+    extraits = extraits.rename(columns={
+        colonne: f"Groupe {colonne}" for colonne in extraits.columns if isinstance(colonne, int)
+    })
+
+    resultats = pd.DataFrame({
+        "Ligne": serie.index + 1,
+        "Texte": serie,
+        "Correspond": np.where(masque, "✓", "✗"),
+    })
+    resultats["Valeur trouvée"] = extraits[CAPTURE_VALEUR]
+    for colonne in extraits.columns.drop(CAPTURE_VALEUR):
+        resultats[colonne] = extraits[colonne]
+    resultats = resultats.reset_index(drop=True)
+    resultats.attrs["moteur"] = nom_moteur
+    return resultats, candidates
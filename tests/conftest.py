@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules de l'application sont à la racine du dépôt, sans paquet installable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
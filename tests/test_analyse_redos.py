@@ -0,0 +1,39 @@
+import pytest
+
+from analyse_redos import EXPONENTIELLE, LINEAIRE, analyser
+
+# Alternatives dont le début commun est factorisé par le parseur de re (a|ab devient a(?:|b))
+AMBIGUES = [
+    r"(a|a)*$",
+    r"(?:a|b|ab)*c",
+    r"^(a|b|c|ab)*$",
+    r"^(a|aa)+$",
+    r"(ab|ba|a)*$",
+]
+
+SURES = [
+    r"^\d{2}-\d{2}-\d{4}$",
+    r"^(0[1-9]|1[0-2])\/20[0-9]{2}$",
+    r"^(?:ERREUR|AVERT)+$",
+    r"(x(a|aa))*y",
+]
+
+
+@pytest.mark.parametrize("motif", AMBIGUES)
+def test_alternatives_ambigues_exponentielles(motif):
+    rapport = analyser(motif)
+    assert rapport.complexite == EXPONENTIELLE
+    assert rapport.chaine_attaque
+
+
+@pytest.mark.parametrize("motif", SURES)
+def test_alternatives_sans_ambiguite(motif):
+    assert not analyser(motif).dangereux
+
+
+def test_quantificateurs_imbriques():
+    assert analyser(r"^(a+)+$").dangereux
+
+
+def test_expression_lineaire():
+    assert analyser(r"^[0-9]{9}[A-Z]{2}$").complexite == LINEAIRE
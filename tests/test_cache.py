@@ -0,0 +1,76 @@
+import pytest
+
+import cache
+
+TTL = 100
+
+
+class Horloge:
+    """Remplace le module time de cache.py : l'heure n'avance que lorsque le test le décide."""
+
+    def __init__(self):
+        self.maintenant = 1_000_000.0
+
+    def time(self):
+        return self.maintenant
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    horloge = Horloge()
+    monkeypatch.setattr(cache, "time", horloge)
+    return horloge
+
+
+def test_lru_expiration_et_eviction(horloge):
+    lru = cache.CacheLRU(taille_max=2, ttl=TTL)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    # « b » est le moins récemment utilisé
+    assert lru.get("b") is None
+    horloge.maintenant += TTL + 1
+    assert lru.get("a") is None
+    assert lru.statistiques() == {"hits": 1, "misses": 2, "evictions": 2, "taille": 1}
+
+
+def test_disque_expiration_et_taille_max(horloge, tmp_path):
+    disque = cache.CacheDisque(str(tmp_path / "cache.sqlite3"), ttl=TTL, taille_max=2)
+    disque.set("a", "1")
+    horloge.maintenant += 10
+    disque.set("b", "2")
+    horloge.maintenant += 10
+    assert disque.entree("a") == ("1", horloge.maintenant - 20)
+    disque.set("c", "3")
+    assert disque.get("b") is None
+    assert len(disque) == 2
+    horloge.maintenant += TTL - 19
+    assert disque.get("a") is None
+    assert disque.get("c") == "3"
+
+
+def test_promotion_garde_la_date_de_creation(horloge, tmp_path):
+    chemin = str(tmp_path / "cache.sqlite3")
+    cache.CacheReponses(chemin, ttl=TTL).enregistrer("modele", "prompt", "^a+$")
+    # Autre processus : mémoire vide, la réponse est lue sur disque peu avant son expiration
+    horloge.maintenant += TTL - 10
+    reponses = cache.CacheReponses(chemin, ttl=TTL)
+    assert reponses.obtenir("modele", "prompt") == "^a+$"
+    assert reponses.statistiques()["disque"]["hits"] == 1
+    assert reponses.obtenir("modele", "prompt") == "^a+$"
+    assert reponses.statistiques()["memoire"]["hits"] == 1
+    horloge.maintenant += 11
+    assert reponses.obtenir("modele", "prompt") is None
+
+
+def test_schema_des_cles():
+    cle = cache.CacheReponses.cle
+    # Les clés des caches déjà écrits sur disque doivent rester valables
+    assert cle("mistral-small-latest", "Génère une date", "") == (
+        "d83197e3e6572a43e5ddaffdc28601fc0ab905dde1f63ee566716fe8255ef488"
+    )
+    assert cle("m", "p", "^a$") == "8f2269a24a617c5facb8d337f9f83a6df0eca13d20289eb0ad40337aad226310"
+    assert cle("m", "  Génère\tune   date ") == cle("m", "Génère une date")
+    assert cle("m", "Génère une DATE") != cle("m", "Génère une date")
+    assert len({cle("m", "p"), cle("n", "p"), cle("m", "p", "^a$"), cle("m", "q")}) == 4
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def fichier_csv(tmp_path):
+    chemin = tmp_path / "inscrits.csv"
+    chemin.write_text("nom,ine\nA,123456789AB\nB,12345\n", encoding="utf-8")
+    return str(chemin)
+
+
+def test_colonne_csv(fichier_csv, capsys):
+    assert cli.main([r"^\d{9}[A-Z]{2}$", fichier_csv, "--colonne", "ine"]) == 0
+    resultats = [json.loads(ligne) for ligne in capsys.readouterr().out.splitlines()]
+    assert [resultat["Correspond"] for resultat in resultats] == ["✓", "✗"]
+
+
+@pytest.mark.parametrize("processus", ["1", "2"])
+def test_colonne_csv_introuvable(fichier_csv, capsys, processus):
+    assert cli.main(["^a", fichier_csv, "--colonne", "inconnue", "--processus", processus]) == 2
+    sorties = capsys.readouterr()
+    assert sorties.out == ""
+    assert "Colonne introuvable dans le CSV : inconnue" in sorties.err
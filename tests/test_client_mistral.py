@@ -0,0 +1,222 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from client_mistral import ClientMistral, ErreurAPIMistral, lire_evenements_sse
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.verrou:
+            self.server.requetes += 1
+            self.server.en_cours += 1
+            self.server.max_en_cours = max(self.server.max_en_cours, self.server.en_cours)
+            reponse = self.server.reponses.pop(0)
+        try:
+            reponse(self)
+        finally:
+            with self.server.verrou:
+                self.server.en_cours -= 1
+
+    def envoyer_morceau(self, octets):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(octets), octets))
+        self.wfile.flush()
+
+
+def repondre(statut, corps, entetes=None):
+    """Réponse complète : statut, corps JSON (ou texte) et en-têtes."""
+    def envoyer(gestionnaire):
+        octets = (corps if isinstance(corps, str) else json.dumps(corps)).encode()
+        gestionnaire.send_response(statut)
+        for nom, valeur in (entetes or {}).items():
+            gestionnaire.send_header(nom, valeur)
+        gestionnaire.send_header("Content-Length", str(len(octets)))
+        gestionnaire.end_headers()
+        gestionnaire.wfile.write(octets)
+    return envoyer
+
+
+def attendre(secondes, reponse):
+    """Réponse envoyée après un délai (pour dépasser le délai de lecture du client)."""
+    def envoyer(gestionnaire):
+        time.sleep(secondes)
+        reponse(gestionnaire)
+    return envoyer
+
+
+def diffuser(morceaux, interrompre=False):
+    """Réponse en flux (transfer-encoding chunked), envoyée morceau par morceau ; coupée avant la fin si demandé."""
+    def envoyer(gestionnaire):
+        gestionnaire.send_response(200)
+        gestionnaire.send_header("Content-Type", "text/event-stream")
+        gestionnaire.send_header("Transfer-Encoding", "chunked")
+        gestionnaire.end_headers()
+        for morceau in morceaux:
+            gestionnaire.envoyer_morceau(morceau)
+        if interrompre:
+            gestionnaire.close_connection = True
+            return
+        gestionnaire.wfile.write(b"0\r\n\r\n")
+    return envoyer
+
+
+def evenement(texte):
+    return f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': texte}}]}, ensure_ascii=False)}\n\n"
+
+
+@pytest.fixture
+def serveur():
+    serveur = ThreadingHTTPServer(("127.0.0.1", 0), _Gestionnaire)
+    serveur.reponses = []
+    serveur.verrou = threading.Lock()
+    serveur.requetes = serveur.en_cours = serveur.max_en_cours = 0
+    threading.Thread(target=serveur.serve_forever, args=(0.05,), daemon=True).start()
+    yield serveur
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def client_de(serveur, **options):
+    return ClientMistral("cle", url_base=f"http://127.0.0.1:{serveur.server_port}/v1", **options)
+
+
+def emplacements_libres(client):
+    """Nombre d'emplacements d'appel libres (pris puis rendus aussitôt)."""
+    pris = 0
+    while client.semaphore.acquire(blocking=False):
+        pris += 1
+    for _ in range(pris):
+        client.semaphore.release()
+    return pris
+
+
+def test_sse_evenements_multilignes_commentaires_et_fin():
+    lignes = [
+        b": ping", b"",
+        b'data: {"choices": [{"delta":', b'data:  {"content": "a"}}]}', b"",
+        b"event: message", b'data:{"choices": [{"delta": {"content": "b"}}]}', b"id: 2", b"",
+        b"data: [DONE]", b"",
+        b'data: {"choices": [{"delta": {"content": "ignore"}}]}', b"",
+    ]
+    assert list(lire_evenements_sse(lignes)) == ["a", "b"]
+
+
+def test_sse_dernier_evenement_sans_ligne_vide():
+    assert list(lire_evenements_sse(['data: {"choices": [{"delta": {"content": "a"}}]}'])) == ["a"]
+
+
+def test_flux_decoupe_au_milieu_des_lignes(serveur):
+    flux = (": keep-alive\n\n" + evenement("Cette ") + evenement("expression ") + evenement("régulière…")
+            + "data: [DONE]\n\n").encode()
+    # Morceaux de 7 octets : coupures au milieu des lignes, des champs et des caractères UTF-8
+    serveur.reponses.append(diffuser([flux[i:i + 7] for i in range(0, len(flux), 7)]))
+    client = client_de(serveur)
+    assert list(client.completer_en_flux("prompt", "modele")) == ["Cette ", "expression ", "régulière…"]
+    assert emplacements_libres(client) == 4
+
+
+def test_flux_interrompu_libere_l_emplacement(serveur):
+    import requests
+
+    serveur.reponses.append(diffuser([evenement("début").encode(), b"data: {\"choi"], interrompre=True))
+    client = client_de(serveur, max_en_cours=1)
+    morceaux = []
+    with pytest.raises(requests.exceptions.RequestException):
+        for morceau in client.completer_en_flux("prompt", "modele"):
+            morceaux.append(morceau)
+    assert morceaux == ["début"]
+    assert emplacements_libres(client) == 1
+
+
+def test_flux_abandonne_libere_l_emplacement(serveur):
+    serveur.reponses.append(diffuser([evenement("a").encode(), evenement("b").encode(), b"data: [DONE]\n\n"]))
+    client = client_de(serveur, max_en_cours=1)
+    flux = client.completer_en_flux("prompt", "modele")
+    assert next(flux) == "a"
+    assert emplacements_libres(client) == 0
+    flux.close()
+    assert emplacements_libres(client) == 1
+
+
+def test_flux_en_erreur(serveur):
+    serveur.reponses.append(repondre(401, {"message": "Unauthorized"}))
+    client = client_de(serveur, max_en_cours=1)
+    with pytest.raises(ErreurAPIMistral) as erreur:
+        list(client.completer_en_flux("prompt", "modele"))
+    assert erreur.value.status_code == 401
+    assert emplacements_libres(client) == 1
+
+
+REPONSE = {"choices": [{"message": {"content": "^a+$"}}]}
+
+
+@pytest.mark.parametrize("statut, entetes", [(429, {"Retry-After": "0"}), (500, None), (502, None), (503, None)])
+def test_relance_sur_limite_et_erreur_serveur(serveur, statut, entetes):
+    serveur.reponses += [repondre(statut, "indisponible", entetes), repondre(statut, "indisponible", entetes),
+                         repondre(200, REPONSE)]
+    client = client_de(serveur, facteur_attente=0)
+    assert client.completer("prompt", "modele") == "^a+$"
+    assert serveur.requetes == 3
+    assert emplacements_libres(client) == 4
+
+
+def test_relances_epuisees(serveur):
+    serveur.reponses += [repondre(503, "indisponible")] * 3
+    client = client_de(serveur, tentatives=2, facteur_attente=0)
+    with pytest.raises(ErreurAPIMistral) as erreur:
+        client.completer("prompt", "modele")
+    assert erreur.value.status_code == 503
+    assert serveur.requetes == 3
+    assert emplacements_libres(client) == 4
+
+
+def test_pas_de_relance_sur_erreur_client(serveur):
+    serveur.reponses += [repondre(400, {"message": "Bad Request"}), repondre(200, REPONSE)]
+    client = client_de(serveur, facteur_attente=0)
+    with pytest.raises(ErreurAPIMistral) as erreur:
+        client.completer("prompt", "modele")
+    assert erreur.value.status_code == 400
+    assert serveur.requetes == 1
+
+
+def test_pas_de_relance_apres_delai_de_lecture(serveur):
+    import requests
+
+    serveur.reponses += [attendre(0.5, repondre(200, REPONSE)), repondre(200, REPONSE)]
+    client = client_de(serveur, timeout=(1, 0.1), facteur_attente=0, max_en_cours=1)
+    with pytest.raises(requests.exceptions.RequestException):
+        client.completer("prompt", "modele")
+    assert serveur.requetes == 1
+    assert emplacements_libres(client) == 1
+
+
+def test_trop_d_appels_simultanes(serveur):
+    serveur.reponses.append(repondre(200, REPONSE))
+    client = client_de(serveur, timeout=(1, 0.1), max_en_cours=1)
+    with client._emplacement():
+        with pytest.raises(ErreurAPIMistral, match="Trop d'appels simultanés"):
+            client.completer("prompt", "modele")
+        assert serveur.requetes == 0
+    # L'appel refusé n'a pas rendu d'emplacement qu'il n'avait pas pris (BoundedSemaphore lèverait ValueError)
+    assert emplacements_libres(client) == 1
+    assert client.completer("prompt", "modele") == "^a+$"
+
+
+def test_appels_simultanes_limites(serveur):
+    import asyncio
+
+    serveur.reponses += [attendre(0.2, repondre(200, REPONSE))] * 5
+    client = client_de(serveur, max_en_cours=2)
+    reponses = asyncio.run(client.completer_plusieurs(["a", "b", "c", "d", "e"], "modele"))
+    assert reponses == ["^a+$"] * 5
+    assert serveur.max_en_cours == 2
+    assert emplacements_libres(client) == 2
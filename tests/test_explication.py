@@ -0,0 +1,39 @@
+import pytest
+
+import explication
+
+LISTES_DE_MOTS = [
+    r"^(chat|chien)$",
+    r"^(?:chat|chien|cheval)$",
+    r"\A(?P<animal>chat|chien-loup)\Z",
+    r"^(?:jean\.dupont@a\.fr|marie\.durand@b\.fr)$",
+    r"^(?:" + "|".join(f"mot{i}" for i in range(50)) + ")$",
+]
+
+
+@pytest.mark.parametrize("motif, alternatives", [
+    (r"^(chat|chien)$", [["chat", "chien"]]),
+    (r"^(0[1-9]|1[0-2])/(\d+|x(?:p|q))$", [["0[1-9]", "1[0-2]"], ["\\d+", "x(?:p|q)"], ["p", "q"]]),
+    (r"^(a|b)(x[|)]|y\))$", [["a", "b"], ["x[|)]", "y\\)"]]),
+    (r"chat\|chien(?#a|b)", []),
+])
+def test_alternatives_telles_qu_ecrites(motif, alternatives):
+    assert explication.alternatives_ecrites(motif) == alternatives
+
+
+def test_alternatives_non_factorisees():
+    documentation = explication.generer_documentation(r"^(chat|chien)-\1$")
+    assert "options: `chat`, `chien`." in documentation
+
+
+@pytest.mark.parametrize("motif", LISTES_DE_MOTS)
+def test_liste_de_mots_comme_avec_l_arbre(motif, monkeypatch):
+    assert explication._alternative_simple(motif) is not None
+    rapide = explication.generer_documentation.__wrapped__(motif)
+    monkeypatch.setattr(explication, "_alternative_simple", lambda pattern: None)
+    assert rapide == explication.generer_documentation.__wrapped__(motif)
+
+
+@pytest.mark.parametrize("motif", [r"^a|b$", r"^(a|b)+$", r"^(x|y\)$", r"(?P<1a>x|y)", r"^(chat|chien)\1$"])
+def test_pas_de_chemin_rapide(motif):
+    assert explication._alternative_simple(motif) is None
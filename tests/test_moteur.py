@@ -0,0 +1,80 @@
+import re
+
+import pytest
+
+import moteur
+from prefiltre import Prefiltre
+
+
+def test_lignes_reevaluees_comptees_par_appel():
+    pattern = re.compile(r"^r\d+$")
+    lignes = ["r1", "x", "r1", "r2"]
+    resultats, reevaluees = moteur.evaluer_lignes_incremental(pattern, lignes)
+    assert [resultat["Ligne"] for resultat, _ in resultats] == [1, 2, 3, 4]
+    assert [ecartee for _, ecartee in resultats] == [False, True, False, False]
+    assert reevaluees == 3
+    # Une évaluation faite ailleurs (autre session) ne doit pas être comptée dans cet appel
+    moteur.evaluer_lignes_incremental(pattern, ["r3"])
+    assert moteur.evaluer_lignes_incremental(pattern, lignes + ["r4"])[1] == 1
+
+
+@pytest.mark.parametrize("flags", [re.ASCII, re.IGNORECASE | re.ASCII, re.MULTILINE | re.DOTALL, re.VERBOSE])
+def test_flags_transmis_a_regex(flags):
+    pytest.importorskip("regex")
+    motif = r"^\w+ . \d$"
+    pattern = moteur.compiler_moteur(motif, flags, "regex")
+    assert pattern.moteur == "regex"
+    for valeur in ["été x 1", "ete x 1", "ETE\nx ١", "a\n\n1", "abc x 2"]:
+        attendu = re.search(motif, valeur, flags)
+        trouve = pattern.search(valeur)
+        assert (trouve and trouve.group(0)) == (attendu and attendu.group(0)), valeur
+
+
+@pytest.mark.parametrize("flags", [0, re.IGNORECASE, re.MULTILINE, re.DOTALL | re.IGNORECASE])
+def test_re2_sur_tampon_avec_flags(flags):
+    pytest.importorskip("re2")
+    tampon = b"Erreur A\nerreur b\nERREUR\nc\n"
+    pattern = moteur.compiler_tampon(r"^erreur.", flags, "re2", octets=True)
+    assert pattern.moteur == "re2"
+    attendu = [m.span() for m in re.finditer(rb"^erreur.", tampon, flags | re.ASCII)]
+    assert [m.span() for m in pattern.finditer(tampon)] == attendu
+
+
+LIGNES_PREFILTRE = ["id=12", "rien", "id=x", "", "rien", "id=3", "autre"] * 3
+
+
+@pytest.mark.parametrize("dedoublonner", [False, True])
+def test_lignes_ecartees_sans_second_passage_du_prefiltre(dedoublonner, monkeypatch):
+    pattern = re.compile(r"id=(\d+)")
+    appels = []
+    # Sur la classe : les préfiltres sont mis en cache, une instance modifiée resterait aux tests suivants
+    ecarte = Prefiltre.ecarte
+    monkeypatch.setattr(Prefiltre, "ecarte", lambda self, line: appels.append(line) or ecarte(self, line))
+    resume = moteur.tester_flux(pattern, LIGNES_PREFILTRE, dedoublonner=dedoublonner)
+    assert (resume.total, resume.correspondances, resume.lignes_ecartees) == (18, 6, 9)
+    # Une fois par ligne, ou une fois par valeur distincte en mode dédoublonné
+    assert len(appels) == (5 if dedoublonner else 18)
+
+
+def test_lignes_ecartees_en_parallele():
+    pattern = re.compile(r"id=(\d+)")
+    serie = moteur.tester_flux(pattern, LIGNES_PREFILTRE)
+    parallele = moteur.tester_flux(pattern, LIGNES_PREFILTRE, processus=2)
+    assert parallele.lignes_ecartees == serie.lignes_ecartees == 9
+    assert parallele.echantillon_invalides == serie.echantillon_invalides
+
+
+@pytest.mark.parametrize("demande", moteur.MOTEURS)
+@pytest.mark.parametrize("motif, flags", [("(?i)abc", 0), ("(?m)^a", re.DOTALL), ("(?a)\\w", 0), ("x", re.VERBOSE)])
+def test_flags_effectifs_comme_re(demande, motif, flags):
+    assert moteur.compiler_moteur(motif, flags, demande).flags == re.compile(motif, flags).flags
+
+
+def test_syntaxe_propre_a_regex_sans_analyse_ni_prefiltre():
+    pytest.importorskip("regex")
+    pattern = moteur.compiler(r"^\p{Lu}\w+ id=\d+$", 0, "regex")
+    assert not moteur.analysable(pattern)
+    assert not moteur.prefiltre_de(pattern)
+    resume = moteur.tester_flux(pattern, ["Abc id=1", "abc id=2", "Abc"])
+    assert (resume.correspondances, resume.lignes_ecartees) == (1, 0)
+    assert moteur.analysable(moteur.compiler(r"^\w+ id=\d+$", 0, "regex"))
@@ -0,0 +1,34 @@
+import re
+
+import pytest
+
+import regles
+
+REGLES = {
+    "casse_locale": r"\A(?i:a)ba?",
+    "casse_retiree": r"^(?-i:x)y",
+    "ascii_local": r"^(?ai:k)1",
+    "unicode_local": r"^(?i:k)2",
+    "alternative": r"^(?:b|(?i:c))",
+    "repetition": r"^(?i:d)+!",
+    "sans_ancrage": r"\d",
+}
+LIGNES = ["Abc1Aa", "abc", "ABc", "xy", "Xy", "K1", "k1", "K2", "K2", "B", "C", "c", "Dd!", "dD!", "zz9", ""]
+
+
+@pytest.mark.parametrize("flags", [0, re.IGNORECASE, re.IGNORECASE | re.ASCII])
+def test_memes_regles_que_search(flags):
+    jeu = regles.JeuRegles(REGLES, flags)
+    patterns = [re.compile(motif, flags) for motif in REGLES.values()]
+    for line in LIGNES:
+        attendues = [i for i, pattern in enumerate(patterns) if pattern.search(line)]
+        assert jeu.regles_verifiees(line) == attendues, line
+
+
+def test_index_des_options_locales():
+    assert regles.indexer_regle(r"\A(?i:a)ba?", re.ASCII) == {"a", "A"}
+    assert regles.indexer_regle(r"\A(?i:a)ba?") is None
+    assert regles.indexer_regle(r"^(?-i:x)y", re.IGNORECASE | re.ASCII) == {"x"}
+    assert regles.indexer_regle(r"^(?ai:k)1") == {"k", "K"}
+    # Casse Unicode : K (signe kelvin) correspond aussi, la règle n'est pas indexée
+    assert regles.indexer_regle(r"^(?i:k)2") is None
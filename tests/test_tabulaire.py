@@ -0,0 +1,49 @@
+import io
+import re
+
+import pandas as pd
+import pytest
+
+import moteur
+import tabulaire
+
+VALEURS = ["١٢-٣٤-٥٦٧٨", "12-34-5678", "ab\n", "ab", "٣٤x", "ABC", "a-b"]
+
+
+@pytest.mark.parametrize("motif", [r"^\d{2}-\d{2}-\d{4}$", r"^ab$", r"\w+", r"ab", r"a|b", r"(?i)abc", r"^(a)-(b)$"])
+@pytest.mark.parametrize("mode", ["search", "match", "fullmatch"])
+@pytest.mark.parametrize("dedoublonner", [False, True])
+def test_memes_resultats_que_re(motif, mode, dedoublonner):
+    pattern = re.compile(motif)
+    serie = pd.Series(VALEURS, dtype=tabulaire.dtype_texte())
+    resultats = tabulaire.evaluer_colonne(serie, pattern, mode, dedoublonner)
+    attendus = [getattr(pattern, mode)(valeur) for valeur in VALEURS]
+    assert resultats["Correspond"].tolist() == ["✓" if m else "✗" for m in attendus]
+    valeurs = [valeur if isinstance(valeur, str) else None for valeur in resultats["Valeur trouvée"]]
+    assert valeurs == [m.group(0) if m else None for m in attendus]
+
+
+def test_moteur_arrow_seulement_si_equivalent():
+    serie = pd.Series(VALEURS, dtype="string[pyarrow]")
+    assert tabulaire.moteur_colonne(serie, re.compile("ab")) == tabulaire.MOTEUR_ARROW
+    assert tabulaire.moteur_colonne(serie, re.compile(r"\d+")) == tabulaire.MOTEUR_PYTHON
+    assert tabulaire.moteur_colonne(serie, re.compile("^ab$")) == tabulaire.MOTEUR_PYTHON
+    assert tabulaire.moteur_colonne(serie, re.compile("ab", re.IGNORECASE)) == tabulaire.MOTEUR_PYTHON
+
+
+def test_colonne_parquet_par_index():
+    fichier = io.BytesIO()
+    pd.DataFrame({"id": ["1", "2"], "code": ["x", "y"]}).to_parquet(fichier)
+    fichier.seek(0)
+    assert tabulaire.charger_colonne(fichier, "donnees.parquet", "1").tolist() == ["x", "y"]
+
+
+@pytest.mark.parametrize("demande", moteur.MOTEURS)
+def test_flags_en_ligne_quel_que_soit_le_moteur(demande):
+    # Avec regex ou re2 demandés (même après un repli sur re), les flags écrits dans le motif sont conservés
+    pattern = moteur.compiler_moteur("(?i)abc", 0, demande)
+    assert pattern.flags & re.IGNORECASE
+    serie = pd.Series(["ABC", "xabcx", "d"], dtype=tabulaire.dtype_texte())
+    resultats = tabulaire.evaluer_colonne(serie, pattern)
+    assert resultats["Correspond"].tolist() == ["✓", "✓", "✗"]
+    assert resultats["Valeur trouvée"].tolist()[:2] == ["ABC", "abc"]